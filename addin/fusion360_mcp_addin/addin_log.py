@@ -0,0 +1,244 @@
+"""
+Fusion360 MCP Addin 日志模块
+
+按级别过滤：低于当前级别的调用只做一次整数比较。消息使用 % 参数，
+由后台写入线程延迟格式化，请求线程只把记录放进有界队列；参数中过长的内容
+（请求数据、execute_code 源码）在格式化时截断。高频路径按比例采样。
+最近的记录保存在环形缓冲区中，日志文件由标准库的 RotatingFileHandler 按大小轮转。
+Fusion 的文本面板只能在主线程写入，待写消息由主线程调度器在 drain 时一并写出。
+"""
+
+import logging
+import logging.handlers
+import os
+import threading
+import time
+from collections import deque
+
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+
+LEVEL_NAMES = {DEBUG: 'DEBUG', INFO: 'INFO', WARNING: 'WARNING', ERROR: 'ERROR'}
+LEVELS = {name: level for level, name in LEVEL_NAMES.items()}
+
+LINE_FORMAT = '%(asctime)s.%(msecs)03d %(levelname)s [%(threadName)s] %(message)s'
+DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+def truncate(value, limit):
+    """把参数转为文本，超过 limit 个字符时截断"""
+    if isinstance(value, (int, float, bool)) or value is None:
+        return value
+    text = value if isinstance(value, str) else repr(value)
+    if len(text) <= limit:
+        return text
+    return f"{text[:limit]}...（共 {len(text)} 字符）"
+
+
+class RotatingLogFile(logging.handlers.RotatingFileHandler):
+    """标准库的按大小轮转文件处理器，额外统计轮转次数"""
+
+    def __init__(self, path, max_bytes=5 * 1024 * 1024, backup_count=3):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        super().__init__(path, maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8', delay=True)
+        self.setFormatter(logging.Formatter(LINE_FORMAT, DATE_FORMAT))
+        self.rotations = 0
+
+    def doRollover(self):
+        super().doRollover()
+        self.rotations += 1
+
+
+class PathSampler:
+    """按路径采样：rates 中路径每 N 次只放行 1 次，其他路径全部放行（线程安全）"""
+
+    def __init__(self, rates=None):
+        self.rates = dict(rates or {})
+        self._counts = {}
+        self._lock = threading.Lock()
+        self.skipped = 0
+
+    def allow(self, key):
+        rate = self.rates.get(key, 1)
+        if rate <= 1:
+            return True
+        with self._lock:
+            count = self._counts.get(key, 0)
+            self._counts[key] = count + 1
+            if count % rate == 0:
+                return True
+            self.skipped += 1
+            return False
+
+
+class AddinLogger:
+    """带后台写入线程的分级日志器
+
+    WARNING 及以上级别的参数不截断，保留完整的错误信息和堆栈。
+    """
+
+    def __init__(self, level=INFO, palette_level=INFO, ring_size=1000, queue_size=10000,
+                 max_arg_chars=200, palette_size=200, palette_batch=50):
+        self.level = level
+        self.palette_level = palette_level
+        self.queue_size = queue_size
+        self.max_arg_chars = max_arg_chars
+        self.palette_batch = palette_batch
+        # 有待写的面板消息时调用（通知主线程调度器 drain）
+        self.on_palette_pending = None
+
+        self._pending = []
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._ring = deque(maxlen=ring_size)
+        self._palette = deque(maxlen=palette_size)
+        self._file = None
+        self._thread = None
+        self._running = False
+
+        # 统计信息
+        self.counts = {name: 0 for name in LEVEL_NAMES.values()}
+        self.dropped = 0
+        self.written = 0
+
+    def enabled(self, level):
+        return level >= self.level
+
+    def log(self, level, message, *args):
+        """记录一条日志；只保存参数引用，格式化在后台线程中进行"""
+        if level < self.level:
+            return
+        record = (time.time(), level, threading.current_thread().name, message, args)
+        with self._lock:
+            if len(self._pending) >= self.queue_size:
+                self.dropped += 1
+                return
+            self._pending.append(record)
+            self.counts[LEVEL_NAMES.get(level, 'INFO')] += 1
+        self._wakeup.set()
+
+    def debug(self, message, *args):
+        self.log(DEBUG, message, *args)
+
+    def info(self, message, *args):
+        self.log(INFO, message, *args)
+
+    def warning(self, message, *args):
+        self.log(WARNING, message, *args)
+
+    def error(self, message, *args):
+        self.log(ERROR, message, *args)
+
+    def format_message(self, level, message, args):
+        if not args:
+            return message
+        if level < WARNING:
+            args = tuple(truncate(arg, self.max_arg_chars) for arg in args)
+        try:
+            return message % args
+        except Exception:
+            return f"{message} {args!r}"
+
+    def start(self, path, max_bytes=5 * 1024 * 1024, backup_count=3):
+        """打开日志文件并启动后台写入线程"""
+        if self._running:
+            return
+        self._file = RotatingLogFile(path, max_bytes, backup_count)
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name='mcp-log-writer', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=2.0):
+        """写完队列中剩余的记录，停止后台线程并关闭文件"""
+        self._running = False
+        self._wakeup.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+        self.flush()
+        if self._file:
+            self._file.close()
+            self._file = None
+
+    def _run(self):
+        while self._running:
+            self._wakeup.wait()
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception:
+                pass  # 日志写入失败不能影响插件
+
+    def flush(self):
+        """格式化并写出队列中的所有记录"""
+        with self._write_lock:
+            with self._lock:
+                records, self._pending = self._pending, []
+            if not records:
+                return
+
+            palette_was_empty = not self._palette
+            for created, level, thread_name, message, args in records:
+                text = self.format_message(level, message, args)
+                self._ring.append((created, level, thread_name, text))
+                if level >= self.palette_level:
+                    self._palette.append(text)
+                if self._file:
+                    self._file.handle(logging.makeLogRecord({
+                        'name': 'fusion360_mcp_addin',
+                        'levelno': level,
+                        'levelname': LEVEL_NAMES.get(level, level),
+                        'threadName': thread_name,
+                        'msg': text,
+                        'created': created,
+                        'msecs': int(created * 1000) % 1000,
+                    }))
+            self.written += len(records)
+
+        if palette_was_empty and self._palette and self.on_palette_pending:
+            try:
+                self.on_palette_pending()
+            except Exception:
+                pass
+
+    def drain_palette(self, write):
+        """在主线程中把待写的面板消息交给 write(消息列表)，每次最多 palette_batch 条"""
+        lines = []
+        while self._palette and len(lines) < self.palette_batch:
+            lines.append(self._palette.popleft())
+        if lines:
+            write(lines)
+        if self._palette and self.on_palette_pending:
+            self.on_palette_pending()
+
+    def recent(self, limit=100, level=DEBUG):
+        """返回环形缓冲区中最近的记录（不含尚未写出的）"""
+        records = [record for record in list(self._ring) if record[1] >= level]
+        return [
+            {
+                "time": round(created, 3),
+                "level": LEVEL_NAMES.get(record_level, record_level),
+                "thread": thread_name,
+                "message": text,
+            }
+            for created, record_level, thread_name, text in records[-limit:]
+        ] if limit > 0 else []
+
+    def get_stats(self):
+        """获取日志统计信息"""
+        with self._lock:
+            pending = len(self._pending)
+        return {
+            "level": LEVEL_NAMES.get(self.level, self.level),
+            "counts": dict(self.counts),
+            "pending": pending,
+            "written": self.written,
+            "dropped": self.dropped,
+            "buffered": len(self._ring),
+            "palette_pending": len(self._palette),
+            "file": self._file.baseFilename if self._file else None,
+            "rotations": self._file.rotations if self._file else 0,
+        }
@@ -0,0 +1,112 @@
+"""
+Fusion360 MCP Addin 批量操作模块
+
+按顺序执行一组操作，后面的操作可以通过 "${引用.字段}" 使用前面操作返回的结果，
+例如 "${0.object_id}" 或 "${cyl.object_id}"。
+"""
+
+import re
+
+BATCH_MODE_STOP_ON_ERROR = 'stop_on_error'
+BATCH_MODE_CONTINUE = 'continue'
+BATCH_MODES = (BATCH_MODE_STOP_ON_ERROR, BATCH_MODE_CONTINUE)
+
+_REFERENCE_PATTERN = re.compile(r'^\$\{([^.{}]+)((?:\.[^.{}]+)*)\}$')
+
+
+class BatchReferenceError(Exception):
+    """引用了不存在或未成功的操作结果"""
+
+
+def resolve_references(value, results_by_ref):
+    """递归替换参数中的 "${引用.字段}" 占位符"""
+    if isinstance(value, str):
+        match = _REFERENCE_PATTERN.match(value)
+        if not match:
+            return value
+
+        ref = match.group(1)
+        if ref not in results_by_ref:
+            raise BatchReferenceError(f"引用的操作不存在或未成功: {ref}")
+
+        resolved = results_by_ref[ref]
+        for key in filter(None, match.group(2).split('.')):
+            if isinstance(resolved, list) and key.isdigit() and int(key) < len(resolved):
+                resolved = resolved[int(key)]
+            elif isinstance(resolved, dict) and key in resolved:
+                resolved = resolved[key]
+            else:
+                raise BatchReferenceError(f"引用的字段不存在: {value}")
+        return resolved
+
+    if isinstance(value, dict):
+        return {k: resolve_references(v, results_by_ref) for k, v in value.items()}
+    if isinstance(value, list):
+        return [resolve_references(v, results_by_ref) for v in value]
+    return value
+
+
+def execute_batch(operations, handlers, mode=BATCH_MODE_STOP_ON_ERROR):
+    """按顺序执行批量操作
+
+    handlers 为 {action: func(data)}，func 返回与单个请求相同的结果字典。
+    """
+    if mode not in BATCH_MODES:
+        return {"success": False, "error": f"不支持的批量模式: {mode}", "supported_modes": list(BATCH_MODES)}
+
+    results = []
+    results_by_ref = {}
+    failed = 0
+    stopped = False
+
+    for index, operation in enumerate(operations):
+        if not isinstance(operation, dict):
+            operation = {}
+        action = operation.get('action')
+        ref = operation.get('ref')
+        entry = {"index": index, "action": action}
+        if ref:
+            entry["ref"] = ref
+
+        if stopped:
+            entry.update({"success": False, "skipped": True})
+            results.append(entry)
+            continue
+
+        try:
+            handler = handlers.get(action)
+            if handler is None:
+                raise ValueError(f"不支持的批量操作: {action}")
+
+            data = {
+                "action": action,
+                "parameters": resolve_references(operation.get('parameters', {}), results_by_ref)
+            }
+            result = handler(data)
+        except Exception as e:
+            result = {"success": False, "error": str(e)}
+
+        entry["success"] = bool(result.get("success"))
+        if entry["success"]:
+            entry["result"] = result
+            results_by_ref[str(index)] = result
+            if ref:
+                results_by_ref[ref] = result
+        else:
+            entry["error"] = result.get("error", "操作失败")
+            failed += 1
+            if mode == BATCH_MODE_STOP_ON_ERROR:
+                stopped = True
+
+        results.append(entry)
+
+    skipped = sum(1 for entry in results if entry.get("skipped"))
+    return {
+        "success": failed == 0,
+        "mode": mode,
+        "total": len(operations),
+        "completed": len(operations) - failed - skipped,
+        "failed": failed,
+        "skipped": skipped,
+        "results": results
+    }
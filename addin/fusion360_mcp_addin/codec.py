@@ -0,0 +1,76 @@
+"""
+Fusion360 MCP Addin 消息编码模块
+
+默认使用 JSON；客户端在 Accept 中声明 application/msgpack 且插件环境安装了
+msgpack 时，响应改用 MessagePack 编码（浮点数多的坐标、相机矩阵等负载更小、
+编解码更快）。请求体按 Content-Type 解码。msgpack 是可选依赖，不可用时只支持 JSON。
+"""
+
+import json
+
+try:
+    import msgpack
+except ImportError:  # Fusion 自带的 Python 环境默认没有 msgpack
+    msgpack = None
+
+JSON_TYPE = 'application/json'
+MSGPACK_TYPE = 'application/msgpack'
+
+# 兼容一些客户端使用的旧 MIME 名称
+_MSGPACK_ALIASES = (MSGPACK_TYPE, 'application/x-msgpack', 'application/vnd.msgpack')
+
+
+class UnsupportedMediaType(ValueError):
+    """请求体的编码不受支持"""
+
+
+def supported_types():
+    """当前环境支持的编码（按优先顺序）"""
+    return (MSGPACK_TYPE, JSON_TYPE) if msgpack else (JSON_TYPE,)
+
+
+def _media_type(value):
+    """提取 MIME 类型并规范化，忽略参数"""
+    media_type = (value or '').split(';', 1)[0].strip().lower()
+    return MSGPACK_TYPE if media_type in _MSGPACK_ALIASES else media_type
+
+
+def negotiate(accept):
+    """根据 Accept 头选择响应编码，没有可用的候选时返回 JSON"""
+    best, best_q = JSON_TYPE, 0.0
+    for item in (accept or '').split(','):
+        media_type = _media_type(item)
+        q = 1.0
+        for param in item.split(';')[1:]:
+            name, _, value = param.strip().partition('=')
+            if name == 'q':
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if media_type == MSGPACK_TYPE and msgpack and q > best_q:
+            best, best_q = MSGPACK_TYPE, q
+        elif media_type in (JSON_TYPE, '*/*', 'application/*') and q > best_q:
+            best, best_q = JSON_TYPE, q
+    return best
+
+
+def encode(data, content_type=JSON_TYPE):
+    """按编码类型序列化响应数据"""
+    if content_type == MSGPACK_TYPE:
+        return msgpack.packb(data, use_bin_type=True)
+    return json.dumps(data, ensure_ascii=False).encode('utf-8')
+
+
+def decode(body, content_type=None):
+    """按 Content-Type 解析请求体，缺省按 JSON 处理"""
+    if not body:
+        return None
+    media_type = _media_type(content_type) or JSON_TYPE
+    if media_type == MSGPACK_TYPE:
+        if not msgpack:
+            raise UnsupportedMediaType("插件环境未安装 msgpack")
+        return msgpack.unpackb(body, raw=False)
+    if media_type != JSON_TYPE:
+        raise UnsupportedMediaType(f"不支持的请求体编码: {content_type}")
+    return json.loads(body.decode('utf-8'))
@@ -5,8 +5,22 @@ Fusion360 MCP Addin 公共方法模块
 import os
 import sys
 import logging
+import logging.handlers
 import traceback
-from datetime import datetime
+
+LOG_FILE_NAME = 'fusion360_mcp_addin.log'
+LOG_FILE_MAX_BYTES = 5 * 1024 * 1024
+LOG_FILE_BACKUPS = 3
+
+_LEVELS = {
+    'debug': logging.DEBUG,
+    'info': logging.INFO,
+    'warning': logging.WARNING,
+    'error': logging.ERROR,
+    'critical': logging.CRITICAL,
+}
+
+_fallback_logger = None
 
 
 def setup_logging():
@@ -20,9 +34,8 @@ def setup_logging():
         if not os.path.exists(log_dir):
             os.makedirs(log_dir)
 
-        # 创建日志文件名（按日期）
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        log_file = os.path.join(log_dir, f'fusion360_mcp_addin_{timestamp}.log')
+        # 固定的日志文件名，按大小轮转（不再每次启动新建带时间戳的文件）
+        log_file = os.path.join(log_dir, LOG_FILE_NAME)
 
         # 配置日志器
         logger = logging.getLogger('fusion360_mcp_addin')
@@ -33,7 +46,9 @@ def setup_logging():
             logger.removeHandler(handler)
 
         # 创建文件处理器
-        file_handler = logging.FileHandler(log_file, encoding='utf-8')
+        file_handler = logging.handlers.RotatingFileHandler(
+            log_file, maxBytes=LOG_FILE_MAX_BYTES, backupCount=LOG_FILE_BACKUPS, encoding='utf-8'
+        )
         file_handler.setLevel(logging.DEBUG)
 
         # 创建格式化器
@@ -56,34 +71,34 @@ def setup_logging():
         return None
 
 
+def _get_fallback_logger():
+    """日志器不可用时写入 temp_error.log 的备用日志器（只打开一次文件）"""
+    global _fallback_logger
+    if _fallback_logger is None:
+        script_dir = os.path.dirname(os.path.abspath(__file__))
+        handler = logging.handlers.RotatingFileHandler(
+            os.path.join(script_dir, 'temp_error.log'),
+            maxBytes=LOG_FILE_MAX_BYTES, backupCount=1, encoding='utf-8'
+        )
+        handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+        fallback = logging.getLogger('fusion360_mcp_addin.fallback')
+        fallback.setLevel(logging.DEBUG)
+        fallback.propagate = False
+        fallback.addHandler(handler)
+        _fallback_logger = fallback
+    return _fallback_logger
+
+
 def log_safe(logger, level, message, exception=None):
-    """安全的日志记录"""
+    """安全的日志记录，级别未启用时不拼接异常信息"""
     try:
-        if logger:
-            if exception:
-                message = f"{message}\n异常详情: {str(exception)}\n堆栈跟踪:\n{traceback.format_exc()}"
-
-            if level == 'debug':
-                logger.debug(message)
-            elif level == 'info':
-                logger.info(message)
-            elif level == 'warning':
-                logger.warning(message)
-            elif level == 'error':
-                logger.error(message)
-            elif level == 'critical':
-                logger.critical(message)
-        else:
-            # 如果日志器不可用，写入临时文件
-            script_dir = os.path.dirname(os.path.abspath(__file__))
-            temp_log = os.path.join(script_dir, 'temp_error.log')
-            with open(temp_log, 'a', encoding='utf-8') as f:
-                timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                f.write(f"{timestamp} - {level.upper()} - {message}\n")
-                if exception:
-                    f.write(f"异常: {str(exception)}\n")
-                    f.write(f"堆栈: {traceback.format_exc()}\n")
-                f.write("-" * 50 + "\n")
+        logger = logger or _get_fallback_logger()
+        level_value = _LEVELS.get(level, logging.INFO)
+        if not logger.isEnabledFor(level_value):
+            return
+        if exception:
+            message = f"{message}\n异常详情: {str(exception)}\n堆栈跟踪:\n{traceback.format_exc()}"
+        logger.log(level_value, message)
     except:
         pass  # 即使日志记录失败也不应该影响主程序
 
@@ -0,0 +1,110 @@
+"""
+Fusion360 MCP Addin 响应压缩模块
+
+按 Accept-Encoding 压缩较大的响应（截图 base64、API 列表、大的对象列表）：
+gzip 始终可用，环境中安装了 zstandard 时优先使用 zstd。小于阈值的响应不压缩，
+压缩节省的字节抵不上 CPU 开销。统计每种编码的压缩比和 CPU 时间。
+"""
+
+import gzip
+import threading
+import time
+
+try:
+    import zstandard
+except ImportError:  # Fusion 自带的 Python 环境默认没有 zstandard
+    zstandard = None
+
+COMPRESS_MIN_SIZE = 1024
+
+
+def supported_encodings():
+    """当前环境支持的压缩编码（按优先顺序）"""
+    return ('zstd', 'gzip') if zstandard else ('gzip',)
+
+
+def choose_encoding(accept_encoding):
+    """根据 Accept-Encoding 选择压缩编码，不接受任何支持的编码时返回 None"""
+    accepted = {}
+    for item in (accept_encoding or '').split(','):
+        name, *params = [part.strip() for part in item.split(';')]
+        q = 1.0
+        for param in params:
+            key, _, value = param.partition('=')
+            if key == 'q':
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if name:
+            accepted[name.lower()] = q
+
+    best, best_q = None, 0.0
+    for encoding in supported_encodings():
+        q = accepted.get(encoding, accepted.get('*', 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+class ResponseCompressor:
+    """压缩响应体并记录统计信息（线程安全）"""
+
+    def __init__(self, min_size=COMPRESS_MIN_SIZE, gzip_level=6, zstd_level=3):
+        self.min_size = min_size
+        self.gzip_level = gzip_level
+        self.zstd_level = zstd_level
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+        # 统计信息
+        self.skipped = 0
+        self._stats = {}
+
+    def _zstd_compressor(self):
+        # ZstdCompressor 不能在线程间共享
+        compressor = getattr(self._local, 'zstd', None)
+        if compressor is None:
+            compressor = self._local.zstd = zstandard.ZstdCompressor(level=self.zstd_level)
+        return compressor
+
+    def compress(self, body, accept_encoding):
+        """返回 (响应体, Content-Encoding)，不压缩时编码为 None"""
+        encoding = choose_encoding(accept_encoding) if len(body) >= self.min_size else None
+        if encoding is None:
+            with self._lock:
+                self.skipped += 1
+            return body, None
+
+        started = time.thread_time()
+        if encoding == 'zstd':
+            compressed = self._zstd_compressor().compress(body)
+        else:
+            compressed = gzip.compress(body, compresslevel=self.gzip_level, mtime=0)
+        cpu_time = time.thread_time() - started
+
+        with self._lock:
+            stats = self._stats.setdefault(encoding, {"responses": 0, "bytes_in": 0, "bytes_out": 0, "cpu_time": 0.0})
+            stats["responses"] += 1
+            stats["bytes_in"] += len(body)
+            stats["bytes_out"] += len(compressed)
+            stats["cpu_time"] += cpu_time
+        return compressed, encoding
+
+    def get_stats(self):
+        """获取压缩统计信息，ratio 为压缩前后字节数之比"""
+        with self._lock:
+            encodings = {
+                encoding: dict(
+                    stats,
+                    ratio=round(stats["bytes_in"] / stats["bytes_out"], 2) if stats["bytes_out"] else None,
+                    cpu_time=round(stats["cpu_time"], 6)
+                )
+                for encoding, stats in self._stats.items()
+            }
+            return {
+                "min_size": self.min_size,
+                "supported": list(supported_encodings()),
+                "skipped": self.skipped,
+                "encodings": encodings,
+            }
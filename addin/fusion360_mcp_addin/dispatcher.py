@@ -0,0 +1,250 @@
+"""
+Fusion360 MCP Addin 主线程调度模块
+
+Fusion 360 的 adsk API 只能在主线程中安全调用。HTTP 线程把任务放入有界队列，
+由注册的 CustomEvent 在主线程中批量取出执行，每个 HTTP 线程等待自己的 Future。
+每次 drain 结束时调用 on_drain，用于执行其他必须在主线程中完成的工作（写文本面板等）。
+每个任务执行完后调用 on_job_done(label, 排队秒数, 执行秒数)，用于统计各路由的耗时。
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+
+class QueueFullError(Exception):
+    """任务队列已满，调用方应返回 429"""
+
+
+class DispatcherStoppedError(Exception):
+    """调度器未启动或已停止"""
+
+
+class DeadlineExceededError(Exception):
+    """任务在开始执行前已超过调用方的截止时间"""
+
+
+class _Job:
+    """主线程任务"""
+
+    __slots__ = ("func", "args", "kwargs", "future", "enqueued_at", "deadline", "label")
+
+    def __init__(self, func, args, kwargs, deadline=None, label=None):
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.future = Future()
+        self.enqueued_at = time.monotonic()
+        self.deadline = deadline
+        self.label = label
+
+
+class MainThreadDispatcher:
+    """基于 CustomEvent 的主线程任务调度器"""
+
+    def __init__(self, app, event_id, max_depth=64, batch_size=8, on_drain=None, on_job_done=None):
+        self.app = app
+        self.event_id = event_id
+        self.max_depth = max_depth
+        self.batch_size = batch_size
+        self.on_drain = on_drain
+        self.on_job_done = on_job_done
+
+        self._queue = queue.Queue(maxsize=max_depth)
+        self._lock = threading.Lock()
+        self._event_pending = False
+        self._running = False
+        self._main_thread_id = None
+        self._custom_event = None
+        self._handler = None
+
+        # 统计信息
+        self.submitted = 0
+        self.rejected = 0
+        self.completed = 0
+        self.failed = 0
+        self.expired = 0
+
+    def start(self):
+        """注册 CustomEvent，必须在主线程中调用"""
+        import adsk.core
+
+        dispatcher = self
+
+        class _DrainHandler(adsk.core.CustomEventHandler):
+            def __init__(self):
+                super().__init__()
+
+            def notify(self, args):
+                dispatcher.drain()
+
+        self._main_thread_id = threading.get_ident()
+        self._custom_event = self.app.registerCustomEvent(self.event_id)
+        # Fusion 不持有处理器引用，必须自己保存，否则会被垃圾回收
+        self._handler = _DrainHandler()
+        self._custom_event.add(self._handler)
+        self._running = True
+
+    def stop(self):
+        """注销 CustomEvent，并让所有未执行的任务失败"""
+        self._running = False
+
+        if self._custom_event and self._handler:
+            try:
+                self._custom_event.remove(self._handler)
+            except Exception:
+                pass
+        try:
+            self.app.unregisterCustomEvent(self.event_id)
+        except Exception:
+            pass
+        self._custom_event = None
+        self._handler = None
+
+        while True:
+            try:
+                job = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            job.future.set_exception(DispatcherStoppedError("调度器已停止"))
+
+    @property
+    def running(self):
+        return self._running
+
+    def is_main_thread(self):
+        return threading.get_ident() == self._main_thread_id
+
+    def submit(self, func, *args, deadline=None, label=None, **kwargs):
+        """提交任务到主线程，返回 Future；队列满时抛出 QueueFullError
+
+        deadline 为 time.monotonic() 时间点，出队时已过期的任务不再执行。
+        label 原样传给 on_job_done（如请求路由）。
+        """
+        if not self._running:
+            raise DispatcherStoppedError("调度器未启动")
+
+        job = _Job(func, args, kwargs, deadline, label)
+
+        # 已在主线程中时直接执行，避免自己等待自己
+        if self.is_main_thread():
+            self._run_job(job)
+            return job.future
+
+        try:
+            self._queue.put_nowait(job)
+        except queue.Full:
+            with self._lock:
+                self.rejected += 1
+            raise QueueFullError(f"主线程任务队列已满 (最大深度 {self.max_depth})")
+
+        with self._lock:
+            self.submitted += 1
+        self._fire()
+        return job.future
+
+    def call(self, func, *args, timeout=None, deadline=None, label=None, **kwargs):
+        """提交任务并等待结果，等待时间不超过 timeout 和 deadline 中较早者"""
+        if deadline is not None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                with self._lock:
+                    self.expired += 1
+                raise DeadlineExceededError("请求到达时已超过截止时间")
+            timeout = remaining if timeout is None else min(timeout, remaining)
+
+        future = self.submit(func, *args, deadline=deadline, label=label, **kwargs)
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            raise TimeoutError(f"主线程任务等待超时 ({timeout} 秒)")
+
+    def drain(self):
+        """在主线程中执行一批任务，队列未清空时再次触发事件"""
+        with self._lock:
+            self._event_pending = False
+
+        for _ in range(self.batch_size):
+            try:
+                job = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            self._run_job(job)
+
+        if self.on_drain:
+            try:
+                self.on_drain()
+            except Exception:
+                pass
+
+        if not self._queue.empty():
+            self._fire()
+
+    def wake(self):
+        """没有任务时也触发一次 drain，以便执行 on_drain"""
+        if not self._running:
+            return
+        try:
+            self._fire()
+        except Exception:
+            pass
+
+    def _run_job(self, job):
+        # 等待方已超时取消的任务不再执行
+        if not job.future.set_running_or_notify_cancel():
+            return
+
+        if job.deadline is not None and time.monotonic() >= job.deadline:
+            self.expired += 1
+            job.future.set_exception(DeadlineExceededError("任务在执行前已超过截止时间"))
+            return
+
+        started = time.monotonic()
+        try:
+            result = job.func(*job.args, **job.kwargs)
+        except Exception as e:
+            self.failed += 1
+            self._job_done(job, started)
+            job.future.set_exception(e)
+        else:
+            self.completed += 1
+            self._job_done(job, started)
+            job.future.set_result(result)
+
+    def _job_done(self, job, started):
+        # 在设置结果之前记录，等待方拿到结果时统计已经更新
+        if self.on_job_done:
+            try:
+                self.on_job_done(job.label, started - job.enqueued_at, time.monotonic() - started)
+            except Exception:
+                pass
+
+    def _fire(self):
+        with self._lock:
+            if self._event_pending:
+                return
+            self._event_pending = True
+
+        try:
+            self.app.fireCustomEvent(self.event_id, "")
+        except Exception:
+            with self._lock:
+                self._event_pending = False
+            raise
+
+    def get_stats(self):
+        """获取调度器统计信息"""
+        return {
+            "running": self._running,
+            "queue_depth": self._queue.qsize(),
+            "max_depth": self.max_depth,
+            "batch_size": self.batch_size,
+            "submitted": self.submitted,
+            "rejected": self.rejected,
+            "completed": self.completed,
+            "failed": self.failed,
+            "expired": self.expired,
+        }
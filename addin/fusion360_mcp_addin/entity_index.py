@@ -0,0 +1,88 @@
+"""
+Fusion360 MCP Addin 实体索引模块
+
+维护 entityToken 到已解析实体的映射，edit/delete/get 对象时无需线性扫描。
+修改操作会登记或移除条目，文档事件会清空索引；未命中或条目已失效时
+回退到 design.findEntityByToken 并写回索引。
+"""
+
+import threading
+from collections import OrderedDict
+
+
+class EntityIndex:
+    """entityToken -> 实体 的 LRU 索引"""
+
+    def __init__(self, max_entries=10000):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+        # 统计信息
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.not_found = 0
+
+    def add(self, token, entity):
+        """登记实体（创建或解析后调用）"""
+        if not token or entity is None or self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[token] = entity
+            self._entries.move_to_end(token)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def remove(self, token):
+        """移除实体（删除后调用）"""
+        with self._lock:
+            self._entries.pop(token, None)
+
+    def clear(self):
+        """清空索引（切换、关闭文档或回滚后调用）"""
+        with self._lock:
+            self._entries.clear()
+
+    def resolve(self, token, design, accept=None):
+        """解析 token，返回实体或 None
+
+        accept(entity) 为 False 的实体会被跳过（例如不支持的对象类型）。
+        """
+        with self._lock:
+            entity = self._entries.get(token)
+            if entity is not None:
+                if _is_valid(entity):
+                    self._entries.move_to_end(token)
+                    self.hits += 1
+                    return entity
+                # 实体已被删除或因撤销、时间线变化而失效
+                del self._entries[token]
+                self.stale += 1
+            self.misses += 1
+
+        for candidate in design.findEntityByToken(token) or []:
+            if _is_valid(candidate) and (accept is None or accept(candidate)):
+                self.add(token, candidate)
+                return candidate
+
+        with self._lock:
+            self.not_found += 1
+        return None
+
+    def get_stats(self):
+        """获取索引统计信息"""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "stale": self.stale,
+            "not_found": self.not_found,
+        }
+
+
+def _is_valid(entity):
+    return getattr(entity, 'isValid', True)
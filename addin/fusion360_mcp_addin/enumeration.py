@@ -0,0 +1,272 @@
+"""
+Fusion360 MCP Addin 对象枚举模块
+
+遍历根组件和所有子装配（allOccurrences）中的实体，按类型、名称通配符、可见性和
+组件路径过滤，并以游标分页返回。遍历是惰性的，每页只构造 page_size 个对象描述；
+游标记录下一个对象在集合中的位置，翻页时通过 item(索引) 直接从该位置继续，
+不再从头读取之前各页对象的属性，浏览整个设计的开销与对象总数成正比。
+
+每个 Fusion API 属性读取都有开销，对象描述只计算 fields 中请求的字段；
+包围盒、物理属性等昂贵字段必须显式请求。
+"""
+
+import base64
+import fnmatch
+
+OBJECT_TYPES = ('body', 'occurrence')
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+
+def _bounding_box(obj):
+    box = obj.boundingBox
+    if not box:
+        return None
+    return {
+        "min": [box.minPoint.x, box.minPoint.y, box.minPoint.z],
+        "max": [box.maxPoint.x, box.maxPoint.y, box.maxPoint.z]
+    }
+
+
+def _physical_properties(obj):
+    props = obj.physicalProperties
+    center = props.centerOfMass
+    return {
+        "mass": props.mass,
+        "volume": props.volume,
+        "area": props.area,
+        "density": props.density,
+        "center_of_mass": [center.x, center.y, center.z]
+    }
+
+
+# 各类型对象可用的字段，值为 (对象, 组件路径) -> 字段值
+OBJECT_FIELDS = {
+    'body': {
+        'id': lambda obj, path: obj.entityToken,
+        'name': lambda obj, path: obj.name if obj.name else "实体",
+        'type': lambda obj, path: 'body',
+        'visible': lambda obj, path: obj.isVisible,
+        'material': lambda obj, path: obj.material.name if obj.material else "默认",
+        'appearance': lambda obj, path: obj.appearance.name if obj.appearance else None,
+        'path': lambda obj, path: path,
+        'is_solid': lambda obj, path: obj.isSolid,
+        'bounding_box': lambda obj, path: _bounding_box(obj),
+        'physical_properties': lambda obj, path: _physical_properties(obj),
+    },
+    'occurrence': {
+        'id': lambda obj, path: obj.entityToken,
+        'name': lambda obj, path: obj.name,
+        'type': lambda obj, path: 'occurrence',
+        'visible': lambda obj, path: obj.isVisible,
+        'component': lambda obj, path: obj.component.name if obj.component else None,
+        'path': lambda obj, path: path,
+        'bounding_box': lambda obj, path: _bounding_box(obj),
+        'physical_properties': lambda obj, path: _physical_properties(obj),
+    },
+    'feature': {
+        'id': lambda obj, path: obj.entityToken,
+        'name': lambda obj, path: obj.name,
+        'type': lambda obj, path: 'feature',
+        'path': lambda obj, path: path,
+        'bodies': lambda obj, path: [body.entityToken for body in obj.bodies],
+    },
+}
+
+# 默认返回的字段；昂贵字段（包围盒、物理属性）只在显式请求时计算
+DEFAULT_FIELDS = ('id', 'name', 'type', 'visible', 'material', 'component', 'path')
+EXPENSIVE_FIELDS = ('bounding_box', 'physical_properties')
+ALL_FIELDS = tuple(dict.fromkeys(name for fields in OBJECT_FIELDS.values() for name in fields))
+
+# Fusion objectType 到对象类型的映射
+OBJECT_KINDS = {
+    'adsk::fusion::BRepBody': 'body',
+    'adsk::fusion::Occurrence': 'occurrence',
+    'adsk::fusion::ExtrudeFeature': 'feature',
+}
+
+
+class ObjectQueryError(ValueError):
+    """对象查询参数或游标无效"""
+
+
+# 位置 (子装配索引, 实体索引)：子装配索引为 -1 表示根组件的实体，
+# 实体索引为 -1 表示子装配本身（尚未产出其中的实体）
+START_POSITION = (-1, 0)
+
+
+def encode_cursor(position, revision):
+    """把遍历位置和设计版本号编码为不透明游标"""
+    occurrence_index, body_index = position
+    raw = f"{occurrence_index}:{body_index}:{revision}".encode('ascii')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    """解码游标，返回 (遍历位置, 版本号)"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        occurrence_index, body_index, revision = (
+            int(part) for part in base64.urlsafe_b64decode(padded.encode('ascii')).decode('ascii').split(':')
+        )
+    except Exception:
+        raise ObjectQueryError(f"无效的游标: {cursor}")
+    if occurrence_index < -1 or body_index < -1 or (occurrence_index == -1 and body_index < 0):
+        raise ObjectQueryError(f"无效的游标: {cursor}")
+    return (occurrence_index, body_index), revision
+
+
+def parse_fields(value):
+    """解析 fields 参数（逗号分隔字符串或列表），None 表示默认字段"""
+    if value is None or value == '':
+        return DEFAULT_FIELDS
+    if isinstance(value, str):
+        value = value.split(',')
+    fields = tuple(dict.fromkeys(field.strip() for field in value if field.strip()))
+    unknown = [field for field in fields if field not in ALL_FIELDS]
+    if unknown:
+        raise ObjectQueryError(f"不支持的字段: {unknown}，可选: {list(ALL_FIELDS)}")
+    return fields or DEFAULT_FIELDS
+
+
+def _parse_bool(value):
+    if value is None or isinstance(value, bool):
+        return value
+    text = str(value).strip().lower()
+    if text in ('true', '1', 'yes'):
+        return True
+    if text in ('false', '0', 'no'):
+        return False
+    raise ObjectQueryError(f"无效的布尔值: {value}")
+
+
+class ObjectQuery:
+    """对象列表查询条件"""
+
+    def __init__(self, object_type=None, name=None, visible=None, component=None,
+                 page_size=DEFAULT_PAGE_SIZE, cursor=None, fields=None):
+        if object_type is not None and object_type not in OBJECT_TYPES:
+            raise ObjectQueryError(f"不支持的对象类型: {object_type}，可选: {list(OBJECT_TYPES)}")
+        try:
+            page_size = int(page_size)
+        except (TypeError, ValueError):
+            raise ObjectQueryError(f"无效的 page_size: {page_size}")
+        if page_size < 1:
+            raise ObjectQueryError("page_size 必须大于 0")
+
+        self.object_type = object_type
+        self.name = name
+        self.visible = _parse_bool(visible)
+        self.component = component
+        self.page_size = min(page_size, MAX_PAGE_SIZE)
+        self.cursor = cursor
+        self.fields = parse_fields(fields)
+
+    @classmethod
+    def from_params(cls, params):
+        """从查询字符串（parse_qs 结果）或批量操作参数构造查询"""
+        params = params or {}
+
+        def get(name):
+            value = params.get(name)
+            if isinstance(value, list):
+                value = ','.join(value) if name == 'fields' else (value[0] if value else None)
+            return value if value != '' else None
+
+        return cls(
+            object_type=get('type'),
+            name=get('name'),
+            visible=get('visible'),
+            component=get('component'),
+            page_size=get('page_size') or DEFAULT_PAGE_SIZE,
+            cursor=get('cursor'),
+            fields=get('fields')
+        )
+
+    def matches(self, kind, obj, path):
+        """判断对象是否满足过滤条件（只读取名称、可见性等轻量属性）"""
+        if self.object_type and kind != self.object_type:
+            return False
+        if self.component is not None and not fnmatch.fnmatchcase(path, self.component):
+            return False
+        if self.name is not None and not fnmatch.fnmatchcase(obj.name or '', self.name):
+            return False
+        if self.visible is not None and bool(obj.isVisible) != self.visible:
+            return False
+        return True
+
+
+def iter_design_objects(root_component, start=START_POSITION):
+    """从 start 位置开始惰性遍历设计中的对象，产出 (类型, 对象, 组件路径, 位置)
+
+    根组件的实体路径为空字符串；子装配中的实体通过 occurrence.bRepBodies 取得代理对象，
+    同一组件的多个实例会分别列出。
+    """
+    start_occurrence, start_body = start
+    if start_occurrence == -1:
+        bodies = root_component.bRepBodies
+        for index in range(start_body, bodies.count):
+            yield 'body', bodies.item(index), '', (-1, index)
+        start_occurrence, start_body = 0, -1
+
+    occurrences = root_component.allOccurrences
+    for occurrence_index in range(start_occurrence, occurrences.count):
+        occurrence = occurrences.item(occurrence_index)
+        path = occurrence.fullPathName
+        first_body = start_body if occurrence_index == start_occurrence else -1
+        if first_body == -1:
+            yield 'occurrence', occurrence, path, (occurrence_index, -1)
+            first_body = 0
+        bodies = occurrence.bRepBodies
+        for index in range(first_body, bodies.count):
+            yield 'body', bodies.item(index), path, (occurrence_index, index)
+
+
+def object_kind(entity):
+    """根据 Fusion objectType 判断对象类型，不支持的类型返回 None"""
+    return OBJECT_KINDS.get(getattr(entity, 'objectType', None))
+
+
+def object_path(kind, obj):
+    """对象所在的组件路径，根组件中的实体为空字符串"""
+    if kind == 'occurrence':
+        return obj.fullPathName
+    context = getattr(obj, 'assemblyContext', None)
+    return context.fullPathName if context else ''
+
+
+def describe_object(kind, obj, path, fields=DEFAULT_FIELDS):
+    """只计算 fields 中请求且该类型支持的字段"""
+    getters = OBJECT_FIELDS[kind]
+    return {field: getters[field](obj, path) for field in fields if field in getters}
+
+
+def list_objects(root_component, query, revision=0):
+    """按查询条件返回一页对象
+
+    游标记录下一个匹配对象的位置和生成时的设计版本号；版本号变化后仍从该位置继续，
+    但在结果中标记 stale_cursor，提示调用方可能需要从头重新浏览。
+    """
+    position, cursor_revision = decode_cursor(query.cursor) if query.cursor else (START_POSITION, revision)
+
+    objects = []
+    next_position = None
+    for kind, obj, path, object_position in iter_design_objects(root_component, position):
+        if not query.matches(kind, obj, path):
+            continue
+        if len(objects) >= query.page_size:
+            next_position = object_position
+            break
+        objects.append(describe_object(kind, obj, path, query.fields))
+
+    has_more = next_position is not None
+    return {
+        "success": True,
+        "objects": objects,
+        "count": len(objects),
+        "page_size": query.page_size,
+        "has_more": has_more,
+        "next_cursor": encode_cursor(next_position, revision) if has_more else None,
+        "revision": revision,
+        "stale_cursor": cursor_revision != revision
+    }
@@ -0,0 +1,106 @@
+"""
+Fusion360 MCP Addin 事件推送模块
+
+Fusion 事件处理器把文档、设计、时间线和选择变化发布到 EventBroadcaster，
+/api/events 以 Server-Sent Events 长连接推送给订阅者，MCP 服务器据此失效缓存，
+无需轮询。每个订阅者有独立的有界队列，慢订阅者只会丢失自己的事件。
+"""
+
+import json
+import queue
+import threading
+import time
+
+EVENT_TYPES = ('document', 'design', 'timeline', 'selection')
+
+
+class Subscription:
+    """单个 SSE 连接的事件队列"""
+
+    def __init__(self, max_pending):
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._lock = threading.Lock()
+        self.dropped = 0
+
+    def put(self, event):
+        with self._lock:
+            try:
+                self._queue.put_nowait(event)
+            except queue.Full:
+                # 丢弃最旧的事件；客户端从事件 ID 的跳跃得知期间有事件丢失
+                try:
+                    self._queue.get_nowait()
+                except queue.Empty:
+                    pass
+                self.dropped += 1
+                self._queue.put_nowait(event)
+
+    def get(self, timeout=None):
+        """等待下一个事件，超时返回 None"""
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+
+class EventBroadcaster:
+    """把事件分发给所有订阅者（线程安全）"""
+
+    def __init__(self, max_pending=256, clock=time.time):
+        self.max_pending = max_pending
+        self._clock = clock
+        self._subscribers = set()
+        self._lock = threading.Lock()
+        self._next_id = 1
+
+        # 统计信息
+        self.published = 0
+
+    def subscribe(self):
+        subscription = Subscription(self.max_pending)
+        with self._lock:
+            self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def publish(self, event_type, data=None):
+        """发布事件，返回事件 ID"""
+        if event_type not in EVENT_TYPES:
+            raise ValueError(f"不支持的事件类型: {event_type}")
+        with self._lock:
+            event = {
+                "id": self._next_id,
+                "type": event_type,
+                "time": self._clock(),
+                "data": data or {}
+            }
+            self._next_id += 1
+            self.published += 1
+            subscribers = list(self._subscribers)
+
+        for subscription in subscribers:
+            subscription.put(event)
+        return event["id"]
+
+    def get_stats(self):
+        """获取推送统计信息"""
+        with self._lock:
+            subscribers = list(self._subscribers)
+        return {
+            "subscribers": len(subscribers),
+            "published": self.published,
+            "dropped": sum(subscription.dropped for subscription in subscribers),
+        }
+
+
+def format_sse(event):
+    """把事件编码为 SSE 帧"""
+    payload = json.dumps(event, ensure_ascii=False)
+    return f"id: {event['id']}\nevent: {event['type']}\ndata: {payload}\n\n".encode('utf-8')
+
+
+# 空闲时发送的注释行，防止连接被中间层关闭，同时及时发现客户端断开
+SSE_KEEPALIVE = b": keepalive\n\n"
@@ -0,0 +1,178 @@
+"""
+Fusion360 MCP Addin 长度前缀帧传输模块
+
+在一条持久 TCP 连接上复用多个请求：每个请求带有 ID，由工作线程并发处理，
+响应按完成顺序写回（可以乱序），客户端按 ID 匹配。与 HTTP 共用同一套路由，
+省去每次请求的连接建立和 HTTP 头解析。
+
+帧格式：4 字节总长度 + 4 字节头部长度 + 头部 JSON + 消息体（大端序）。
+请求头部为 {"id", "method", "path", "headers"}，响应头部为 {"id", "status", "headers"}，
+消息体是原始字节（通常为 JSON）。
+"""
+
+import json
+import socket
+import struct
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+FRAME_PREFIX = struct.Struct('>II')
+MAX_FRAME_SIZE = 64 * 1024 * 1024
+
+
+class FrameError(Exception):
+    """帧格式错误"""
+
+
+def encode_frame(header, body=b''):
+    """编码一帧"""
+    header_bytes = json.dumps(header, ensure_ascii=False).encode('utf-8')
+    total = len(header_bytes) + len(body)
+    return FRAME_PREFIX.pack(total, len(header_bytes)) + header_bytes + body
+
+
+def _read_exact(stream, size):
+    data = stream.read(size)
+    if len(data) < size:
+        if data:
+            raise FrameError("连接在帧中途关闭")
+        return None
+    return data
+
+
+def read_frame(stream):
+    """读取一帧，返回 (头部, 消息体)，连接关闭时返回 None"""
+    prefix = _read_exact(stream, FRAME_PREFIX.size)
+    if prefix is None:
+        return None
+    total, header_size = FRAME_PREFIX.unpack(prefix)
+    if total > MAX_FRAME_SIZE or header_size > total:
+        raise FrameError(f"帧长度无效: {total}")
+
+    payload = _read_exact(stream, total)
+    if payload is None:
+        raise FrameError("连接在帧中途关闭")
+    return json.loads(payload[:header_size].decode('utf-8')), payload[header_size:]
+
+
+def error_frame(request_header, status, message):
+    """编码请求 request_header 对应的 JSON 错误响应帧"""
+    payload = json.dumps({"success": False, "error": message}, ensure_ascii=False).encode('utf-8')
+    header = {"id": request_header.get('id'), "status": status, "headers": {'Content-Type': 'application/json'}}
+    return encode_frame(header, payload)
+
+
+class FramedServer:
+    """帧协议服务器
+
+    handler(method, path, headers, body) 返回 (状态码, 响应头, 消息体字节)，
+    在工作线程池中执行，因此同一连接上的慢请求不会阻塞后续请求。
+    """
+
+    def __init__(self, host, port, handler, max_workers=8):
+        self.host = host
+        self.port = port
+        self._handler = handler
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='framed')
+        self._socket = None
+        self._accept_thread = None
+        self._connections = set()
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+
+        # 统计信息
+        self.accepted = 0
+        self.requests = 0
+        self.errors = 0
+
+    def start(self):
+        self._socket = socket.create_server((self.host, self.port))
+        self.port = self._socket.getsockname()[1]
+        self._accept_thread = threading.Thread(target=self._accept_loop, daemon=True)
+        self._accept_thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        if self._socket:
+            self._socket.close()
+        with self._lock:
+            connections = list(self._connections)
+        for conn in connections:
+            try:
+                conn.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            conn.close()
+        self._executor.shutdown(wait=False)
+
+    def _accept_loop(self):
+        while not self._stopped.is_set():
+            try:
+                conn, _ = self._socket.accept()
+            except OSError:
+                break
+            conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            with self._lock:
+                self._connections.add(conn)
+                self.accepted += 1
+            threading.Thread(target=self._serve_connection, args=(conn,), daemon=True).start()
+
+    def _serve_connection(self, conn):
+        write_lock = threading.Lock()
+        stream = conn.makefile('rb')
+        try:
+            while not self._stopped.is_set():
+                frame = read_frame(stream)
+                if frame is None:
+                    break
+                try:
+                    self._executor.submit(self._handle_frame, conn, write_lock, *frame)
+                except RuntimeError:
+                    # 线程池已关闭（插件正在停止），回复 503 后关闭连接
+                    with self._lock:
+                        self.errors += 1
+                    self._send(conn, write_lock, error_frame(frame[0], 503, "插件正在停止"))
+                    break
+        except (OSError, FrameError, ValueError):
+            pass
+        finally:
+            with self._lock:
+                self._connections.discard(conn)
+            stream.close()
+            conn.close()
+
+    def _handle_frame(self, conn, write_lock, header, body):
+        with self._lock:
+            self.requests += 1
+        try:
+            status, headers, payload = self._handler(
+                header.get('method', 'GET'), header.get('path', '/'), header.get('headers') or {}, body
+            )
+        except Exception as e:
+            with self._lock:
+                self.errors += 1
+            self._send(conn, write_lock, error_frame(header, 500, str(e)))
+            return
+
+        self._send(conn, write_lock, encode_frame(
+            {"id": header.get('id'), "status": status, "headers": headers or {}}, payload
+        ))
+
+    @staticmethod
+    def _send(conn, write_lock, frame):
+        try:
+            with write_lock:
+                conn.sendall(frame)
+        except OSError:
+            pass
+
+    def get_stats(self):
+        """获取帧协议服务器统计信息"""
+        with self._lock:
+            return {
+                "port": self.port,
+                "connections": len(self._connections),
+                "accepted": self.accepted,
+                "requests": self.requests,
+                "errors": self.errors,
+            }
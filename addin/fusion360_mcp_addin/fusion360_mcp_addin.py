@@ -6,119 +6,660 @@ Fusion360 MCP Addin - 改进版本
 import adsk.core
 import adsk.fusion
 import traceback
-import json
 import threading
+import time
 import os
 import base64
 import tempfile
-from datetime import datetime
-from http.server import HTTPServer, BaseHTTPRequestHandler
+import socket
 import urllib.parse
 
+from dispatcher import MainThreadDispatcher, QueueFullError, DispatcherStoppedError, DeadlineExceededError
+from batch import execute_batch, BATCH_MODE_STOP_ON_ERROR
+from transaction import DesignTransaction
+from revision import RevisionCounter, make_etag, etag_matches
+from entity_index import EntityIndex
+from journal import ChangeJournal
+from events import EventBroadcaster, format_sse, SSE_KEEPALIVE
+from framed import FramedServer
+from http_server import KeepAliveHTTPServer, KeepAliveRequestHandler, UnixHTTPServer
+import codec
+from compress import ResponseCompressor
+from static_responses import StaticResponse, StaticResponseRegistry
+from metrics import MetricsRegistry, TextResponse
+from addin_log import AddinLogger, PathSampler, DEBUG, INFO, WARNING, ERROR, LEVELS
+from screenshot_cache import ScreenshotCache, make_screenshot_key
+from multiview import CAMERA_PRESETS, MultipartResponse, parse_presets
+from view_quality import QUALITY_FINAL, QUALITY_PREVIEW, QUALITY_PRESETS, DisplayOverrides, CaptureTimings, preset_size
+from enumeration import ObjectQuery, list_objects, parse_fields, object_kind, object_path, describe_object
+
+# 配置
+ADDIN_NAME = "Fusion360 MCP Addin"
+HTTP_PORT = 9000
+HTTP_HOST = 'localhost'
+
+# Unix 域套接字（与 MCP 服务器在同一台机器上时绕过 TCP 回环，也不占用端口）
+# Windows 上的 Python 没有 AF_UNIX，仍然只用 TCP
+UDS_ENABLED = hasattr(socket, 'AF_UNIX')
+UDS_PATH = os.path.join(tempfile.gettempdir(), 'fusion360_mcp.sock')
+
+# 长度前缀帧传输（持久连接、请求 ID 复用），客户端可在 Settings 中选择
+FRAMED_ENABLED = True
+FRAMED_PORT = 9001
+FRAMED_MAX_WORKERS = 8
+
+# 主线程调度配置
+MAIN_THREAD_EVENT_ID = 'fusion360_mcp_main_thread_dispatch'
+QUEUE_MAX_DEPTH = 64       # 任务队列最大深度，超出时返回 429
+QUEUE_BATCH_SIZE = 8       # 每次 CustomEvent 最多执行的任务数
+JOB_TIMEOUT = 60           # HTTP 线程等待主线程结果的超时时间（秒）
+RETRY_AFTER_SECONDS = 1    # 429 响应中的 Retry-After
+REQUEST_TIMEOUT_HEADER = 'X-Request-Timeout'  # 客户端剩余等待时间（秒）
+REVISION_HEADER = 'X-Design-Revision'
+
+# ETag 计算方式：静态内容与版本号无关，视图信息和截图还依赖相机版本号
+# （切换视觉样式等界面命令完成时由 CommandRevisionHandler 递增设计版本号）
+STATIC_GET_PATHS = ('/api/health', '/api/list')
+CAMERA_GET_PATHS = ('/api/view', '/api/view/raw', '/api/views')
+# 内容不只由设计版本号决定（事务状态、运行统计、日志），不生成 ETag
+UNVERSIONED_GET_PATHS = ('/api/status', '/api/transaction', '/api/logs', '/api/metrics')
+
+# 截图原始字节以分块传输发送，每块大小
+FILE_CHUNK_SIZE = 64 * 1024
+IMAGE_CONTENT_TYPES = {'png': 'image/png', 'jpg': 'image/jpeg', 'jpeg': 'image/jpeg'}
+
+# 截图缓存：目录、总大小上限和条目数上限；启动时清理旧版本留在临时目录中的截图
+SCREENSHOT_CACHE_DIR = os.path.join(tempfile.gettempdir(), 'fusion360_mcp_views')
+SCREENSHOT_CACHE_MAX_BYTES = 256 * 1024 * 1024
+SCREENSHOT_CACHE_MAX_ENTRIES = 64
+LEGACY_SCREENSHOT_PATTERN = os.path.join(tempfile.gettempdir(), 'fusion360_view_*')
+
+# 事件推送配置
+EVENTS_KEEPALIVE_SECONDS = 15  # SSE 空闲时发送心跳的间隔
+SELECTION_EVENT_MAX_IDS = 50   # 选择事件中最多包含的实体数
+
+# 批量操作配置
+BATCH_MAX_OPERATIONS = 500  # 单次批量请求的最大操作数
+BATCH_JOB_TIMEOUT = 300     # 批量请求等待主线程结果的超时时间（秒）
+
+# 日志：级别、轮转文件、面板消息级别、环形缓冲区大小、参数截断长度
+LOG_LEVEL = INFO
+LOG_PALETTE_LEVEL = INFO
+LOG_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'logs', 'fusion360_mcp_addin.log')
+LOG_FILE_MAX_BYTES = 5 * 1024 * 1024
+LOG_FILE_BACKUPS = 3
+LOG_RING_SIZE = 1000
+LOG_MAX_ARG_CHARS = 200
+# 请求日志采样：路径 -> 每 N 次记录 1 次（健康检查、状态轮询频率高）
+LOG_SAMPLE_RATES = {'/api/health': 100, '/api/status': 10}
+
+# /api/metrics 中单独统计的路由，/api/object/<id> 归并为 /api/object/{id}，其他路径归为 other
+METRICS_ROUTES = (
+    '/api/health', '/api/status', '/api/objects', '/api/view', '/api/view/raw', '/api/views',
+    '/api/list', '/api/transaction', '/api/changes', '/api/logs', '/api/metrics',
+    '/api/document', '/api/object', '/api/batch',
+    '/api/transaction/begin', '/api/transaction/commit', '/api/transaction/rollback',
+)
+
 # 全局变量
 app = None
 ui = None
 http_server = None
 server_thread = None
+framed_server = None
+uds_server = None
+uds_thread = None
+main_thread_dispatcher = None
+active_transaction = None
 
-# 配置
-ADDIN_NAME = "Fusion360 MCP Addin"
-HTTP_PORT = 9000
-HTTP_HOST = 'localhost'
+# 当前 HTTP 请求的状态（每个处理线程独立）
+request_state = threading.local()
+
+# 设计版本号（修改操作和文档事件时递增）与相机版本号（视角变化时递增）
+design_revision = RevisionCounter()
+camera_revision = RevisionCounter()
+
+# entityToken -> 实体索引（创建时登记、删除时移除、文档切换时清空）
+entity_index = EntityIndex()
+
+# 变更日志（记录每个版本号创建、修改、删除的 entityToken）
+change_journal = ChangeJournal(epoch=design_revision.epoch)
+
+# 文档、设计、时间线、选择事件推送（/api/events）
+event_broadcaster = EventBroadcaster()
+events_stopped = threading.Event()
 
+# 按 Accept-Encoding 压缩较大的 HTTP 响应
+response_compressor = ResponseCompressor()
 
-def log_message(message):
-    """简单的日志记录"""
+# 日志：后台线程写入轮转文件，文本面板消息由主线程写出；请求日志按路径采样
+addin_logger = AddinLogger(
+    level=LOG_LEVEL,
+    palette_level=LOG_PALETTE_LEVEL,
+    ring_size=LOG_RING_SIZE,
+    max_arg_chars=LOG_MAX_ARG_CHARS
+)
+request_log_sampler = PathSampler(LOG_SAMPLE_RATES)
+
+# 按路由统计的请求数、错误数、耗时和大小（/api/metrics）
+request_metrics = MetricsRegistry(known_routes=METRICS_ROUTES)
+
+# 启动时预先序列化的 /api/health、/api/list 响应
+static_responses = StaticResponseRegistry()
+
+# 已渲染截图的 LRU 缓存
+screenshot_cache = ScreenshotCache(
+    SCREENSHOT_CACHE_DIR,
+    max_bytes=SCREENSHOT_CACHE_MAX_BYTES,
+    max_entries=SCREENSHOT_CACHE_MAX_ENTRIES
+)
+
+# 各质量预设的截图耗时
+capture_timings = CaptureTimings()
+
+# Fusion 事件处理器，必须保持引用
+event_handlers = []
+
+
+def log_message(message, *args, level=INFO):
+    """记录日志，message 中的 % 参数由后台线程延迟格式化"""
+    addin_logger.log(level, message, *args)
+
+
+def write_palette(lines):
+    """在 Fusion 360 的文本面板中显示消息（只能在主线程调用）"""
     try:
         if ui:
-            # 在 Fusion 360 的文本面板中显示消息
-            palettes = ui.palettes
-            text_palette = palettes.itemById('TextCommands')
+            text_palette = ui.palettes.itemById('TextCommands')
             if text_palette:
-                text_palette.writeText(f"[MCP] {message}")
+                for line in lines:
+                    text_palette.writeText(f"[MCP] {line}")
     except:
         pass  # 忽略日志错误
 
 
+def flush_palette():
+    """写出待显示的日志消息，主线程调度器每次 drain 时调用"""
+    addin_logger.drain_palette(write_palette)
+
+
+def get_recent_logs(params):
+    """返回环形缓冲区中最近的日志（不需要主线程）"""
+    try:
+        limit = min(max(int(params.get('limit', ['100'])[0]), 0), LOG_RING_SIZE)
+    except ValueError:
+        return {"success": False, "error": "limit 必须是整数"}
+    level_name = params.get('level', ['DEBUG'])[0].upper()
+    if level_name not in LEVELS:
+        return {"success": False, "error": f"未知的日志级别: {level_name}，可选: {', '.join(LEVELS)}"}
+    addin_logger.flush()
+    records = addin_logger.recent(limit, LEVELS[level_name])
+    return {"success": True, "count": len(records), "records": records}
+
+
 def handle_error(error_name, show_message=True):
     """标准错误处理"""
     error_message = traceback.format_exc()
-    log_message(f"Error in {error_name}: {error_message}")
+    log_message("Error in %s: %s", error_name, error_message, level=ERROR)
 
     if show_message and ui:
         ui.messageBox(f'{error_name} 失败:\n{error_message}')
 
 
-class MCPRequestHandler(BaseHTTPRequestHandler):
-    """MCP HTTP 请求处理器"""
+def run_on_main_thread(func, *args, timeout=JOB_TIMEOUT):
+    """把 adsk 调用交给主线程执行并等待结果
 
-    def do_GET(self):
-        """处理 GET 请求"""
+    当前请求带有截止时间时，过期仍在排队的任务会被丢弃。
+    """
+    if not main_thread_dispatcher:
+        raise DispatcherStoppedError("主线程调度器未启动")
+    deadline = getattr(request_state, 'deadline', None)
+    return main_thread_dispatcher.call(
+        func, *args, timeout=timeout, deadline=deadline, label=getattr(request_state, 'route', None)
+    )
+
+
+def parse_request_deadline(headers):
+    """根据 X-Request-Timeout 头计算本请求的截止时间"""
+    value = headers.get(REQUEST_TIMEOUT_HEADER)
+    if not value:
+        return None
+    try:
+        return time.monotonic() + max(0.0, float(value))
+    except ValueError:
+        return None
+
+
+def run_mutation(func, *args, timeout=JOB_TIMEOUT):
+    """在主线程中执行修改设计的操作"""
+    return run_on_main_thread(apply_mutation, func, *args, timeout=timeout)
+
+
+def apply_mutation(func, *args):
+    """执行修改操作，递增设计版本号并登记到当前事务（必须在主线程中调用）"""
+    try:
+        result = func(*args)
+    finally:
+        # 失败的操作也可能留下部分修改，版本号总是递增；期间登记的变化使用新版本号
+        commit_design_change(getattr(func, '__name__', 'mutation'))
+    if active_transaction:
+        active_transaction.record(result)
+    return result
+
+
+def commit_design_change(reason):
+    """递增设计版本号，提交期间登记的变化并推送 design 事件，返回新版本号"""
+    revision = design_revision.bump(reason)
+    changes = change_journal.commit(revision)
+    event_broadcaster.publish('design', {"revision": revision, "reason": reason, "changes": changes})
+    return revision
+
+
+def get_resource_etag(path, query=''):
+    """根据路径和版本号计算 GET 资源的 ETag，未知路径返回 None"""
+    if path in STATIC_GET_PATHS:
+        return make_etag(design_revision.epoch, path, query)
+    if path in CAMERA_GET_PATHS:
+        return make_etag(design_revision.epoch, path, query, design_revision.value, camera_revision.value)
+    if path in UNVERSIONED_GET_PATHS:
+        return None
+    if path.startswith('/api/'):
+        return make_etag(design_revision.epoch, path, query, design_revision.value)
+    return None
+
+
+def handle_api_request(method, raw_path, headers, data=None):
+    """处理一次 API 请求，HTTP 和帧协议共用
+
+    返回 (状态码, 响应数据, 附加响应头)，304 时响应数据为 None。
+    """
+    parsed = urllib.parse.urlparse(raw_path)
+    path = parsed.path
+    try:
+        request_state.deadline = parse_request_deadline(headers)
+        request_state.route = request_metrics.route(path)
+        if addin_logger.enabled(DEBUG) and request_log_sampler.allow(path):
+            log_message("%s 请求: %s, 数据: %s", method, path, data, level=DEBUG)
+
+        if method == 'GET':
+            return route_get(path, parsed.query, headers)
+        if method == 'POST':
+            result = route_post(path, data or {})
+        elif method == 'PUT':
+            result = route_put(path, data or {})
+        elif method == 'DELETE':
+            result = route_delete(path)
+        else:
+            return 405, {"success": False, "error": f"不支持的方法: {method}"}, None
+        return 200, result, None
+
+    except Exception as e:
+        error = dispatch_error_response(e)
+        if error:
+            return error
+        log_message("%s %s 请求处理失败: %s", method, path, e, level=ERROR)
+        return 500, {"success": False, "error": str(e)}, None
+
+
+def route_get(path, query, headers):
+    """GET 路由，版本号未变化时直接返回 304，不再进入主线程"""
+    static_route = static_responses.get(path)
+    if static_route:
+        return route_static(static_route, query, headers)
+
+    revision = design_revision.value
+    etag = get_resource_etag(path, query)
+    if etag_matches(headers.get('If-None-Match'), etag):
+        return 304, None, {'ETag': etag, REVISION_HEADER: design_revision.token(revision)}
+
+    if path == '/api/health':
+        result = {"status": "healthy", "message": f"{ADDIN_NAME} 运行正常"}
+    elif path == '/api/status':
+        result = run_on_main_thread(get_fusion_status)
+    elif path == '/api/objects':
+        result = run_on_main_thread(get_fusion_objects, urllib.parse.parse_qs(query))
+    elif path.startswith('/api/object/'):
+        object_id = urllib.parse.unquote(path[len('/api/object/'):])
+        fields = urllib.parse.parse_qs(query).get('fields')
+        result = run_on_main_thread(get_fusion_object, object_id, fields)
+    elif path == '/api/view':
+        result = run_on_main_thread(get_fusion_view)
+    elif path == '/api/view/raw':
+        result = run_on_main_thread(capture_view_file, urllib.parse.parse_qs(query))
+        if not isinstance(result, FileResponse):
+            return 400, result, None
+    elif path == '/api/views':
+        result = run_on_main_thread(capture_views, urllib.parse.parse_qs(query))
+        if not isinstance(result, MultipartResponse):
+            return 400, result, None
+    elif path == '/api/list':
+        result = run_on_main_thread(get_fusion_api_list)
+    elif path == '/api/transaction':
+        result = run_on_main_thread(get_transaction_status)
+    elif path == '/api/changes':
+        result = run_on_main_thread(get_changes, urllib.parse.parse_qs(query))
+    elif path == '/api/logs':
+        result = get_recent_logs(urllib.parse.parse_qs(query))
+    elif path == '/api/metrics':
+        result = TextResponse(render_metrics())
+    else:
+        return 200, {"success": False, "error": f"未知路径: {path}"}, None
+
+    # ETag 使用处理前的版本号，期间若有修改下次请求会得到新内容
+    if etag is None:
+        return 200, result, {REVISION_HEADER: design_revision.token(revision)}
+    return 200, result, {'ETag': etag, REVISION_HEADER: design_revision.token(revision)}
+
+
+def route_static(route, query, headers):
+    """静态响应只查表，不进入主线程，也不重新序列化"""
+    try:
+        response = route.select(query)
+    except KeyError as e:
+        error = f"未知的 {route.slice_param}: {e.args[0]}，可选: {', '.join(route.slices)}"
+        return 400, {"success": False, "error": error}, None
+    response_headers = {'ETag': response.etag, REVISION_HEADER: design_revision.token()}
+    if etag_matches(headers.get('If-None-Match'), response.etag):
+        return 304, None, response_headers
+    return 200, response, response_headers
+
+
+def route_post(path, data):
+    """POST 路由"""
+    if path == '/api/document':
+        return run_mutation(create_fusion_document, data)
+    if path == '/api/object':
+        return run_mutation(create_fusion_object, data)
+    if path == '/api/view':
+        return run_on_main_thread(capture_fusion_view, data)
+    if path == '/api/batch':
+        return run_batch_request(data)
+    if path == '/api/transaction/begin':
+        return run_on_main_thread(begin_transaction)
+    if path == '/api/transaction/commit':
+        return run_on_main_thread(commit_transaction)
+    if path == '/api/transaction/rollback':
+        return run_on_main_thread(rollback_transaction)
+    return {"success": False, "error": f"未知路径: {path}"}
+
+
+def route_put(path, data):
+    """PUT 路由"""
+    if path.startswith('/api/object/'):
+        object_id = urllib.parse.unquote(path[len('/api/object/'):])
+        return run_mutation(edit_fusion_object, object_id, data)
+    return {"success": False, "error": f"未知路径: {path}"}
+
+
+def route_delete(path):
+    """DELETE 路由"""
+    if path.startswith('/api/object/'):
+        object_id = urllib.parse.unquote(path[len('/api/object/'):])
+        return run_mutation(delete_fusion_object, object_id)
+    return {"success": False, "error": f"未知路径: {path}"}
+
+
+def dispatch_error_response(error):
+    """把主线程调度异常转换为 (状态码, 响应数据, 响应头)，其他异常返回 None"""
+    if isinstance(error, QueueFullError):
+        return 429, {"success": False, "error": str(error)}, {'Retry-After': str(RETRY_AFTER_SECONDS)}
+    if isinstance(error, (TimeoutError, DeadlineExceededError)):
+        return 504, {"success": False, "error": str(error)}, None
+    if isinstance(error, DispatcherStoppedError):
+        return 503, {"success": False, "error": str(error)}, None
+    return None
+
+
+def record_request(method, raw_path, status, started, request_bytes, response_bytes, result=None):
+    """记录一次请求的指标，success 为 false 的响应也计为错误"""
+    request_metrics.observe_request(
+        method,
+        request_metrics.route(raw_path),
+        status,
+        time.perf_counter() - started,
+        request_bytes,
+        response_bytes,
+        error=isinstance(result, dict) and result.get('success') is False
+    )
+
+
+def render_metrics():
+    """Prometheus 文本格式的插件指标"""
+    dispatcher_stats = main_thread_dispatcher.get_stats() if main_thread_dispatcher else {}
+    http_stats = http_server.get_stats() if http_server else {}
+    return request_metrics.render({
+        "queue_depth": ("主线程任务队列中等待的任务数", dispatcher_stats.get("queue_depth", 0)),
+        "http_connections": ("当前打开的 HTTP 连接数", http_stats.get("connections", 0)),
+        "design_revision": ("当前设计版本号", design_revision.value),
+    })
+
+
+def handle_framed_request(method, raw_path, headers, body):
+    """帧协议请求处理，返回 (状态码, 响应头, 消息体字节)"""
+    started = time.perf_counter()
+    status, response_headers, payload, result = process_framed_request(method, raw_path, headers, body)
+    record_request(method, raw_path, status, started, len(body or b''), len(payload), result)
+    return status, response_headers, payload
+
+
+def process_framed_request(method, raw_path, headers, body):
+    """解码帧请求并交给 handle_api_request，返回 (状态码, 响应头, 消息体字节, 响应数据)"""
+    # 客户端发送的头名称为小写，统一为 HTTP 中的写法
+    headers = {name.title(): value for name, value in headers.items()}
+    content_type = codec.negotiate(headers.get('Accept'))
+    try:
+        data = codec.decode(body, headers.get('Content-Type'))
+    except codec.UnsupportedMediaType as e:
+        result = {"success": False, "error": str(e)}
+        return 415, {'Content-Type': codec.JSON_TYPE}, codec.encode(result), result
+
+    status, result, extra_headers = handle_api_request(method, raw_path, headers, data)
+    if isinstance(result, RAW_RESPONSE_TYPES):
+        # 帧的消息体本身就是原始字节，整个文件作为一帧发送
+        response_headers = {'Content-Type': result.content_type}
+        response_headers.update(extra_headers or {})
         try:
-            path = urllib.parse.urlparse(self.path).path
-            log_message(f"GET 请求: {path}")
-
-            # 路由分发
-            if path == '/api/health':
-                result = {"status": "healthy", "message": f"{ADDIN_NAME} 运行正常"}
-            elif path == '/api/status':
-                result = get_fusion_status()
-            elif path == '/api/objects':
-                result = get_fusion_objects()
-            elif path == '/api/view':
-                result = get_fusion_view()
-            elif path == '/api/list':
-                result = get_fusion_api_list()
-            else:
-                result = {"success": False, "error": f"未知路径: {path}"}
+            return status, response_headers, result.read(), result
+        finally:
+            result.close()
+
+    response_headers = {'Content-Type': content_type, 'Vary': 'Accept'}
+    response_headers.update(extra_headers or {})
+    if status == 304:
+        payload = b''
+    elif isinstance(result, StaticResponse):
+        payload = result.body(content_type)
+    else:
+        payload = codec.encode(result, content_type)
+    return status, response_headers, payload, result
+
+
+class FileResponse:
+    """以原始字节发送的文件（截图），发送后删除临时文件
+
+    release 不为 None 时文件归截图缓存管理：发送后调用 release(路径) 解除 pin，不删除。
+    """
+
+    def __init__(self, path, content_type, delete=True, release=None):
+        self.path = path
+        self.content_type = content_type
+        self.delete = delete
+        self.release = release
+
+    def iter_chunks(self, chunk_size=FILE_CHUNK_SIZE):
+        with open(self.path, 'rb') as f:
+            while True:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+
+    def read(self):
+        with open(self.path, 'rb') as f:
+            return f.read()
+
+    def close(self):
+        if self.release:
+            self.release(self.path)
+            self.release = None
+        elif self.delete:
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
 
-            # 返回 JSON 响应
-            self.send_json_response(200, result)
 
-        except Exception as e:
-            log_message(f"GET 请求处理失败: {str(e)}")
-            self.send_json_response(500, {"success": False, "error": str(e)})
+# 以原始字节发送、不经过编码的响应类型
+RAW_RESPONSE_TYPES = (FileResponse, MultipartResponse, TextResponse)
+
+
+class MCPRequestHandler(KeepAliveRequestHandler):
+    """MCP HTTP 请求处理器（HTTP/1.1 keep-alive，adsk 调用都经过主线程调度器）"""
+
+    response_bytes = 0  # 当前请求已写出的响应体字节数（压缩后）
+
+    def do_GET(self):
+        """处理 GET 请求"""
+        # 事件流是长连接，不参与 ETag 和主线程调度
+        if urllib.parse.urlparse(self.path).path == '/api/events':
+            self.stream_events()
+            return
+        self.handle_request('GET')
 
     def do_POST(self):
         """处理 POST 请求"""
-        try:
-            path = urllib.parse.urlparse(self.path).path
-
-            # 读取请求数据
-            content_length = int(self.headers.get('Content-Length', 0))
-            post_data = self.rfile.read(content_length)
-            data = json.loads(post_data.decode('utf-8')) if post_data else {}
-
-            log_message(f"POST 请求: {path}, 数据: {data}")
-
-            # 路由分发
-            if path == '/api/document':
-                result = create_fusion_document(data)
-            elif path == '/api/object':
-                result = create_fusion_object(data)
-            elif path == '/api/view':
-                result = capture_fusion_view(data)
-            else:
-                result = {"success": False, "error": f"未知路径: {path}"}
+        self.handle_request('POST', read_body=True)
 
-            # 返回 JSON 响应
-            self.send_json_response(200, result)
+    def do_PUT(self):
+        """处理 PUT 请求"""
+        self.handle_request('PUT', read_body=True)
 
-        except Exception as e:
-            log_message(f"POST 请求处理失败: {str(e)}")
-            self.send_json_response(500, {"success": False, "error": str(e)})
+    def do_DELETE(self):
+        """处理 DELETE 请求"""
+        self.handle_request('DELETE')
 
-    def send_json_response(self, status_code, data):
-        """发送 JSON 响应"""
+    def handle_request(self, method, read_body=False):
+        """解析请求体并交给 handle_api_request，写完响应后记录请求指标"""
+        started = time.perf_counter()
+        self.response_bytes = 0
+        body = b''
+        try:
+            body = self.read_body()
+        except Exception as e:
+            # 请求体没有读完，连接上剩余的字节不能当作下一个请求解析
+            self.close_connection = True
+            status, result, headers = 400, {"success": False, "error": f"请求体无效: {e}"}, {'Connection': 'close'}
+        else:
+            try:
+                data = self.decode_json_body(body) if read_body else None
+            except codec.UnsupportedMediaType as e:
+                status, result, headers = 415, {"success": False, "error": str(e)}, None
+            except Exception as e:
+                status, result, headers = 400, {"success": False, "error": f"请求体无效: {e}"}, None
+            else:
+                status, result, headers = handle_api_request(method, self.path, self.headers, data)
+
+        if status == 304:
+            self.send_not_modified(headers)
+        elif isinstance(result, RAW_RESPONSE_TYPES):
+            self.send_file_response(status, result, headers)
+        elif isinstance(result, StaticResponse):
+            self.send_static_response(status, result, headers)
+        else:
+            self.send_json_response(status, result, headers=headers)
+        record_request(method, self.path, status, started, len(body), self.response_bytes, result)
+
+    def stream_events(self):
+        """以 Server-Sent Events 推送事件，直到客户端断开或插件停止"""
+        subscription = event_broadcaster.subscribe()
+        # 事件流没有长度，结束时关闭连接
+        self.close_connection = True
+        try:
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/event-stream; charset=utf-8')
+            self.send_header('Cache-Control', 'no-cache')
+            self.send_header('Connection', 'close')
+            self.send_header(REVISION_HEADER, design_revision.token())
+            self.end_headers()
+            self.wfile.write(b"retry: 3000\n\n")
+            self.wfile.flush()
+
+            while not events_stopped.is_set():
+                event = subscription.get(timeout=EVENTS_KEEPALIVE_SECONDS)
+                self.wfile.write(format_sse(event) if event else SSE_KEEPALIVE)
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError, ConnectionAbortedError):
+            pass
+        finally:
+            event_broadcaster.unsubscribe(subscription)
+
+    def decode_json_body(self, body):
+        """按 Content-Type 解码请求体（JSON 或 MessagePack）"""
+        data = codec.decode(body, self.headers.get('Content-Type'))
+        return {} if data is None else data
+
+    def send_json_response(self, status_code, data, headers=None):
+        """发送响应，编码按 Accept 协商（默认 JSON），较大的响应按 Accept-Encoding 压缩"""
+        content_type = codec.negotiate(self.headers.get('Accept'))
+        body, content_encoding = response_compressor.compress(
+            codec.encode(data, content_type), self.headers.get('Accept-Encoding')
+        )
+        self.send_encoded_response(status_code, content_type, body, content_encoding, headers)
+
+    def send_static_response(self, status_code, static_response, headers=None):
+        """发送预先序列化的响应，压缩结果也是缓存的"""
+        content_type = codec.negotiate(self.headers.get('Accept'))
+        body, content_encoding = static_response.compressed(
+            content_type, self.headers.get('Accept-Encoding'), response_compressor
+        )
+        self.send_encoded_response(status_code, content_type, body, content_encoding, headers)
+
+    def send_encoded_response(self, status_code, content_type, body, content_encoding, headers=None):
+        """写出已编码的响应体"""
         self.send_response(status_code)
-        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Type', content_type)
+        if content_encoding:
+            self.send_header('Content-Encoding', content_encoding)
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Vary', 'Accept, Accept-Encoding')
         self.send_header('Access-Control-Allow-Origin', '*')
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
         self.end_headers()
-        self.wfile.write(json.dumps(data, ensure_ascii=False).encode('utf-8'))
+        self.wfile.write(body)
+        self.response_bytes = len(body)
 
-    def log_message(self, format, *args):
-        """禁用 HTTP 服务器默认日志"""
-        pass
+    def send_file_response(self, status_code, file_response, headers=None):
+        """以分块传输发送文件原始字节，不经过 base64 和 JSON"""
+        try:
+            self.send_response(status_code)
+            self.send_header('Content-Type', file_response.content_type)
+            self.send_header('Transfer-Encoding', 'chunked')
+            self.send_header('Access-Control-Allow-Origin', '*')
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            for chunk in file_response.iter_chunks():
+                self.wfile.write(b'%x\r\n%s\r\n' % (len(chunk), chunk))
+                self.response_bytes += len(chunk)
+            self.wfile.write(b'0\r\n\r\n')
+        except (BrokenPipeError, ConnectionResetError, ConnectionAbortedError):
+            self.close_connection = True
+        except OSError as e:
+            # 响应头已发出，无法再改为错误响应，只能断开连接让客户端知道内容不完整
+            log_message("发送文件失败: %s", e, level=WARNING)
+            self.close_connection = True
+        finally:
+            file_response.close()
+
+    def send_not_modified(self, headers):
+        """发送 304 响应"""
+        self.send_response(304)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Content-Length', '0')
+        self.end_headers()
 
 
 def get_fusion_status():
@@ -153,7 +694,19 @@ def get_fusion_status():
             "app_name": app_name,
             "version": version,
             "active_document": None,
-            "design_workspace": False
+            "design_workspace": False,
+            "revision": design_revision.value,
+            "revision_token": design_revision.token(),
+            "entity_index": entity_index.get_stats(),
+            "events": event_broadcaster.get_stats(),
+            "framed": framed_server.get_stats() if framed_server else None,
+            "http": http_server.get_stats() if http_server else None,
+            "compression": response_compressor.get_stats(),
+            "static_responses": static_responses.get_stats(),
+            "logging": dict(addin_logger.get_stats(), sampled_out=request_log_sampler.skipped),
+            "metrics": request_metrics.get_stats(),
+            "screenshot_cache": screenshot_cache.get_stats(),
+            "capture_timings": capture_timings.get_stats()
         }
 
         # 检查活动文档
@@ -166,7 +719,7 @@ def get_fusion_status():
                     design = adsk.fusion.Design.cast(app.activeProduct)
                     status["design_workspace"] = design is not None
         except Exception as doc_error:
-            log_message(f"获取文档信息失败: {str(doc_error)}")
+            log_message("获取文档信息失败: %s", doc_error, level=WARNING)
 
         return status
 
@@ -174,8 +727,12 @@ def get_fusion_status():
         return {"success": False, "error": str(e)}
 
 
-def get_fusion_objects():
-    """获取 Fusion 360 对象列表"""
+def get_fusion_objects(params=None):
+    """分页获取 Fusion 360 对象列表
+
+    params 支持 type、name（通配符）、visible、component（组件路径通配符）、
+    page_size 和 cursor，遍历根组件及所有子装配中的实体。
+    """
     try:
         if not app or not app.activeDocument:
             return {"success": False, "error": "没有活动文档"}
@@ -184,23 +741,97 @@ def get_fusion_objects():
         if not design:
             return {"success": False, "error": "当前不在设计工作空间"}
 
-        objects = []
-        rootComp = design.rootComponent
+        query = ObjectQuery.from_params(params)
+        return list_objects(design.rootComponent, query, design_revision.value)
 
-        # 获取实体（限制数量避免响应过大）
-        for i, body in enumerate(rootComp.bRepBodies):
-            if i >= 10:  # 最多返回 10 个对象
-                break
-
-            objects.append({
-                "id": body.entityToken,
-                "name": body.name if body.name else f"实体{i+1}",
-                "type": "body",
-                "visible": body.isVisible,
-                "material": body.material.name if body.material else "默认"
-            })
+    except Exception as e:
+        return {"success": False, "error": str(e)}
+
+
+def get_fusion_object(object_id, fields=None):
+    """按 entityToken 获取单个对象，只计算 fields 中请求的字段"""
+    try:
+        if not app or not app.activeDocument:
+            return {"success": False, "error": "没有活动文档"}
+
+        design = adsk.fusion.Design.cast(app.activeProduct)
+        if not design:
+            return {"success": False, "error": "当前不在设计工作空间"}
+
+        fields = parse_fields(','.join(fields) if isinstance(fields, list) else fields)
+        entity = entity_index.resolve(object_id, design, accept=object_kind)
+        if entity is None:
+            return {"success": False, "error": f"对象不存在: {object_id}"}
 
-        return {"success": True, "objects": objects, "count": len(objects)}
+        kind = object_kind(entity)
+        return {"success": True, "object": describe_object(kind, entity, object_path(kind, entity), fields)}
+
+    except Exception as e:
+        return {"success": False, "error": str(e)}
+
+
+def edit_fusion_object(object_id, data):
+    """编辑对象，支持 name 和 visible 参数"""
+    try:
+        if not app or not app.activeDocument:
+            return {"success": False, "error": "没有活动文档"}
+
+        design = adsk.fusion.Design.cast(app.activeProduct)
+        if not design:
+            return {"success": False, "error": "当前不在设计工作空间"}
+
+        entity = entity_index.resolve(object_id, design, accept=object_kind)
+        if entity is None:
+            return {"success": False, "error": f"对象不存在: {object_id}"}
+
+        parameters = data.get('parameters', {}).get('parameters', {})
+        kind = object_kind(entity)
+        updated = []
+
+        if 'name' in parameters:
+            target = entity.component if kind == 'occurrence' else entity
+            target.name = str(parameters['name'])
+            updated.append('name')
+        if 'visible' in parameters:
+            if kind == 'feature':
+                return {"success": False, "error": "特征不支持设置可见性"}
+            entity.isLightBulbOn = bool(parameters['visible'])
+            updated.append('visible')
+
+        if not updated:
+            return {"success": False, "error": "没有可编辑的参数，支持: name, visible"}
+
+        change_journal.note('modified', object_id, kind)
+
+        log_message("成功编辑对象: %s (%s)", object_id, updated)
+        return {"success": True, "object_id": object_id, "updated": updated}
+
+    except Exception as e:
+        return {"success": False, "error": str(e)}
+
+
+def delete_fusion_object(object_id):
+    """删除对象"""
+    try:
+        if not app or not app.activeDocument:
+            return {"success": False, "error": "没有活动文档"}
+
+        design = adsk.fusion.Design.cast(app.activeProduct)
+        if not design:
+            return {"success": False, "error": "当前不在设计工作空间"}
+
+        entity = entity_index.resolve(object_id, design, accept=object_kind)
+        if entity is None:
+            return {"success": False, "error": f"对象不存在: {object_id}"}
+
+        kind = object_kind(entity)
+        if not entity.deleteMe():
+            return {"success": False, "error": f"对象删除失败: {object_id}"}
+
+        entity_index.remove(object_id)
+        change_journal.note('deleted', object_id, kind)
+        log_message("成功删除对象: %s", object_id)
+        return {"success": True, "object_id": object_id}
 
     except Exception as e:
         return {"success": False, "error": str(e)}
@@ -217,7 +848,7 @@ def create_fusion_document(data):
 
         if doc:
             doc.name = name
-            log_message(f"成功创建文档: {name}")
+            log_message("成功创建文档: %s", name)
             return {
                 "success": True,
                 "document_id": doc.name,
@@ -285,11 +916,21 @@ def create_cylinder(params):
         # 执行拉伸
         extrudeFeature = extrudes.add(extrudeInput)
 
-        log_message(f"成功创建圆柱体: 半径={radius}, 高度={height}")
+        # 登记到实体索引，后续 get/edit/delete 无需再次查找
+        entity_index.add(extrudeFeature.entityToken, extrudeFeature)
+        change_journal.note('created', extrudeFeature.entityToken, 'feature')
+        body_ids = []
+        for body in extrudeFeature.bodies:
+            entity_index.add(body.entityToken, body)
+            change_journal.note('created', body.entityToken, 'body')
+            body_ids.append(body.entityToken)
+
+        log_message("成功创建圆柱体: 半径=%s, 高度=%s", radius, height)
 
         return {
             "success": True,
             "object_id": extrudeFeature.entityToken,
+            "body_ids": body_ids,
             "type": "extrude",
             "geometry": {
                 "radius": radius,
@@ -648,13 +1289,155 @@ def get_fusion_api_list():
             }
         }
 
-        log_message(f"API列表查询完成，共 {api_stats['total_apis']} 个API")
+        log_message("API列表查询完成，共 %s 个API", api_stats['total_apis'])
         return result
 
     except Exception as e:
         return {"success": False, "error": str(e)}
 
 
+def api_list_slices(api_list):
+    """把 API 列表按分类拆分，供 /api/list?category= 使用"""
+    slices = {}
+    for name, category in api_list["categories"].items():
+        statistics = dict(api_list["statistics"], total_categories=1, total_apis=len(category["apis"]))
+        slices[name] = dict(api_list, statistics=statistics, categories={name: category})
+    return slices
+
+
+def register_static_responses():
+    """启动时预先序列化内容不变的 GET 响应"""
+    static_responses.register('/api/health', {"status": "healthy", "message": f"{ADDIN_NAME} 运行正常"})
+    api_list = get_fusion_api_list()
+    if api_list.get("success"):
+        static_responses.register('/api/list', api_list, slices=api_list_slices(api_list), slice_param='category')
+
+
+def validate_view_parameters(width, height, format_type, quality=QUALITY_FINAL):
+    """检查截图尺寸、格式和质量预设，返回错误信息，有效时返回 None"""
+    if width < 100 or width > 4096:
+        return "宽度必须在 100-4096 像素之间"
+    if height < 100 or height > 4096:
+        return "高度必须在 100-4096 像素之间"
+    if format_type not in IMAGE_CONTENT_TYPES:
+        return "支持的格式: png, jpg, jpeg"
+    if quality not in QUALITY_PRESETS:
+        return f"支持的质量预设: {', '.join(QUALITY_PRESETS)}"
+    return None
+
+
+def capture_view_file(params):
+    """把当前视图截图保存到临时文件，返回 FileResponse (GET /api/view/raw)"""
+    if not app or not app.activeViewport:
+        return {"success": False, "error": "没有活动视图"}
+
+    try:
+        width = int(params.get('width', ['1024'])[0])
+        height = int(params.get('height', ['768'])[0])
+    except ValueError:
+        return {"success": False, "error": "width 和 height 必须是整数"}
+    format_type = params.get('format', ['png'])[0].lower()
+    quality = params.get('quality', [QUALITY_FINAL])[0]
+    error = validate_view_parameters(width, height, format_type, quality)
+    if error:
+        return {"success": False, "error": error}
+
+    file_path, _, _ = render_view(width, height, format_type, quality)
+    # 文件归截图缓存管理，发送期间 pin 住，避免主线程在 HTTP 线程读取时把它淘汰删除
+    screenshot_cache.pin(file_path)
+    return FileResponse(file_path, IMAGE_CONTENT_TYPES[format_type], release=screenshot_cache.release)
+
+
+def capture_views(params):
+    """按多个相机预设依次截图，返回 MultipartResponse (GET /api/views)
+
+    所有预设在这一个主线程任务中完成；相机切换不使用平滑过渡，结束后恢复原相机。
+    """
+    if not app or not app.activeViewport:
+        return {"success": False, "error": "没有活动视图"}
+
+    try:
+        presets = parse_presets(params.get('presets', [''])[0])
+        width = int(params.get('width', ['800'])[0])
+        height = int(params.get('height', ['600'])[0])
+    except ValueError as e:
+        return {"success": False, "error": str(e)}
+    format_type = params.get('format', ['png'])[0].lower()
+    quality = params.get('quality', [QUALITY_FINAL])[0]
+    error = validate_view_parameters(width, height, format_type, quality)
+    if error:
+        return {"success": False, "error": error}
+
+    viewport = app.activeViewport
+    original_camera = viewport.camera
+    # 每张截图渲染后立即 pin 住，后面的截图登记到缓存时不会把它淘汰
+    response = MultipartResponse([], release=screenshot_cache.release)
+    try:
+        for name in presets:
+            camera = viewport.camera
+            camera.isSmoothTransition = False
+            camera.viewOrientation = getattr(adsk.core.ViewOrientations, CAMERA_PRESETS[name])
+            camera.isFitView = True
+            viewport.camera = camera
+            file_path, _, _ = render_view(width, height, format_type, quality)
+            screenshot_cache.pin(file_path)
+            response.parts.append((name, file_path, IMAGE_CONTENT_TYPES[format_type]))
+    except Exception:
+        response.close()
+        raise
+    finally:
+        original_camera.isSmoothTransition = False
+        viewport.camera = original_camera
+
+    log_message("多视图截图完成: %s", presets)
+    return response
+
+
+def render_view(width, height, format_type, quality=QUALITY_FINAL):
+    """渲染当前视图到截图缓存，返回 (文件路径, 是否命中缓存, 截图尺寸)（必须在主线程中调用）
+
+    设计版本号、相机、尺寸、格式、视觉样式和质量预设都相同时复用已有文件。
+    preview 预设缩小尺寸、关闭抗锯齿，截图期间使用开销较小的视觉样式，之后恢复。
+    """
+    viewport = app.activeViewport
+    camera = viewport.camera
+    width, height = preset_size(quality, width, height)
+    key = make_screenshot_key(
+        design_revision.value,
+        (camera.eye.x, camera.eye.y, camera.eye.z),
+        (camera.target.x, camera.target.y, camera.target.z),
+        (camera.upVector.x, camera.upVector.y, camera.upVector.z),
+        width, height, format_type, viewport.visualStyle, quality
+    )
+    cached = screenshot_cache.get(key)
+    if cached:
+        capture_timings.record(quality, 0, cached=True)
+        return cached, True, (width, height)
+
+    file_path = screenshot_cache.new_path(format_type)
+    started = time.perf_counter()
+    if quality == QUALITY_PREVIEW:
+        # API 未提供阴影、反射、环境光遮蔽的开关，改用纯着色样式并关闭抗锯齿
+        overrides = [(viewport, 'visualStyle', adsk.core.VisualStyles.ShadedVisualStyle)]
+        with DisplayOverrides(overrides) as applied:
+            options = adsk.core.SaveImageFileOptions.create(file_path)
+            options.width = width
+            options.height = height
+            options.isAntiAliased = QUALITY_PRESETS[quality]["anti_alias"]
+            success = viewport.saveAsImageFileWithOptions(options)
+        if applied.restore_errors:
+            log_message("恢复显示设置失败: %s", applied.restore_errors, level=WARNING)
+    else:
+        success = viewport.saveAsImageFile(file_path, width, height)
+    capture_timings.record(quality, time.perf_counter() - started)
+
+    if not success or not os.path.exists(file_path):
+        if os.path.exists(file_path):
+            os.remove(file_path)
+        raise RuntimeError("视图截图保存失败")
+    return screenshot_cache.put(key, file_path), False, (width, height)
+
+
 def capture_fusion_view(data):
     """捕获当前视图截图 (POST 请求)"""
     try:
@@ -668,50 +1451,43 @@ def capture_fusion_view(data):
         format_type = parameters.get('format', 'png').lower()
         filename = parameters.get('filename', None)
         return_base64 = parameters.get('return_base64', False)
+        quality = parameters.get('quality', QUALITY_FINAL)
 
         # 验证参数
-        if width < 100 or width > 4096:
-            return {"success": False, "error": "宽度必须在 100-4096 像素之间"}
-        if height < 100 or height > 4096:
-            return {"success": False, "error": "高度必须在 100-4096 像素之间"}
-        if format_type not in ['png', 'jpg', 'jpeg']:
-            return {"success": False, "error": "支持的格式: png, jpg, jpeg"}
-
-        # 生成文件名
-        if not filename:
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            filename = f"fusion360_view_{timestamp}.{format_type}"
-
-        # 确保文件扩展名正确
-        if not filename.lower().endswith(('.png', '.jpg', '.jpeg')):
-            filename += f".{format_type}"
-
-        # 创建临时目录和文件路径
-        temp_dir = tempfile.gettempdir()
-        file_path = os.path.join(temp_dir, filename)
-
-        log_message(f"准备截图: {width}x{height}, 保存到: {file_path}")
-
-        # 获取活动视图并截图
-        viewport = app.activeViewport
-
-        # 使用 Fusion 360 API 保存视图截图
-        success = viewport.saveAsImageFile(file_path, width, height)
-
-        if not success:
-            return {"success": False, "error": "视图截图保存失败"}
-
-        # 检查文件是否成功创建
-        if not os.path.exists(file_path):
-            return {"success": False, "error": "截图文件未创建"}
+        error = validate_view_parameters(width, height, format_type, quality)
+        if error:
+            return {"success": False, "error": error}
+
+        cached = False
+        started = time.perf_counter()
+        if filename and quality == QUALITY_FINAL:
+            # 指定了文件名时保存到临时目录中的该文件，由调用方负责清理，不经过缓存
+            if not filename.lower().endswith(('.png', '.jpg', '.jpeg')):
+                filename += f".{format_type}"
+            file_path = os.path.join(tempfile.gettempdir(), filename)
+            log_message("准备截图: %sx%s, 保存到: %s", width, height, file_path, level=DEBUG)
+
+            success = app.activeViewport.saveAsImageFile(file_path, width, height)
+            if not success:
+                return {"success": False, "error": "视图截图保存失败"}
+            if not os.path.exists(file_path):
+                return {"success": False, "error": "截图文件未创建"}
+        else:
+            # 未指定文件名或使用预览质量时经过截图缓存，文件在被淘汰时删除
+            file_path, cached, (width, height) = render_view(width, height, format_type, quality)
+            filename = os.path.basename(file_path)
+        elapsed_ms = (time.perf_counter() - started) * 1000
 
         file_size = os.path.getsize(file_path)
-        log_message(f"截图成功: {file_path}, 大小: {file_size} 字节")
+        log_message("截图%s成功: %s, 大小: %s 字节", '（缓存）' if cached else '', file_path, file_size)
 
         result = {
             "success": True,
             "file_path": file_path,
             "filename": filename,
+            "cached": cached,
+            "quality": quality,
+            "capture_ms": round(elapsed_ms, 3),
             "file_size": file_size,
             "dimensions": {
                 "width": width,
@@ -728,19 +1504,341 @@ def capture_fusion_view(data):
                     base64_data = base64.b64encode(image_data).decode('utf-8')
                     result["image_data"] = base64_data
                     result["image_data_size"] = len(base64_data)
-                    log_message(f"Base64 数据大小: {len(base64_data)} 字符")
+                    log_message("Base64 数据大小: %s 字符", len(base64_data), level=DEBUG)
             except Exception as e:
-                log_message(f"Base64 编码失败: {str(e)}")
+                log_message("Base64 编码失败: %s", e, level=ERROR)
                 result["base64_error"] = str(e)
 
         return result
 
     except Exception as e:
         error_msg = str(e)
-        log_message(f"视图截图失败: {error_msg}")
+        log_message("视图截图失败: %s", error_msg, level=ERROR)
         return {"success": False, "error": error_msg}
 
 
+# 批量操作中会修改设计的动作，整批中执行过其中之一时才递增设计版本号
+BATCH_MUTATING_ACTIONS = ('create_document', 'create_object', 'edit_object', 'delete_object')
+
+# 批量操作支持的动作，处理函数与对应的单个请求相同
+BATCH_HANDLERS = {
+    'create_document': create_fusion_document,
+    'create_object': create_fusion_object,
+    'capture_view': capture_fusion_view,
+    'get_objects': lambda data: get_fusion_objects(data.get('parameters')),
+    'edit_object': lambda data: edit_fusion_object(data['parameters'].get('object_id'), data),
+    'delete_object': lambda data: delete_fusion_object(data['parameters'].get('object_id')),
+    'get_object': lambda data: get_fusion_object(data['parameters'].get('object_id'), data['parameters'].get('fields')),
+    'get_status': lambda data: get_fusion_status(),
+    'get_view': lambda data: get_fusion_view(),
+}
+
+
+def run_batch_request(data):
+    """处理批量操作请求，整批操作在一次主线程任务中顺序执行"""
+    operations = data.get('operations', [])
+    mode = data.get('mode', BATCH_MODE_STOP_ON_ERROR)
+
+    if not isinstance(operations, list) or not operations:
+        return {"success": False, "error": "operations 必须是非空列表"}
+    if len(operations) > BATCH_MAX_OPERATIONS:
+        return {"success": False, "error": f"批量操作数量超过上限 {BATCH_MAX_OPERATIONS}"}
+
+    if data.get('transaction'):
+        result = run_on_main_thread(execute_batch_in_transaction, operations, mode, timeout=BATCH_JOB_TIMEOUT)
+    else:
+        result = run_on_main_thread(execute_batch_operations, operations, mode, timeout=BATCH_JOB_TIMEOUT)
+    log_message("批量操作完成: 成功 %s, 失败 %s", result.get('completed', 0), result.get('failed', 0))
+    return result
+
+
+def execute_batch_operations(operations, mode):
+    """执行整批操作（必须在主线程中调用）
+
+    只有实际调用过修改动作的处理函数时才递增设计版本号并登记到当前事务；
+    只读或在执行前就被拒绝的批量请求不会使 ETag 和客户端缓存失效。
+    """
+    mutations = []
+
+    def tracked(handler):
+        def run(data):
+            mutations.append(data.get('action'))
+            return handler(data)
+        return run
+
+    handlers = {
+        action: tracked(handler) if action in BATCH_MUTATING_ACTIONS else handler
+        for action, handler in BATCH_HANDLERS.items()
+    }
+    try:
+        result = execute_batch(operations, handlers, mode)
+    finally:
+        if mutations:
+            commit_design_change('execute_batch')
+    if mutations and active_transaction:
+        active_transaction.record(result)
+    return result
+
+
+def execute_batch_in_transaction(operations, mode):
+    """在一个独立事务中执行整批操作，有失败的操作时整批回滚"""
+    # 已在外层事务中时直接并入，由外层统一提交
+    if active_transaction:
+        return execute_batch_operations(operations, mode)
+
+    begin = begin_transaction()
+    if not begin.get("success"):
+        return begin
+
+    result = execute_batch_operations(operations, mode)
+    result["transaction"] = commit_transaction()
+    if not result["transaction"].get("success"):
+        result["success"] = False
+    return result
+
+
+def begin_transaction():
+    """开始时间线事务"""
+    global active_transaction
+
+    try:
+        if active_transaction:
+            return {"success": False, "error": "已有进行中的事务", "transaction": active_transaction.get_status()}
+        if not app or not app.activeDocument:
+            return {"success": False, "error": "没有活动文档"}
+
+        design = adsk.fusion.Design.cast(app.activeProduct)
+        if not design:
+            return {"success": False, "error": "当前不在设计工作空间"}
+
+        transaction = DesignTransaction(design)
+        transaction.begin()
+        active_transaction = transaction
+
+        log_message("事务开始: 时间线标记 %s", transaction.start_marker)
+        return {"success": True, "transaction": transaction.get_status()}
+
+    except Exception as e:
+        return {"success": False, "error": str(e)}
+
+
+def get_active_design():
+    """当前活动文档的设计，没有活动文档或不在设计工作空间时返回 None"""
+    if not app or not app.activeDocument:
+        return None
+    return adsk.fusion.Design.cast(app.activeProduct)
+
+
+def abort_transaction(reason):
+    """活动文档已切换时中止事务：时间线标记属于原来的设计，不再提交或回滚"""
+    global active_transaction
+
+    transaction = active_transaction
+    active_transaction = None
+    log_message("事务已中止（%s），修改操作 %s 个保留在原文档中", reason, transaction.mutations, level=WARNING)
+    event_broadcaster.publish('timeline', {"revision": design_revision.value, "reason": 'transaction_aborted'})
+    return {
+        "success": False,
+        "error": "开始事务的文档已不是活动文档，事务已中止",
+        "aborted": True,
+        "mutations": transaction.mutations
+    }
+
+
+def commit_transaction():
+    """提交事务，事务中有失败的操作时回滚"""
+    global active_transaction
+
+    if not active_transaction:
+        return {"success": False, "error": "没有进行中的事务"}
+    if not active_transaction.belongs_to(get_active_design()):
+        return abort_transaction('commit_transaction')
+
+    transaction = active_transaction
+    active_transaction = None
+    result = transaction.commit()
+    revision = design_revision.bump('commit_transaction')
+    if not result.get('success'):
+        # 提交失败时已自动回滚，事务中登记的变化不再有效
+        change_journal.reset(revision, 'commit_transaction')
+        entity_index.clear()
+    event_broadcaster.publish('timeline', {"revision": revision, "reason": 'commit_transaction'})
+    log_message("事务提交: %s, 修改操作 %s 个", '成功' if result.get('success') else '失败并回滚', transaction.mutations)
+    return result
+
+
+def rollback_transaction():
+    """回滚事务到开始时的时间线标记"""
+    global active_transaction
+
+    if not active_transaction:
+        return {"success": False, "error": "没有进行中的事务"}
+    if not active_transaction.belongs_to(get_active_design()):
+        return abort_transaction('rollback_transaction')
+
+    transaction = active_transaction
+    active_transaction = None
+    result = transaction.rollback()
+    revision = design_revision.bump('rollback_transaction')
+    change_journal.reset(revision, 'rollback_transaction')
+    event_broadcaster.publish('timeline', {"revision": revision, "reason": 'rollback_transaction'})
+    entity_index.clear()
+    log_message("事务回滚: 修改操作 %s 个", transaction.mutations)
+    return result
+
+
+def get_changes(params):
+    """返回 since 之后的变更
+
+    在主线程中执行，保证读到的版本号对应的变化都已提交到日志。
+    """
+    # since 可以是整数，也可以是上次返回的 revision_token（<epoch>:<版本号>）
+    epoch, _, number = (params.get('since') or ['0'])[0].rpartition(':')
+    try:
+        since = int(number)
+    except ValueError:
+        return {"success": False, "error": "since 必须是整数或 revision_token"}
+    return change_journal.since(since, design_revision.value, epoch or None)
+
+
+def get_transaction_status():
+    """获取当前事务状态"""
+    if not active_transaction:
+        return {"success": True, "transaction": {"active": False}}
+    return {"success": True, "transaction": active_transaction.get_status()}
+
+
+class DocumentRevisionHandler(adsk.core.DocumentEventHandler):
+    """文档打开、激活、关闭后递增设计版本号"""
+
+    def __init__(self, reason):
+        super().__init__()
+        self.reason = reason
+
+    def notify(self, args):
+        try:
+            revision = design_revision.bump(self.reason)
+            # 活动文档变化后，索引中的实体不再属于当前设计，增量也不再适用
+            entity_index.clear()
+            change_journal.reset(revision, self.reason)
+            if active_transaction and not active_transaction.belongs_to(get_active_design()):
+                abort_transaction(self.reason)
+            event_broadcaster.publish('document', {
+                "revision": revision,
+                "reason": self.reason,
+                "document": args.document.name if args.document else None
+            })
+        except:
+            pass
+
+
+class CommandRevisionHandler(adsk.core.ApplicationCommandEventHandler):
+    """用户在界面中完成命令后递增设计版本号"""
+
+    def notify(self, args):
+        try:
+            if args.terminationReason == adsk.core.CommandTerminationReason.CompletedTerminationReason:
+                # 界面命令的具体变化无法逐项跟踪，要求客户端全量同步
+                reason = f"command:{args.commandId}"
+                revision = design_revision.bump(reason)
+                change_journal.reset(revision, reason)
+                event_broadcaster.publish('timeline', {"revision": revision, "reason": reason})
+        except:
+            pass
+
+
+class SelectionEventHandler(adsk.core.ActiveSelectionEventHandler):
+    """用户选择变化时推送选择事件"""
+
+    def notify(self, args):
+        try:
+            selections = args.currentSelection
+            ids = []
+            for i in range(min(selections.count, SELECTION_EVENT_MAX_IDS)):
+                token = getattr(selections.item(i).entity, 'entityToken', None)
+                if token:
+                    ids.append(token)
+            event_broadcaster.publish('selection', {"count": selections.count, "ids": ids})
+        except:
+            pass
+
+
+class CameraRevisionHandler(adsk.core.CameraEventHandler):
+    """视角变化后递增相机版本号"""
+
+    def notify(self, args):
+        try:
+            camera_revision.bump('camera_changed')
+        except:
+            pass
+
+
+def register_event_handlers():
+    """注册会使设计内容或视图变化的 Fusion 事件"""
+    document_events = {
+        'document_opened': app.documentOpened,
+        'document_activated': app.documentActivated,
+        'document_closed': app.documentClosed,
+    }
+    for reason, event in document_events.items():
+        handler = DocumentRevisionHandler(reason)
+        event.add(handler)
+        event_handlers.append((event, handler))
+
+    if ui:
+        handler = CommandRevisionHandler()
+        ui.commandTerminated.add(handler)
+        event_handlers.append((ui.commandTerminated, handler))
+
+        handler = SelectionEventHandler()
+        ui.activeSelectionChanged.add(handler)
+        event_handlers.append((ui.activeSelectionChanged, handler))
+
+    handler = CameraRevisionHandler()
+    app.cameraChanged.add(handler)
+    event_handlers.append((app.cameraChanged, handler))
+
+
+def unregister_event_handlers():
+    """注销 Fusion 事件处理器"""
+    for event, handler in event_handlers:
+        try:
+            event.remove(handler)
+        except:
+            pass
+    event_handlers.clear()
+
+
+def start_main_thread_dispatcher():
+    """启动主线程调度器（必须在主线程中调用）"""
+    global main_thread_dispatcher
+
+    main_thread_dispatcher = MainThreadDispatcher(
+        app,
+        MAIN_THREAD_EVENT_ID,
+        max_depth=QUEUE_MAX_DEPTH,
+        batch_size=QUEUE_BATCH_SIZE,
+        on_drain=flush_palette,
+        on_job_done=request_metrics.observe_main_thread
+    )
+    main_thread_dispatcher.start()
+    addin_logger.on_palette_pending = main_thread_dispatcher.wake
+    log_message(f"主线程调度器已启动: 队列深度 {QUEUE_MAX_DEPTH}, 批大小 {QUEUE_BATCH_SIZE}")
+
+
+def stop_main_thread_dispatcher():
+    """停止主线程调度器"""
+    global main_thread_dispatcher
+
+    try:
+        addin_logger.on_palette_pending = None
+        if main_thread_dispatcher:
+            main_thread_dispatcher.stop()
+            main_thread_dispatcher = None
+    except Exception as e:
+        handle_error('stop_main_thread_dispatcher', show_message=False)
+
+
 def start_http_server():
     """启动 HTTP 服务器"""
     global http_server, server_thread
@@ -748,8 +1846,9 @@ def start_http_server():
     try:
         log_message(f"正在启动 HTTP 服务器: {HTTP_HOST}:{HTTP_PORT}")
 
-        # 创建 HTTP 服务器
-        http_server = HTTPServer((HTTP_HOST, HTTP_PORT), MCPRequestHandler)
+        # 创建 HTTP/1.1 服务器（每个连接一个线程、连接复用，事件流长连接和慢请求不会阻塞其他请求）
+        events_stopped.clear()
+        http_server = KeepAliveHTTPServer((HTTP_HOST, HTTP_PORT), MCPRequestHandler)
 
         # 在后台线程运行服务器
         server_thread = threading.Thread(target=http_server.serve_forever, daemon=True)
@@ -764,15 +1863,84 @@ def start_http_server():
         handle_error('start_http_server')
 
 
+def start_uds_server():
+    """在 Unix 域套接字上启动 HTTP 服务器（与 TCP 服务器共用请求处理器）"""
+    global uds_server, uds_thread
+
+    if not UDS_ENABLED:
+        return
+    try:
+        # 清理上次异常退出留下的套接字文件
+        if os.path.exists(UDS_PATH):
+            os.unlink(UDS_PATH)
+
+        uds_server = UnixHTTPServer(UDS_PATH, MCPRequestHandler)
+        os.chmod(UDS_PATH, 0o600)
+        uds_thread = threading.Thread(target=uds_server.serve_forever, daemon=True)
+        uds_thread.start()
+        log_message(f"HTTP 服务器已启动在 {UDS_PATH}")
+    except Exception as e:
+        uds_server = None
+        handle_error('start_uds_server', show_message=False)
+
+
+def stop_uds_server():
+    """停止 Unix 域套接字 HTTP 服务器并删除套接字文件"""
+    global uds_server, uds_thread
+
+    try:
+        if uds_server:
+            uds_server.shutdown()
+            uds_server.close_connections()
+            uds_server.server_close()
+            uds_server = None
+        if uds_thread:
+            uds_thread.join(timeout=1)
+            uds_thread = None
+        if UDS_ENABLED and os.path.exists(UDS_PATH):
+            os.unlink(UDS_PATH)
+    except Exception as e:
+        handle_error('stop_uds_server', show_message=False)
+
+
+def start_framed_server():
+    """启动长度前缀帧传输服务器"""
+    global framed_server
+
+    if not FRAMED_ENABLED:
+        return
+    try:
+        framed_server = FramedServer(HTTP_HOST, FRAMED_PORT, handle_framed_request, max_workers=FRAMED_MAX_WORKERS)
+        framed_server.start()
+        log_message(f"帧传输服务器已启动在 {HTTP_HOST}:{FRAMED_PORT}")
+    except Exception as e:
+        framed_server = None
+        handle_error('start_framed_server', show_message=False)
+
+
+def stop_framed_server():
+    """停止长度前缀帧传输服务器"""
+    global framed_server
+
+    try:
+        if framed_server:
+            framed_server.stop()
+            framed_server = None
+    except Exception as e:
+        handle_error('stop_framed_server', show_message=False)
+
+
 def stop_http_server():
     """停止 HTTP 服务器"""
     global http_server, server_thread
 
     try:
         log_message("正在停止 HTTP 服务器")
+        events_stopped.set()
 
         if http_server:
             http_server.shutdown()
+            http_server.close_connections()
             http_server.server_close()
             http_server = None
 
@@ -795,13 +1963,29 @@ def run(context):
         app = adsk.core.Application.get()
         ui = app.userInterface
 
+        # 日志文件固定名称，按大小轮转，不再每次启动新建文件
+        addin_logger.start(LOG_FILE, LOG_FILE_MAX_BYTES, LOG_FILE_BACKUPS)
         log_message(f"=== {ADDIN_NAME} 启动 ===")
         log_message(f"Fusion 360 版本: {app.version}")
 
-        # 启动 HTTP 服务器
+        # 清理上次运行和旧版本留下的截图文件
+        removed = screenshot_cache.cleanup(extra_patterns=(LEGACY_SCREENSHOT_PATTERN,))
+        if removed:
+            log_message(f"已清理 {removed} 个旧截图文件")
+
+        # run 在主线程中执行，可以直接读取 API 列表中的 Fusion 版本
+        register_static_responses()
+
+        # 先启动主线程调度器和事件监听，再启动 HTTP 服务器
+        start_main_thread_dispatcher()
+        register_event_handlers()
         start_http_server()
+        start_uds_server()
+        start_framed_server()
 
         log_message(f"=== {ADDIN_NAME} 启动完成 ===")
+        addin_logger.flush()
+        flush_palette()
 
     except Exception as e:
         handle_error('run')
@@ -814,10 +1998,22 @@ def stop(context):
     try:
         log_message(f"=== {ADDIN_NAME} 停止 ===")
 
-        # 停止 HTTP 服务器
+        # 停止 HTTP 服务器、事件监听和主线程调度器
+        stop_framed_server()
+        stop_uds_server()
         stop_http_server()
+        unregister_event_handlers()
+        stop_main_thread_dispatcher()
+
+        # 未提交的事务直接回滚，不保留只完成了一部分的修改
+        if active_transaction:
+            rollback_transaction()
+
+        screenshot_cache.clear()
 
         log_message(f"=== {ADDIN_NAME} 停止完成 ===")
+        addin_logger.stop()
+        flush_palette()
 
     except Exception as e:
         handle_error('stop')
@@ -0,0 +1,125 @@
+"""
+Fusion360 MCP Addin HTTP 服务器模块
+
+HTTP/1.1 keep-alive：每个连接一个工作线程，同一连接上的多个请求复用一个 TCP 连接。
+工作线程只负责解析请求和序列化响应，adsk 调用都交给主线程调度器，
+所以截图等慢请求只占用自己的连接，/api/health 不受影响。
+空闲连接超过 KEEPALIVE_TIMEOUT 秒后关闭，停止服务器时关闭所有连接。
+"""
+
+import socket
+import socketserver
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+KEEPALIVE_TIMEOUT = 30  # 空闲连接保持时间（秒）
+
+
+class ConnectionTrackingMixIn:
+    """记录活动连接，停止时可以主动关闭仍在保持的连接"""
+
+    def init_tracking(self):
+        self._connections = set()
+        self._connections_lock = threading.Lock()
+        self.accepted = 0
+        self.requests = 0
+
+    def process_request_thread(self, request, client_address):
+        with self._connections_lock:
+            self._connections.add(request)
+            self.accepted += 1
+        try:
+            super().process_request_thread(request, client_address)
+        finally:
+            with self._connections_lock:
+                self._connections.discard(request)
+
+    def count_request(self):
+        with self._connections_lock:
+            self.requests += 1
+
+    def close_connections(self):
+        """关闭所有活动连接（空闲的 keep-alive 连接和事件流）"""
+        with self._connections_lock:
+            connections = list(self._connections)
+        for conn in connections:
+            try:
+                conn.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    def get_stats(self):
+        """获取连接统计信息，reused 为复用已有连接的请求数"""
+        with self._connections_lock:
+            return {
+                "connections": len(self._connections),
+                "accepted": self.accepted,
+                "requests": self.requests,
+                "reused": max(0, self.requests - self.accepted),
+            }
+
+
+class KeepAliveHTTPServer(ConnectionTrackingMixIn, ThreadingHTTPServer):
+    """TCP 上的多线程 HTTP/1.1 服务器"""
+
+    daemon_threads = True
+
+    def __init__(self, server_address, handler_class):
+        self.init_tracking()
+        super().__init__(server_address, handler_class)
+
+
+if hasattr(socket, 'AF_UNIX'):
+    class UnixHTTPServer(ConnectionTrackingMixIn, socketserver.ThreadingUnixStreamServer):
+        """监听 Unix 域套接字的多线程 HTTP/1.1 服务器"""
+
+        daemon_threads = True
+
+        def __init__(self, server_address, handler_class):
+            self.init_tracking()
+            super().__init__(server_address, handler_class)
+else:
+    # Windows 上的 Python 没有 AF_UNIX
+    UnixHTTPServer = None
+
+
+class KeepAliveRequestHandler(BaseHTTPRequestHandler):
+    """HTTP/1.1 请求处理器基类
+
+    每个响应都必须带 Content-Length 或使用分块传输，否则要设置 close_connection。
+    """
+
+    protocol_version = 'HTTP/1.1'
+    timeout = KEEPALIVE_TIMEOUT
+
+    def setup(self):
+        super().setup()
+        # 响应头和响应体分两次写出，不关闭 Nagle 算法会与客户端的延迟确认叠加出约 40ms 的等待
+        if self.connection.family in (socket.AF_INET, socket.AF_INET6):
+            self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def handle_one_request(self):
+        # 空闲超时时 readline 抛出异常，raw_requestline 不会被重新赋值
+        self.raw_requestline = b''
+        super().handle_one_request()
+        if self.raw_requestline and hasattr(self.server, 'count_request'):
+            self.server.count_request()
+
+    def read_body(self):
+        """读取请求体；keep-alive 连接上即使不使用也必须读完
+
+        Content-Length 无效或连接在请求体中途关闭时抛出 ValueError，调用方必须关闭连接。
+        """
+        content_length = int(self.headers.get('Content-Length', 0) or 0)
+        if content_length < 0:
+            raise ValueError(f"Content-Length 无效: {content_length}")
+        if content_length == 0:
+            return b''
+        body = self.rfile.read(content_length)
+        if len(body) < content_length:
+            raise ValueError(f"请求体不完整: {len(body)}/{content_length} 字节")
+        return body
+
+    def log_message(self, format, *args):
+        """禁用 HTTP 服务器默认日志"""
+        pass
@@ -0,0 +1,102 @@
+"""
+Fusion360 MCP Addin 变更日志模块
+
+记录每次修改操作创建、修改、删除的 entityToken 及其设计版本号，客户端通过
+/api/changes?since=N 只获取增量，无需重新枚举全部对象。日志是有界环形缓冲，
+客户端落后太多、或发生了无法逐个跟踪的变化（切换文档、界面命令、回滚）时，
+返回 resync_required 提示重新全量获取。
+版本号在插件重新加载后从 0 开始，返回的 revision_token 带有本次加载的 epoch，
+客户端用它作为 since 时，epoch 不同即要求全量同步，不会拿到另一次加载的部分增量。
+"""
+
+import threading
+from collections import deque
+
+CHANGE_TYPES = ('created', 'modified', 'deleted')
+
+
+class ChangeJournal:
+    """追加式变更日志
+
+    修改处理函数通过 note() 登记变化，apply_mutation 递增版本号后调用 commit()
+    为这些变化盖上同一个版本号（一次批量操作只对应一个版本号）。
+    """
+
+    def __init__(self, max_entries=1000, epoch=None):
+        self.epoch = epoch
+        self._entries = deque(maxlen=max_entries)
+        self._pending = []
+        self._lock = threading.Lock()
+        # 早于或等于该版本号的增量已不完整，需要全量同步
+        self._resync_before = 0
+        self.last_reset_reason = None
+
+    def note(self, change_type, token, kind=None):
+        """登记一项待提交的变化"""
+        if change_type not in CHANGE_TYPES:
+            raise ValueError(f"不支持的变化类型: {change_type}")
+        if not token:
+            return
+        with self._lock:
+            self._pending.append((change_type, token, kind))
+
+    def commit(self, revision):
+        """以 revision 提交所有待提交的变化，返回提交的条目"""
+        with self._lock:
+            pending, self._pending = self._pending, []
+            committed = []
+            for change_type, token, kind in pending:
+                if len(self._entries) == self._entries.maxlen:
+                    # 最旧的条目即将被覆盖，早于它的版本号无法再提供增量
+                    self._resync_before = max(self._resync_before, self._entries[0]["revision"])
+                    self.last_reset_reason = 'journal_overflow'
+                entry = {
+                    "revision": revision,
+                    "type": change_type,
+                    "id": token,
+                    "kind": kind
+                }
+                self._entries.append(entry)
+                committed.append(entry)
+            return committed
+
+    def reset(self, revision, reason=None):
+        """记录一次无法逐项跟踪的变化，since 早于 revision 的客户端需要全量同步"""
+        with self._lock:
+            self._pending = []
+            self._resync_before = max(self._resync_before, revision)
+            self.last_reset_reason = reason
+
+    def since(self, since, current_revision, epoch=None):
+        """返回版本号大于 since 的变化，epoch 为客户端上次看到的 epoch（未知时为 None）"""
+        epoch_changed = epoch is not None and epoch != self.epoch
+        with self._lock:
+            # since 大于当前版本号说明插件重启过，版本号已从头计数
+            resync = epoch_changed or since < self._resync_before or since > current_revision
+            changes = [] if resync else [entry for entry in self._entries if entry["revision"] > since]
+
+        result = {
+            "success": True,
+            "since": since,
+            "revision": current_revision,
+            "revision_token": f"{self.epoch}:{current_revision}",
+            "changes": changes,
+            "count": len(changes),
+            "resync_required": resync
+        }
+        if resync:
+            if epoch_changed:
+                result["reason"] = 'epoch_changed'
+            elif since > current_revision:
+                result["reason"] = 'revision_ahead'
+            else:
+                result["reason"] = self.last_reset_reason
+        return result
+
+    def get_stats(self):
+        """获取日志统计信息"""
+        return {
+            "entries": len(self._entries),
+            "max_entries": self._entries.maxlen,
+            "resync_before": self._resync_before,
+        }
@@ -0,0 +1,189 @@
+"""
+Fusion360 MCP Addin 指标模块
+
+按路由统计请求数、错误数、请求总耗时、主线程排队时间、主线程执行时间和
+请求/响应体大小，直方图使用固定的桶，以 Prometheus 文本格式从 /api/metrics 输出。
+路由标签把 /api/object/<id> 归并为 /api/object/{id}，未知路径归为 other，避免标签无限增长。
+"""
+
+import threading
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# 秒
+DURATION_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+# 字节
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+HISTOGRAM_HELP = {
+    'request_duration_seconds': '请求总耗时（秒），从解析请求到写完响应',
+    'request_size_bytes': '请求体大小（字节）',
+    'response_size_bytes': '响应体大小（字节，压缩后）',
+    'queue_wait_seconds': '任务在主线程队列中的等待时间（秒）',
+    'main_thread_seconds': '任务在主线程中的执行时间（秒）',
+}
+
+ROUTE_PREFIXES = ('/api/object/',)
+OTHER_ROUTE = 'other'
+
+
+def route_label(path, known_routes=()):
+    """把请求路径转换为有限取值的路由标签"""
+    path = path.split('?', 1)[0]
+    for prefix in ROUTE_PREFIXES:
+        if path.startswith(prefix) and len(path) > len(prefix):
+            return prefix + '{id}'
+    return path if path in known_routes else OTHER_ROUTE
+
+
+class Histogram:
+    """固定桶直方图（不加锁，由 MetricsRegistry 保护）"""
+
+    __slots__ = ('buckets', 'counts', 'sum', 'count')
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.sum += value
+        self.count += 1
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[index] += 1
+                break
+
+    def cumulative(self):
+        total = 0
+        for bound, count in zip(self.buckets, self.counts):
+            total += count
+            yield bound, total
+
+
+def _format_labels(labels):
+    return ','.join(f'{name}="{_escape(value)}"' for name, value in labels)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_value(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class MetricsRegistry:
+    """插件请求指标（线程安全）"""
+
+    def __init__(self, prefix='fusion360_mcp_addin', known_routes=()):
+        self.prefix = prefix
+        self.known_routes = frozenset(known_routes)
+        self._lock = threading.Lock()
+        self._requests = {}   # (方法, 路由, 状态码) -> 次数
+        self._errors = {}     # (方法, 路由) -> 次数
+        self._histograms = {}  # (指标名, 标签) -> Histogram
+
+    def route(self, path):
+        return route_label(path, self.known_routes)
+
+    def _histogram(self, name, labels, buckets):
+        key = (name, labels)
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            histogram = self._histograms[key] = Histogram(buckets)
+        return histogram
+
+    def observe_request(self, method, route, status, seconds, request_bytes=0, response_bytes=0, error=False):
+        """记录一次完整的请求（从解析请求到写完响应）"""
+        labels = (('method', method), ('route', route))
+        with self._lock:
+            key = (method, route, status)
+            self._requests[key] = self._requests.get(key, 0) + 1
+            if error or status >= 400:
+                self._errors[(method, route)] = self._errors.get((method, route), 0) + 1
+            self._histogram('request_duration_seconds', labels, DURATION_BUCKETS).observe(seconds)
+            self._histogram('request_size_bytes', labels, SIZE_BUCKETS).observe(request_bytes)
+            self._histogram('response_size_bytes', labels, SIZE_BUCKETS).observe(response_bytes)
+
+    def observe_main_thread(self, route, queue_wait, execution):
+        """记录一次主线程任务的排队时间和执行时间"""
+        labels = (('route', route or OTHER_ROUTE),)
+        with self._lock:
+            self._histogram('queue_wait_seconds', labels, DURATION_BUCKETS).observe(queue_wait)
+            self._histogram('main_thread_seconds', labels, DURATION_BUCKETS).observe(execution)
+
+    def render(self, gauges=None):
+        """输出 Prometheus 文本格式；gauges 为 {名称: (说明, 值)}"""
+        lines = []
+        with self._lock:
+            name = f'{self.prefix}_requests_total'
+            lines.append(f'# HELP {name} 按方法、路由和状态码统计的请求数')
+            lines.append(f'# TYPE {name} counter')
+            for (method, route, status), count in sorted(self._requests.items()):
+                labels = _format_labels((('method', method), ('route', route), ('status', status)))
+                lines.append(f'{name}{{{labels}}} {count}')
+
+            name = f'{self.prefix}_request_errors_total'
+            lines.append(f'# HELP {name} 失败的请求数（状态码 >= 400 或 success 为 false）')
+            lines.append(f'# TYPE {name} counter')
+            for (method, route), count in sorted(self._errors.items()):
+                lines.append(f'{name}{{{_format_labels((("method", method), ("route", route)))}}} {count}')
+
+            by_name = {}
+            for (metric, labels), histogram in self._histograms.items():
+                by_name.setdefault(metric, []).append((labels, histogram))
+            for metric in sorted(by_name):
+                name = f'{self.prefix}_{metric}'
+                lines.append(f'# HELP {name} {HISTOGRAM_HELP.get(metric, metric)}')
+                lines.append(f'# TYPE {name} histogram')
+                for labels, histogram in sorted(by_name[metric], key=lambda item: item[0]):
+                    label_text = _format_labels(labels)
+                    for bound, count in histogram.cumulative():
+                        lines.append(f'{name}_bucket{{{label_text},le="{_format_value(float(bound))}"}} {count}')
+                    lines.append(f'{name}_bucket{{{label_text},le="+Inf"}} {histogram.count}')
+                    lines.append(f'{name}_sum{{{label_text}}} {_format_value(float(histogram.sum))}')
+                    lines.append(f'{name}_count{{{label_text}}} {histogram.count}')
+
+        for gauge, (help_text, value) in sorted((gauges or {}).items()):
+            name = f'{self.prefix}_{gauge}'
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} gauge')
+            lines.append(f'{name} {_format_value(value)}')
+        return '\n'.join(lines) + '\n'
+
+    def get_stats(self):
+        """按路由汇总请求数、错误数和平均耗时（毫秒）"""
+        with self._lock:
+            stats = {}
+            for (method, route, _), count in self._requests.items():
+                entry = stats.setdefault(f'{method} {route}', {"requests": 0, "errors": 0})
+                entry["requests"] += count
+            for (method, route), count in self._errors.items():
+                stats[f'{method} {route}']["errors"] = count
+            for (metric, labels), histogram in self._histograms.items():
+                if metric != 'request_duration_seconds' or not histogram.count:
+                    continue
+                entry = stats.get(f'{labels[0][1]} {labels[1][1]}')
+                if entry is not None:
+                    entry["avg_ms"] = round(histogram.sum / histogram.count * 1000, 3)
+            return stats
+
+
+class TextResponse:
+    """以原始字节发送的文本响应，接口与 FileResponse 相同"""
+
+    def __init__(self, text, content_type=PROMETHEUS_CONTENT_TYPE):
+        self.body = text.encode('utf-8')
+        self.content_type = content_type
+
+    def iter_chunks(self, chunk_size=64 * 1024):
+        for start in range(0, len(self.body), chunk_size):
+            yield self.body[start:start + chunk_size]
+
+    def read(self):
+        return self.body
+
+    def close(self):
+        pass
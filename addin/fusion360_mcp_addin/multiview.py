@@ -0,0 +1,85 @@
+"""
+Fusion360 MCP Addin 多视图截图模块
+
+一次请求按多个命名相机预设（front、top、right、iso 等）截图：相机切换关闭平滑过渡，
+所有预设在同一个主线程任务中渲染，结束后恢复原相机。结果以 multipart/mixed
+一次返回，每个部分是一张图片的原始字节。
+"""
+
+import uuid
+
+# 预设名称 -> adsk.core.ViewOrientations 成员名
+CAMERA_PRESETS = {
+    'front': 'FrontViewOrientation',
+    'back': 'BackViewOrientation',
+    'top': 'TopViewOrientation',
+    'bottom': 'BottomViewOrientation',
+    'left': 'LeftViewOrientation',
+    'right': 'RightViewOrientation',
+    'iso': 'IsoTopRightViewOrientation',
+    'iso_top_left': 'IsoTopLeftViewOrientation',
+    'iso_bottom_right': 'IsoBottomRightViewOrientation',
+    'iso_bottom_left': 'IsoBottomLeftViewOrientation',
+}
+
+DEFAULT_PRESETS = ('front', 'top', 'right', 'iso')
+MAX_PRESETS = len(CAMERA_PRESETS)
+
+
+def parse_presets(value):
+    """解析逗号分隔的预设名称，去重并保持顺序；未知名称抛出 ValueError"""
+    names = [name.strip().lower() for name in (value or '').split(',') if name.strip()]
+    if not names:
+        return list(DEFAULT_PRESETS)
+
+    presets = []
+    for name in names:
+        if name not in CAMERA_PRESETS:
+            raise ValueError(f"未知的相机预设: {name}，可选: {', '.join(CAMERA_PRESETS)}")
+        if name not in presets:
+            presets.append(name)
+    return presets
+
+
+class MultipartResponse:
+    """以 multipart/mixed 发送的多个文件，接口与 FileResponse 相同
+
+    parts 为 (名称, 文件路径, Content-Type) 列表，文件归截图缓存管理，发送后不删除；
+    release 不为 None 时在 close() 中对每个文件调用，解除发送期间的 pin。
+    """
+
+    def __init__(self, parts, chunk_size=64 * 1024, release=None):
+        self.parts = parts
+        self.chunk_size = chunk_size
+        self.release = release
+        self.boundary = uuid.uuid4().hex
+        self.content_type = f'multipart/mixed; boundary={self.boundary}'
+
+    def _part_header(self, name, content_type):
+        return (
+            f'--{self.boundary}\r\n'
+            f'Content-Type: {content_type}\r\n'
+            f'Content-Disposition: inline; name="{name}"\r\n\r\n'
+        ).encode('utf-8')
+
+    def iter_chunks(self, chunk_size=None):
+        chunk_size = chunk_size or self.chunk_size
+        for name, path, content_type in self.parts:
+            yield self._part_header(name, content_type)
+            with open(path, 'rb') as f:
+                while True:
+                    chunk = f.read(chunk_size)
+                    if not chunk:
+                        break
+                    yield chunk
+            yield b'\r\n'
+        yield f'--{self.boundary}--\r\n'.encode('utf-8')
+
+    def read(self):
+        return b''.join(self.iter_chunks())
+
+    def close(self):
+        if self.release:
+            for _, path, _ in self.parts:
+                self.release(path)
+            self.release = None
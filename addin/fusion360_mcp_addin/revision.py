@@ -0,0 +1,60 @@
+"""
+Fusion360 MCP Addin 设计版本号与 ETag 模块
+
+每次修改操作和文档事件都会递增设计版本号，GET 响应的 ETag 由版本号派生，
+客户端携带 If-None-Match 时无需重新计算即可返回 304。
+版本号在插件重新加载后从 0 开始，ETag 和版本号响应头都带上每次加载随机生成的
+epoch，避免重新加载后生成客户端已经持有的 ETag。
+"""
+
+import hashlib
+import threading
+import uuid
+
+
+class RevisionCounter:
+    """线程安全的单调递增版本号，epoch 在创建时（插件加载时）随机生成"""
+
+    def __init__(self):
+        self.epoch = uuid.uuid4().hex
+        self._value = 0
+        self._lock = threading.Lock()
+        self.last_reason = None
+
+    @property
+    def value(self):
+        return self._value
+
+    def bump(self, reason=None):
+        """递增版本号并返回新值"""
+        with self._lock:
+            self._value += 1
+            self.last_reason = reason
+            return self._value
+
+    def token(self, value=None):
+        """带 epoch 的版本号文本（X-Design-Revision 响应头），value 默认为当前值"""
+        return f"{self.epoch}:{self._value if value is None else value}"
+
+
+def make_etag(*parts):
+    """由若干部分生成强 ETag"""
+    digest = hashlib.sha1(':'.join(str(part) for part in parts).encode('utf-8')).hexdigest()
+    return f'"{digest[:20]}"'
+
+
+def etag_matches(if_none_match, etag):
+    """判断 If-None-Match 头是否匹配当前 ETag"""
+    if not if_none_match or not etag:
+        return False
+
+    for candidate in if_none_match.split(','):
+        candidate = candidate.strip()
+        if candidate == '*':
+            return True
+        # If-None-Match 使用弱比较
+        if candidate.startswith('W/'):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
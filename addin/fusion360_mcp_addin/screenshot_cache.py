@@ -0,0 +1,158 @@
+"""
+Fusion360 MCP Addin 截图缓存模块
+
+按 (设计版本号, 相机 eye/target/up, 宽, 高, 格式, 视觉样式, 质量预设) 缓存渲染好的截图文件，
+模型和视角都没变时重复的 get_view 直接返回已有文件，不再调用 saveAsImageFile。
+缓存文件放在独立目录中，按 LRU 淘汰，总大小和条目数都有上限；
+启动时清理上次运行留下的文件。HTTP 线程发送文件期间由 pin() 保护，
+此时被淘汰的文件等 release() 之后再删除。
+"""
+
+import glob
+import os
+import threading
+import uuid
+from collections import OrderedDict
+
+
+def make_screenshot_key(revision, eye, target, up, width, height, format_type, visual_style, quality='final'):
+    """生成缓存键，相机坐标取 6 位小数以消除浮点噪声"""
+    camera = tuple(round(value, 6) for point in (eye, target, up) for value in point)
+    return (revision, camera, width, height, format_type, visual_style, quality)
+
+
+class ScreenshotCache:
+    """截图文件 LRU 缓存（线程安全）"""
+
+    def __init__(self, directory, max_bytes=256 * 1024 * 1024, max_entries=64):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> (路径, 大小)
+        self._pending_delete = set()
+        self._pins = {}  # 路径 -> 正在发送的响应数
+        self._evicted_pinned = set()
+        self._lock = threading.Lock()
+        self.total_bytes = 0
+
+        # 统计信息
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def new_path(self, format_type):
+        """返回缓存目录中一个新的文件路径，用于渲染"""
+        os.makedirs(self.directory, exist_ok=True)
+        return os.path.join(self.directory, f"view_{uuid.uuid4().hex}.{format_type}")
+
+    def get(self, key):
+        """返回缓存的文件路径，未命中或文件已丢失时返回 None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and os.path.exists(entry[0]):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            if entry:
+                self._entries.pop(key)
+                self.total_bytes -= entry[1]
+            self.misses += 1
+            return None
+
+    def put(self, key, path):
+        """登记已渲染到 new_path() 的文件，超出上限时淘汰最久未用的条目"""
+        size = os.path.getsize(path)
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old:
+                self.total_bytes -= old[1]
+                self._delete(old[0])
+            self._entries[key] = (path, size)
+            self.total_bytes += size
+            while self._entries and (
+                len(self._entries) > self.max_entries or self.total_bytes > self.max_bytes
+            ) and next(iter(self._entries)) != key:
+                _, (evicted_path, evicted_size) = self._entries.popitem(last=False)
+                self.total_bytes -= evicted_size
+                self.evictions += 1
+                self._delete(evicted_path)
+            self._retry_pending()
+        return path
+
+    def pin(self, path):
+        """标记文件正在发送，期间即使被淘汰也不删除（在登记或命中文件的主线程任务中调用）"""
+        with self._lock:
+            self._pins[path] = self._pins.get(path, 0) + 1
+
+    def release(self, path):
+        """发送结束，文件已被淘汰且没有其他响应在发送时删除"""
+        with self._lock:
+            count = self._pins.get(path, 0) - 1
+            if count > 0:
+                self._pins[path] = count
+                return
+            self._pins.pop(path, None)
+            if path in self._evicted_pinned:
+                self._evicted_pinned.discard(path)
+                self._delete(path)
+
+    def clear(self):
+        """删除所有缓存文件（插件停止时调用，此时已没有正在发送的响应）"""
+        with self._lock:
+            self._pins.clear()
+            self._pending_delete.update(self._evicted_pinned)
+            self._evicted_pinned.clear()
+            for path, _ in self._entries.values():
+                self._delete(path)
+            self._entries.clear()
+            self.total_bytes = 0
+            self._retry_pending()
+
+    def cleanup(self, extra_patterns=()):
+        """删除缓存目录中未登记的文件（上次运行留下的）以及匹配 extra_patterns 的旧截图"""
+        with self._lock:
+            known = {path for path, _ in self._entries.values()}
+        removed = 0
+        paths = glob.glob(os.path.join(self.directory, '*'))
+        for pattern in extra_patterns:
+            paths.extend(glob.glob(pattern))
+        for path in paths:
+            if path not in known and os.path.isfile(path):
+                try:
+                    os.remove(path)
+                    removed += 1
+                except OSError:
+                    pass
+        return removed
+
+    def _delete(self, path):
+        if path in self._pins:
+            self._evicted_pinned.add(path)
+            return
+        # Windows 上被其他程序打开的文件无法删除，留到下次再试
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        except OSError:
+            self._pending_delete.add(path)
+
+    def _retry_pending(self):
+        for path in list(self._pending_delete):
+            self._pending_delete.discard(path)
+            self._delete(path)
+
+    def get_stats(self):
+        """获取截图缓存统计信息"""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self.total_bytes,
+                "max_bytes": self.max_bytes,
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "pending_delete": len(self._pending_delete),
+                "pinned": len(self._pins),
+            }
@@ -0,0 +1,96 @@
+"""
+Fusion360 MCP Addin 静态响应模块
+
+/api/list、/api/health 等内容在插件运行期间不变的响应，启动时按支持的编码
+（JSON、MessagePack）各序列化一次，ETag 由内容哈希得出（强 ETag）。
+请求时只做查表：不进入主线程，不重新构造字典和序列化；压缩结果按
+(编码, Accept-Encoding) 缓存。带过滤参数（如 category=）的请求使用启动时预先拆分好的切片。
+"""
+
+import hashlib
+import threading
+import urllib.parse
+
+import codec
+
+MAX_COMPRESSED_VARIANTS = 16  # 每个响应最多缓存的压缩结果数（不同的 Accept-Encoding 头）
+
+
+class StaticResponse:
+    """预先序列化的响应体"""
+
+    def __init__(self, data):
+        self.bodies = {content_type: codec.encode(data, content_type) for content_type in codec.supported_types()}
+        digest = hashlib.sha1(self.bodies[codec.JSON_TYPE]).hexdigest()
+        self.etag = f'"{digest[:20]}"'
+        self._compressed = {}
+        self._lock = threading.Lock()
+
+    def body(self, content_type):
+        return self.bodies.get(content_type, self.bodies[codec.JSON_TYPE])
+
+    def compressed(self, content_type, accept_encoding, compressor):
+        """返回 (响应体, Content-Encoding)，同一组头只压缩一次"""
+        key = (content_type, accept_encoding or '')
+        with self._lock:
+            cached = self._compressed.get(key)
+        if cached:
+            return cached
+        result = compressor.compress(self.body(content_type), accept_encoding)
+        with self._lock:
+            if len(self._compressed) < MAX_COMPRESSED_VARIANTS:
+                self._compressed[key] = result
+        return result
+
+
+class StaticRoute:
+    """一个静态路径：完整响应和按查询参数拆分的切片"""
+
+    def __init__(self, data, slices=None, slice_param=None):
+        self.response = StaticResponse(data)
+        self.slice_param = slice_param
+        self.slices = {name: StaticResponse(value) for name, value in (slices or {}).items()}
+        self.hits = 0
+
+    def select(self, query):
+        """按查询参数选择响应，未知的切片名称抛出 KeyError"""
+        self.hits += 1
+        if not self.slice_param or not query:
+            return self.response
+        values = urllib.parse.parse_qs(query).get(self.slice_param)
+        if not values:
+            return self.response
+        name = values[0]
+        if name not in self.slices:
+            raise KeyError(name)
+        return self.slices[name]
+
+
+class StaticResponseRegistry:
+    """静态响应注册表（注册在启动时完成，之后只读）"""
+
+    def __init__(self):
+        self._routes = {}
+
+    def register(self, path, data, slices=None, slice_param=None):
+        """注册路径的响应数据；slices 为 {参数值: 数据}，通过 ?slice_param=参数值 访问"""
+        route = StaticRoute(data, slices, slice_param)
+        self._routes[path] = route
+        return route
+
+    def get(self, path):
+        return self._routes.get(path)
+
+    def clear(self):
+        self._routes = {}
+
+    def get_stats(self):
+        """获取各静态路径的命中次数和 JSON 响应体大小"""
+        return {
+            path: {
+                "hits": route.hits,
+                "bytes": len(route.response.bodies[codec.JSON_TYPE]),
+                "slices": len(route.slices),
+            }
+            for path, route in self._routes.items()
+        }
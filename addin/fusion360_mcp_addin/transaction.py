@@ -0,0 +1,96 @@
+"""
+Fusion360 MCP Addin 时间线事务模块
+
+开始时记录时间线标记位置，事务中的修改操作全部成功时提交，有失败的操作时
+删除标记之后的所有特征，回滚到开始时的状态。
+
+Fusion API 只在 Sketch 上提供 isComputeDeferred，Design 没有暂停时间线重算的开关，
+事务中的每个特征在创建时仍各自计算；事务只保证整批修改要么全部保留、要么全部撤销。
+时间线标记只对开始事务时的设计有效，活动文档切换后事务被中止，不再移动标记。
+"""
+
+import time
+
+
+class TransactionError(Exception):
+    """事务状态错误"""
+
+
+class DesignTransaction:
+    """单个设计上的时间线事务"""
+
+    def __init__(self, design):
+        self.design = design
+        self.start_marker = None
+        self.mutations = 0
+        self.errors = []
+        self.started_at = None
+
+    @property
+    def failed(self):
+        return bool(self.errors)
+
+    def begin(self):
+        """开始事务：记录时间线标记"""
+        timeline = self.design.timeline
+        self.start_marker = timeline.markerPosition if timeline is not None else None
+        self.started_at = time.time()
+
+    def belongs_to(self, design):
+        """判断 design 是否是开始事务时的设计"""
+        return design is not None and design == self.design
+
+    def record(self, result):
+        """记录事务中一次修改操作的结果"""
+        self.mutations += 1
+        if not isinstance(result, dict) or not result.get("success"):
+            error = result.get("error", "操作失败") if isinstance(result, dict) else "操作失败"
+            self.errors.append(error)
+
+    def commit(self):
+        """提交事务，事务中有失败的操作时回滚"""
+        if self.failed:
+            rollback = self.rollback()
+            return {
+                "success": False,
+                "error": "事务中存在失败的操作，已回滚",
+                "errors": self.errors,
+                "rolled_back": rollback.get("rolled_back", False)
+            }
+
+        return {
+            "success": True,
+            "mutations": self.mutations,
+            "duration": round(time.time() - self.started_at, 3)
+        }
+
+    def rollback(self):
+        """回滚到事务开始时的时间线标记"""
+        rolled_back = False
+        error = None
+        try:
+            timeline = self.design.timeline
+            if timeline is not None and self.start_marker is not None:
+                timeline.markerPosition = self.start_marker
+                timeline.deleteAllAfterMarker()
+                rolled_back = True
+            else:
+                error = "当前设计没有时间线，无法回滚"
+        except Exception as e:
+            error = f"回滚失败: {e}"
+
+        result = {"success": rolled_back, "rolled_back": rolled_back, "mutations": self.mutations}
+        if error:
+            result["error"] = error
+        return result
+
+    def get_status(self):
+        """获取事务状态"""
+        return {
+            "active": True,
+            "start_marker": self.start_marker,
+            "mutations": self.mutations,
+            "failed": self.failed,
+            "errors": self.errors,
+            "elapsed": round(time.time() - self.started_at, 3) if self.started_at else 0
+        }
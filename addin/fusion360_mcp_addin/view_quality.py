@@ -0,0 +1,99 @@
+"""
+Fusion360 MCP Addin 截图质量预设模块
+
+final 保持原有的全尺寸、全效果截图；preview 用于给视觉模型快速预览：
+缩小到预设尺寸以内（保持宽高比）、关闭抗锯齿，并在截图期间临时把视图切换为
+开销较小的显示设置，截图后恢复。每种预设的截图耗时分别统计。
+"""
+
+import threading
+
+QUALITY_FINAL = 'final'
+QUALITY_PREVIEW = 'preview'
+
+QUALITY_PRESETS = {
+    QUALITY_FINAL: {"max_width": None, "max_height": None, "anti_alias": True},
+    QUALITY_PREVIEW: {"max_width": 640, "max_height": 480, "anti_alias": False},
+}
+
+MIN_SIZE = 100
+
+
+def preset_size(quality, width, height):
+    """按预设的最大尺寸等比缩小，返回 (宽, 高)"""
+    preset = QUALITY_PRESETS[quality]
+    max_width, max_height = preset["max_width"], preset["max_height"]
+    if not max_width or (width <= max_width and height <= max_height):
+        return width, height
+    scale = min(max_width / width, max_height / height)
+    return max(MIN_SIZE, int(width * scale)), max(MIN_SIZE, int(height * scale))
+
+
+class DisplayOverrides:
+    """临时修改若干对象属性，退出时按相反顺序恢复
+
+    overrides 为 (对象, 属性名, 临时值) 列表；对象没有该属性或设置失败时跳过。
+    """
+
+    def __init__(self, overrides):
+        self._overrides = overrides
+        self._saved = []
+        self.applied = []
+        self.restore_errors = []
+
+    def __enter__(self):
+        for target, name, value in self._overrides:
+            try:
+                original = getattr(target, name)
+                if original == value:
+                    continue
+                setattr(target, name, value)
+            except Exception:
+                continue
+            self._saved.append((target, name, original))
+            self.applied.append(name)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        for target, name, original in reversed(self._saved):
+            try:
+                setattr(target, name, original)
+            except Exception as e:
+                self.restore_errors.append(f"{name}: {e}")
+        self._saved = []
+        return False
+
+
+class CaptureTimings:
+    """按质量预设统计截图耗时（线程安全）"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def record(self, quality, seconds, cached=False):
+        with self._lock:
+            stats = self._stats.setdefault(quality, {
+                "renders": 0, "cache_hits": 0, "total_ms": 0.0, "max_ms": 0.0, "last_ms": None
+            })
+            if cached:
+                stats["cache_hits"] += 1
+                return
+            ms = seconds * 1000
+            stats["renders"] += 1
+            stats["total_ms"] += ms
+            stats["max_ms"] = max(stats["max_ms"], ms)
+            stats["last_ms"] = round(ms, 3)
+
+    def get_stats(self):
+        """获取各预设的截图次数和耗时（毫秒）"""
+        with self._lock:
+            return {
+                quality: dict(
+                    stats,
+                    total_ms=round(stats["total_ms"], 3),
+                    max_ms=round(stats["max_ms"], 3),
+                    avg_ms=round(stats["total_ms"] / stats["renders"], 3) if stats["renders"] else None
+                )
+                for quality, stats in self._stats.items()
+            }
@@ -18,9 +18,14 @@ from .tools import (
     execute_code,
     insert_part_from_library,
     get_view,
+    get_views,
     get_objects,
     get_object,
     get_parts_list,
+    batch_operations,
+    transaction,
+    get_changes,
+    get_metrics,
 )
 
 __all__ = [
@@ -32,7 +37,12 @@ __all__ = [
     "execute_code",
     "insert_part_from_library",
     "get_view",
+    "get_views",
     "get_objects",
     "get_object",
     "get_parts_list",
+    "batch_operations",
+    "transaction",
+    "get_changes",
+    "get_metrics",
 ]
@@ -0,0 +1,46 @@
+"""
+Fusion 360 批量操作工具
+"""
+
+import logging
+from typing import Any, Dict, List
+
+from .fusion360_api import get_api
+
+logger = logging.getLogger(__name__)
+
+
+BATCH_MODES = ("stop_on_error", "continue")
+
+
+async def batch_operations(
+    operations: List[Dict[str, Any]],
+    mode: str = "stop_on_error",
+    transaction: bool = False
+) -> Dict[str, Any]:
+    """在一次请求中按顺序执行多个操作
+
+    每个操作形如 {"action": "create_object", "parameters": {...}, "ref": "可选引用名"}，
+    后续操作的参数可以用 "${引用名.字段}" 或 "${序号.字段}" 引用前面操作的结果。
+    transaction 为 True 时整批操作在一个时间线事务中执行，有失败的操作时整批回滚。
+    """
+    if mode not in BATCH_MODES:
+        raise ValueError(f"不支持的批量模式: {mode}，可选: {list(BATCH_MODES)}")
+    if not operations:
+        raise ValueError("批量操作列表不能为空")
+
+    api = get_api()
+
+    data = {
+        "action": "batch",
+        "mode": mode,
+        "transaction": transaction,
+        "operations": operations
+    }
+
+    result = await api._request("POST", "/api/batch", data)
+    logger.info(
+        f"批量操作完成: 成功 {result.get('completed', 0)}, "
+        f"失败 {result.get('failed', 0)}, 跳过 {result.get('skipped', 0)}"
+    )
+    return result
@@ -0,0 +1,196 @@
+"""
+Fusion 360 读取结果缓存（TTL + LRU）
+"""
+
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional, Tuple
+
+# 设计状态相关的读取端点，任何修改操作之后都需要失效
+DESIGN_STATE_PREFIXES = ("/api/objects", "/api/object/")
+
+# 可能改变任意状态的修改端点，除静态内容外全部失效
+BROAD_MUTATION_PREFIXES = ("/api/execute", "/api/document")
+
+# 静态内容，不随修改操作失效
+STATIC_PREFIXES = ("/api/list",)
+
+# 不修改设计的非 GET 端点（截图等）
+READ_ONLY_PREFIXES = ("/api/view",)
+
+
+def is_success(result: Any) -> bool:
+    """插件返回 {"success": false} 的失败结果（如没有活动文档）不应被缓存"""
+    return not (isinstance(result, dict) and result.get("success") is False)
+
+
+class ResponseCache:
+    """按 (端点, 参数) 缓存 GET 结果，支持 TTL 过期、LRU 淘汰和按前缀失效
+
+    generation 在每次失效时递增：发起读取前记下 generation，只有期间没有发生失效时
+    才写入结果，避免修改操作之前发出的读取把旧数据放回缓存。
+    """
+
+    def __init__(self, max_entries: int = 256, clock: Callable[[], float] = time.monotonic):
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self.generation = 0
+
+        # 统计信息
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """读取缓存，未命中或已过期时返回 None"""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, value = entry
+        if self._clock() >= expires_at:
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: float, generation: Optional[int] = None) -> bool:
+        """写入缓存；generation 与当前不一致时放弃写入"""
+        if ttl <= 0 or self.max_entries <= 0:
+            return False
+        if generation is not None and generation != self.generation:
+            return False
+
+        self._entries[key] = (self._clock() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+        return True
+
+    def invalidate(self, prefixes: Optional[Iterable[str]] = None, keep: Iterable[str] = ()) -> int:
+        """失效端点以 prefixes 开头的条目（None 表示全部，keep 中的前缀除外）"""
+        prefixes = tuple(prefixes) if prefixes is not None else None
+        keep = tuple(keep)
+        self.generation += 1
+
+        removed = 0
+        for key in list(self._entries):
+            endpoint = key[0] if isinstance(key, tuple) else str(key)
+            if keep and endpoint.startswith(keep):
+                continue
+            if prefixes is None or endpoint.startswith(prefixes):
+                del self._entries[key]
+                removed += 1
+
+        self.invalidations += removed
+        return removed
+
+    def invalidate_for_mutation(self, method: str, endpoint: str) -> int:
+        """根据修改请求失效受影响的条目"""
+        if method.upper() == "GET" or endpoint.startswith(READ_ONLY_PREFIXES):
+            return 0
+        if endpoint.startswith(BROAD_MUTATION_PREFIXES):
+            return self.invalidate(keep=STATIC_PREFIXES)
+        return self.invalidate(DESIGN_STATE_PREFIXES)
+
+    def invalidate_for_event(self, event_type: str) -> int:
+        """根据插件推送的事件失效受影响的条目"""
+        if event_type == "document":
+            return self.invalidate(keep=STATIC_PREFIXES)
+        if event_type in ("design", "timeline"):
+            return self.invalidate(DESIGN_STATE_PREFIXES)
+        return 0
+
+    def clear(self) -> None:
+        """清空缓存"""
+        self.invalidate()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取缓存统计信息"""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
+
+
+class ETagStore:
+    """保存 GET 响应的 ETag 与内容，收到 304 时复用已有内容
+
+    按 LRU 淘汰，同时受条目数和响应体总字节数限制（截图等原始字节响应可能很大）；
+    单个响应超过总字节数上限时不保存。
+    """
+
+    def __init__(self, max_entries: int = 128, max_bytes: int = 32 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Hashable, Tuple[str, Any, int]]" = OrderedDict()
+        self._bytes = 0
+
+        # 统计信息
+        self.not_modified = 0
+        self.stored = 0
+        self.skipped = 0
+
+    def get_etag(self, key: Hashable) -> Optional[str]:
+        """获取上次响应的 ETag，用于 If-None-Match"""
+        entry = self._entries.get(key)
+        return entry[0] if entry else None
+
+    def get_body(self, key: Hashable, etag: Optional[str] = None) -> Optional[Any]:
+        """收到 304 时取出已保存的内容；已被淘汰或 ETag 已不是 etag 时返回 None"""
+        entry = self._entries.get(key)
+        if entry is None or (etag is not None and entry[0] != etag):
+            return None
+        self._entries.move_to_end(key)
+        self.not_modified += 1
+        return entry[1]
+
+    def store(self, key: Hashable, etag: str, body: Any, size: int = 0) -> None:
+        """保存带 ETag 的响应内容，size 为响应体字节数"""
+        self._discard(key)
+        if self.max_entries <= 0 or size > self.max_bytes:
+            self.skipped += 1
+            return
+        self._entries[key] = (etag, body, size)
+        self._bytes += size
+        self.stored += 1
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            _, (_, _, evicted) = self._entries.popitem(last=False)
+            self._bytes -= evicted
+
+    def discard(self, key: Hashable) -> None:
+        """删除保存的 ETag 和内容"""
+        self._discard(key)
+
+    def _discard(self, key: Hashable) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[2]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取 ETag 统计信息"""
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "stored": self.stored,
+            "skipped": self.skipped,
+            "not_modified": self.not_modified,
+        }
@@ -0,0 +1,32 @@
+"""
+Fusion 360 变更日志工具
+"""
+
+import logging
+import urllib.parse
+from typing import Any, Dict, Union
+
+from .fusion360_api import get_api
+
+logger = logging.getLogger(__name__)
+
+
+async def get_changes(since: Union[int, str] = 0) -> Dict[str, Any]:
+    """获取设计版本号 since 之后创建、修改、删除的对象
+
+    返回的 revision_token（<epoch>:<版本号>）作为下次调用的 since：插件重新加载后
+    epoch 改变，插件会要求全量同步，而不是返回另一次加载的部分增量。
+    resync_required 为 True 时增量不完整，需要调用 get_objects 重新全量获取。
+    """
+    if isinstance(since, int) and since < 0:
+        raise ValueError("since 不能为负数")
+
+    api = get_api()
+
+    query = urllib.parse.urlencode({"since": since})
+    result = await api._request("GET", f"/api/changes?{query}")
+    if result.get("resync_required"):
+        logger.info(f"变更日志需要全量同步: {result.get('reason')}")
+    else:
+        logger.info(f"获取变更成功，共 {result.get('count', 0)} 项")
+    return result
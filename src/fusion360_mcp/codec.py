@@ -0,0 +1,185 @@
+"""
+与插件通信的消息编码
+
+默认使用 JSON。配置为 msgpack 时在 Accept 中优先请求 MessagePack，
+插件支持时按响应的 Content-Type 解码；确认插件支持后请求体也改用 MessagePack。
+msgpack 是可选依赖，未安装时始终使用 JSON。
+
+响应压缩（Accept-Encoding: gzip，安装 zstandard 时加上 zstd）：Fusion360API 读取原始
+响应体后在这里解压，统计传输字节数、压缩比和解压耗时。
+"""
+
+import gzip
+import importlib.util
+import json
+import logging
+import re
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+logger = logging.getLogger(__name__)
+
+
+def _accept_encoding() -> str:
+    # decompress 只在安装了 zstandard 时才能解压 zstd
+    return "zstd, gzip" if importlib.util.find_spec("zstandard") else "gzip"
+
+
+ACCEPT_ENCODING = _accept_encoding()
+
+JSON_TYPE = "application/json"
+MSGPACK_TYPE = "application/msgpack"
+
+_MSGPACK_ALIASES = (MSGPACK_TYPE, "application/x-msgpack", "application/vnd.msgpack")
+
+
+def media_type(content_type: Optional[str]) -> str:
+    """提取 MIME 类型并规范化，忽略参数"""
+    value = (content_type or "").split(";", 1)[0].strip().lower()
+    return MSGPACK_TYPE if value in _MSGPACK_ALIASES else value
+
+
+def encode(data: Any, content_type: str = JSON_TYPE) -> bytes:
+    """序列化请求体"""
+    if content_type == MSGPACK_TYPE:
+        packed: bytes = msgpack.packb(data, use_bin_type=True)
+        return packed
+    return json.dumps(data, ensure_ascii=False).encode("utf-8")
+
+
+def decode(body: bytes, content_type: Optional[str] = None) -> Any:
+    """按 Content-Type 解析响应体，缺省按 JSON 处理"""
+    if media_type(content_type) == MSGPACK_TYPE:
+        if msgpack is None:
+            raise ValueError("响应使用 MessagePack 编码，但未安装 msgpack")
+        return msgpack.unpackb(body, raw=False)
+    return json.loads(body)
+
+
+def decompress(body: bytes, encoding: Optional[str]) -> bytes:
+    """按 Content-Encoding 解压响应体"""
+    encoding = (encoding or "identity").strip().lower()
+    if encoding == "identity":
+        return body
+    if encoding == "gzip":
+        return gzip.decompress(body)
+    if encoding == "zstd":
+        import zstandard
+
+        # 流式压缩的帧头中可能没有内容大小，不能用 ZstdDecompressor.decompress
+        plain: bytes = zstandard.ZstdDecompressor().decompressobj().decompress(body)
+        return plain
+    raise ValueError(f"不支持的 Content-Encoding: {encoding}")
+
+
+def parse_multipart(body: bytes, content_type: str) -> List[Tuple[str, str, bytes]]:
+    """解析插件返回的 multipart/mixed 响应，返回 [(名称, Content-Type, 内容)]"""
+    match = re.search(r'boundary="?([^";]+)"?', content_type or "")
+    if not match:
+        raise ValueError(f"multipart 响应缺少 boundary: {content_type}")
+    delimiter = b"--" + match.group(1).encode("ascii")
+
+    parts = []
+    for section in body.split(delimiter)[1:]:
+        if section.startswith(b"--"):
+            break
+        head, _, content = section[2:].partition(b"\r\n\r\n")
+        headers = {}
+        for line in head.decode("utf-8").split("\r\n"):
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+        disposition = re.search(r'name="([^"]*)"', headers.get("content-disposition", ""))
+        parts.append((
+            disposition.group(1) if disposition else "",
+            headers.get("content-type", "application/octet-stream"),
+            content[:-2] if content.endswith(b"\r\n") else content
+        ))
+    return parts
+
+
+class Codec:
+    """一个插件连接的编码协商状态"""
+
+    def __init__(self, encoding: str = "json"):
+        if encoding == "msgpack" and msgpack is None:
+            logger.warning("未安装 msgpack，与插件通信改用 JSON")
+            encoding = "json"
+        self.encoding = encoding
+        # 收到过 MessagePack 响应后才用它编码请求体，旧版插件只能解析 JSON
+        self.peer_msgpack = False
+
+        # 压缩统计：Content-Encoding -> 响应数、传输字节数、解压后字节数、解压耗时（秒）
+        self._compression: Dict[str, Dict[str, Any]] = {}
+
+    @property
+    def accept(self) -> str:
+        if self.encoding == "msgpack":
+            return f"{MSGPACK_TYPE}, {JSON_TYPE};q=0.5"
+        return JSON_TYPE
+
+    @property
+    def request_type(self) -> str:
+        return MSGPACK_TYPE if self.peer_msgpack else JSON_TYPE
+
+    def decode_response(self, body: bytes, content_type: Optional[str]) -> Any:
+        result = decode(body, content_type)
+        if self.encoding == "msgpack" and media_type(content_type) == MSGPACK_TYPE:
+            self.peer_msgpack = True
+        return result
+
+    def error_text(self, body: bytes, content_type: Optional[str]) -> str:
+        """错误响应的可读文本"""
+        if media_type(content_type) == MSGPACK_TYPE and msgpack is not None:
+            try:
+                return json.dumps(decode(body, content_type), ensure_ascii=False)
+            except Exception:
+                pass
+        return body.decode("utf-8", errors="replace")
+
+    def decompress_response(self, response: httpx.Response, raw: Optional[bytes]) -> Tuple[bytes, int]:
+        """解压原始响应体，记录传输字节数、解压后字节数和解压耗时，返回 (响应体, 传输字节数)
+
+        raw 为 None 表示传输层返回的是已读取的响应（如 MockTransport），httpx 已经解压，
+        传输字节数改用 Content-Length，不记录解压耗时。
+        """
+        encoding = response.headers.get("Content-Encoding", "identity")
+        elapsed = 0.0
+        if raw is None:
+            body = response.content
+            wire_bytes = int(response.headers.get("Content-Length") or len(body))
+        else:
+            started = time.perf_counter()
+            try:
+                body = decompress(raw, encoding)
+            except Exception as e:
+                raise httpx.DecodingError(f"响应解压失败（{encoding}）: {e}", request=response.request)
+            elapsed = time.perf_counter() - started
+            wire_bytes = len(raw)
+
+        stats = self._compression.setdefault(
+            encoding, {"responses": 0, "wire_bytes": 0, "decoded_bytes": 0, "cpu_time": 0.0}
+        )
+        stats["responses"] += 1
+        stats["wire_bytes"] += wire_bytes
+        stats["decoded_bytes"] += len(body)
+        stats["cpu_time"] += elapsed
+        return body, wire_bytes
+
+    def get_compression_stats(self) -> Dict[str, Any]:
+        """获取压缩统计信息，ratio 为解压后与传输字节数之比，cpu_time 为解压耗时（秒）"""
+        return {
+            encoding: dict(
+                stats,
+                ratio=round(stats["decoded_bytes"] / stats["wire_bytes"], 2) if stats["wire_bytes"] else None,
+                cpu_time=round(stats["cpu_time"], 6)
+            )
+            for encoding, stats in self._compression.items()
+        }
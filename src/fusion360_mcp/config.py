@@ -3,7 +3,7 @@
 """
 
 import os
-from typing import Optional
+from typing import Dict, Literal, Optional
 from pydantic import BaseModel, Field
 
 
@@ -17,7 +17,57 @@ class Settings(BaseModel):
 
     # Fusion 360 配置
     fusion360_api_timeout: int = Field(default=30, description="Fusion 360 API 超时时间（秒）")
+    fusion360_connect_timeout: float = Field(default=2.0, description="连接 Fusion 360 插件的超时时间（秒）")
+    fusion360_transport: Literal["http", "framed"] = Field(
+        default="http",
+        description="与插件通信的传输方式：http，或 framed（持久 TCP 连接、请求 ID 复用，连接失败时回退到 HTTP）"
+    )
+    fusion360_framed_port: int = Field(default=9001, description="插件帧传输端口")
+    fusion360_uds_path: Optional[str] = Field(
+        default=None,
+        description="插件的 Unix 域套接字路径（如 /tmp/fusion360_mcp.sock），设置后 HTTP 请求经该套接字发送，不走 TCP 回环"
+    )
+    fusion360_encoding: Literal["json", "msgpack"] = Field(
+        default="json",
+        description="与插件通信的消息编码：json，或 msgpack（需要安装 msgpack，插件不支持时自动使用 JSON）"
+    )
+    fusion360_endpoint_timeouts: Dict[str, float] = Field(
+        default_factory=lambda: {
+            "/api/health": 2.0,
+            "/api/status": 5.0,
+            "/api/view": 60.0,
+            "/api/execute": 120.0,
+            "/api/batch": 300.0,
+        },
+        description="按端点前缀设置的读取超时（秒），未匹配的端点使用 fusion360_api_timeout"
+    )
     fusion360_max_retry: int = Field(default=3, description="Fusion 360 API 最大重试次数")
+    fusion360_retry_backoff_base: float = Field(default=0.2, description="重试退避基础时间（秒），每次翻倍")
+    fusion360_retry_backoff_max: float = Field(default=5.0, description="单次重试最大等待时间（秒）")
+    fusion360_circuit_failure_threshold: int = Field(default=5, description="连续连接失败多少次后打开熔断器")
+    fusion360_circuit_cooldown: float = Field(default=10.0, description="熔断器打开后的冷却时间（秒）")
+    fusion360_circuit_probe_timeout: float = Field(default=2.0, description="半开状态健康检查探测超时（秒）")
+    fusion360_singleflight_enabled: bool = Field(default=True, description="是否合并并发的相同 GET 请求")
+
+    # 读取缓存配置
+    fusion360_cache_enabled: bool = Field(default=True, description="是否缓存读取结果")
+    fusion360_cache_max_entries: int = Field(default=256, description="读取缓存最大条目数（LRU 淘汰）")
+    fusion360_cache_ttls: Dict[str, float] = Field(
+        default_factory=lambda: {
+            "/api/objects": 5.0,
+            "/api/object/": 5.0,
+            "/api/parts": 60.0,
+            "/api/list": 3600.0,
+        },
+        description="按端点前缀设置的缓存时间（秒），未列出的端点不缓存；修改操作会自动失效相关条目"
+    )
+    fusion360_etag_max_entries: int = Field(default=128, description="保存 ETag 响应内容的最大条目数，用于 304 复用")
+    fusion360_etag_max_bytes: int = Field(
+        default=32 * 1024 * 1024,
+        description="保存 ETag 响应内容的总字节数上限（截图等原始字节响应），超过时按 LRU 淘汰"
+    )
+    fusion360_events_enabled: bool = Field(default=True, description="订阅插件事件流（SSE），收到变化时失效缓存并通知 MCP 客户端")
+    fusion360_events_reconnect_max: float = Field(default=30.0, description="事件流断线重连的最大等待时间（秒）")
 
     # MCP 配置
     mcp_server_name: str = Field(default="fusion360_mcp", description="MCP 服务器名称")
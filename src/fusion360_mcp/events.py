@@ -0,0 +1,174 @@
+"""
+Fusion 360 插件事件流（Server-Sent Events）订阅
+"""
+
+import asyncio
+import inspect
+import json
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Union
+
+import httpx
+
+from .resilience import backoff_delay
+
+logger = logging.getLogger(__name__)
+
+
+# MCP 资源 URI
+STATUS_RESOURCE = "fusion360://design/status"
+OBJECTS_RESOURCE = "fusion360://design/objects"
+SELECTION_RESOURCE = "fusion360://selection"
+
+# 各类事件会使哪些资源发生变化
+EVENT_RESOURCES = {
+    "design": (OBJECTS_RESOURCE, STATUS_RESOURCE),
+    "document": (OBJECTS_RESOURCE, STATUS_RESOURCE),
+    "timeline": (OBJECTS_RESOURCE, STATUS_RESOURCE),
+    "selection": (SELECTION_RESOURCE,),
+}
+
+EventCallback = Callable[[Dict[str, Any]], Union[None, Awaitable[None]]]
+
+
+class SSEParser:
+    """逐行解析 SSE 流，遇到空行时产出一个事件"""
+
+    def __init__(self) -> None:
+        self._fields: Dict[str, str] = {}
+        self._data: List[str] = []
+
+    def feed(self, line: str) -> Optional[Dict[str, Any]]:
+        line = line.rstrip("\r\n")
+        if not line:
+            return self._dispatch()
+        if line.startswith(":"):
+            # 注释（心跳）
+            return None
+
+        name, _, value = line.partition(":")
+        value = value[1:] if value.startswith(" ") else value
+        if name == "data":
+            self._data.append(value)
+        else:
+            self._fields[name] = value
+        return None
+
+    def _dispatch(self) -> Optional[Dict[str, Any]]:
+        if not self._data:
+            self._fields = {}
+            return None
+
+        raw = "\n".join(self._data)
+        fields = self._fields
+        self._fields, self._data = {}, []
+        event: Dict[str, Any]
+        try:
+            event = json.loads(raw)
+        except ValueError:
+            event = {"data": raw}
+        if isinstance(event, dict):
+            event.setdefault("type", fields.get("event", "message"))
+            if "id" in fields:
+                event.setdefault("id", fields["id"])
+        return event
+
+
+class EventStream:
+    """订阅插件的 /api/events，断线后按退避时间自动重连
+
+    每个事件依次交给回调；重连成功时调用 on_reconnect，因为断开期间的事件已经丢失。
+    """
+
+    def __init__(
+        self,
+        client_factory: Callable[[], Awaitable[httpx.AsyncClient]],
+        url: str,
+        on_event: EventCallback,
+        on_reconnect: Optional[Callable[[], None]] = None,
+        connect_timeout: float = 2.0,
+        reconnect_base: float = 0.5,
+        reconnect_max: float = 30.0
+    ):
+        self._client_factory = client_factory
+        self.url = url
+        self._on_event = on_event
+        self._on_reconnect = on_reconnect
+        self.connect_timeout = connect_timeout
+        self.reconnect_base = reconnect_base
+        self.reconnect_max = reconnect_max
+        self._task: Optional[asyncio.Task] = None
+
+        # 统计信息
+        self.connected = False
+        self.connections = 0
+        self.events_received = 0
+        self.last_event_id: Optional[Any] = None
+
+    def start(self) -> None:
+        """在当前事件循环中开始订阅"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """停止订阅"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self.connected = False
+
+    async def _run(self) -> None:
+        attempt = 0
+        while True:
+            try:
+                await self._listen()
+                attempt = 0
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.debug(f"事件流连接断开: {e}")
+            self.connected = False
+
+            delay = backoff_delay(attempt, self.reconnect_base, self.reconnect_max)
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    async def _listen(self) -> None:
+        client = await self._client_factory()
+        timeout = httpx.Timeout(None, connect=self.connect_timeout)
+        async with client.stream("GET", self.url, timeout=timeout) as response:
+            response.raise_for_status()
+            self.connected = True
+            self.connections += 1
+            if self.connections > 1 and self._on_reconnect:
+                self._on_reconnect()
+
+            parser = SSEParser()
+            async for line in response.aiter_lines():
+                event = parser.feed(line)
+                if event is not None:
+                    await self._dispatch(event)
+
+    async def _dispatch(self, event: Dict[str, Any]) -> None:
+        self.events_received += 1
+        self.last_event_id = event.get("id")
+        try:
+            result = self._on_event(event)
+            if inspect.isawaitable(result):
+                await result
+        except Exception as e:
+            logger.error(f"处理插件事件失败: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取事件流统计信息"""
+        return {
+            "connected": self.connected,
+            "connections": self.connections,
+            "events_received": self.events_received,
+            "last_event_id": self.last_event_id,
+        }
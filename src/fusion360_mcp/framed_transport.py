@@ -0,0 +1,211 @@
+"""
+Fusion 360 插件长度前缀帧传输
+
+以 httpx 传输层的形式实现：上层的重试、熔断、超时和缓存逻辑保持不变，
+请求通过一条持久 TCP 连接发送，每个请求带有 ID，多个请求可以同时在途，
+响应可以乱序返回。连接不上帧端口时回退到 HTTP。
+
+帧格式与插件 framed.py 一致：4 字节总长度 + 4 字节头部长度 + 头部 JSON + 消息体。
+"""
+
+import asyncio
+import json
+import logging
+import struct
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+
+FRAME_PREFIX = struct.Struct(">II")
+
+# 流式响应（SSE）只能走 HTTP
+HTTP_ONLY_PATHS = ("/api/events",)
+
+# 不需要转发给插件的请求头
+SKIPPED_HEADERS = frozenset({"host", "connection", "user-agent", "content-length", "accept-encoding"})
+
+
+def encode_frame(header: Dict[str, Any], body: bytes = b"") -> bytes:
+    """编码一帧"""
+    header_bytes = json.dumps(header, ensure_ascii=False).encode("utf-8")
+    return FRAME_PREFIX.pack(len(header_bytes) + len(body), len(header_bytes)) + header_bytes + body
+
+
+class FramedConnection:
+    """一条帧协议连接，按请求 ID 匹配响应"""
+
+    def __init__(self, host: str, port: int):
+        self.host = host
+        self.port = port
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._read_task: Optional[asyncio.Task] = None
+        self._write_lock = asyncio.Lock()
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._next_id = 1
+        self.closed = True
+
+    async def connect(self, timeout: Optional[float] = None) -> None:
+        reader, self._writer = await asyncio.wait_for(
+            asyncio.open_connection(self.host, self.port), timeout
+        )
+        self._reader = reader
+        self.closed = False
+        self._read_task = asyncio.create_task(self._read_loop(reader))
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._pending)
+
+    async def request(
+        self,
+        header: Dict[str, Any],
+        body: bytes,
+        timeout: Optional[float] = None
+    ) -> Tuple[Dict[str, Any], bytes]:
+        """发送请求并等待对应 ID 的响应"""
+        if self.closed or self._writer is None:
+            raise ConnectionError("帧连接已关闭")
+
+        request_id = self._next_id
+        self._next_id += 1
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        try:
+            async with self._write_lock:
+                self._writer.write(encode_frame(dict(header, id=request_id), body))
+                await self._writer.drain()
+            return await asyncio.wait_for(future, timeout)
+        finally:
+            self._pending.pop(request_id, None)
+
+    async def _read_loop(self, reader: asyncio.StreamReader) -> None:
+        error: Exception = ConnectionError("帧连接已关闭")
+        try:
+            while True:
+                total, header_size = FRAME_PREFIX.unpack(await reader.readexactly(FRAME_PREFIX.size))
+                payload = await reader.readexactly(total)
+                header = json.loads(payload[:header_size].decode("utf-8"))
+                future = self._pending.get(header.get("id"))
+                # 已超时被放弃的请求，响应直接丢弃
+                if future and not future.done():
+                    future.set_result((header, payload[header_size:]))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            error = ConnectionError(f"帧连接断开: {e}")
+        finally:
+            self.closed = True
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(error)
+
+    async def close(self) -> None:
+        self.closed = True
+        if self._read_task:
+            self._read_task.cancel()
+            try:
+                await self._read_task
+            except (asyncio.CancelledError, Exception):
+                pass
+        if self._writer:
+            self._writer.close()
+
+
+class FramedTransport(httpx.AsyncBaseTransport):
+    """通过帧协议连接发送请求的 httpx 传输层
+
+    连接帧端口失败后，在 retry_after 秒内改用 fallback（HTTP）传输。
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        fallback: httpx.AsyncBaseTransport,
+        retry_after: float = 30.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.host = host
+        self.port = port
+        self.fallback = fallback
+        self.retry_after = retry_after
+        self._clock = clock
+        self._connection: Optional[FramedConnection] = None
+        self._connect_lock = asyncio.Lock()
+        self._fallback_until = 0.0
+
+        # 统计信息
+        self.framed_requests = 0
+        self.fallback_requests = 0
+        self.connects = 0
+
+    async def _get_connection(self, timeout: Optional[float]) -> FramedConnection:
+        async with self._connect_lock:
+            if self._connection is None or self._connection.closed:
+                connection = FramedConnection(self.host, self.port)
+                await connection.connect(timeout)
+                self._connection = connection
+                self.connects += 1
+            return self._connection
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if request.url.path in HTTP_ONLY_PATHS or self._clock() < self._fallback_until:
+            self.fallback_requests += 1
+            return await self.fallback.handle_async_request(request)
+
+        timeouts = request.extensions.get("timeout", {})
+        try:
+            connection = await self._get_connection(timeouts.get("connect"))
+        except (OSError, asyncio.TimeoutError) as e:
+            logger.warning(f"无法连接帧传输端口 {self.port}，{self.retry_after} 秒内改用 HTTP: {e}")
+            self._fallback_until = self._clock() + self.retry_after
+            self.fallback_requests += 1
+            return await self.fallback.handle_async_request(request)
+
+        header = {
+            "method": request.method,
+            "path": request.url.raw_path.decode("ascii"),
+            "headers": {
+                name: value for name, value in request.headers.items()
+                if name not in SKIPPED_HEADERS
+            }
+        }
+        body = await request.aread()
+
+        self.framed_requests += 1
+        try:
+            response_header, response_body = await connection.request(header, body, timeouts.get("read"))
+        except asyncio.TimeoutError:
+            raise httpx.ReadTimeout("等待帧响应超时", request=request)
+        except (ConnectionError, OSError) as e:
+            raise httpx.ReadError(str(e), request=request)
+
+        # 以 stream 传入，响应体保持原始（压缩的）字节，由调用方读取和解压
+        return httpx.Response(
+            status_code=response_header.get("status", 500),
+            headers=response_header.get("headers") or {},
+            stream=httpx.ByteStream(response_body),
+            request=request
+        )
+
+    async def aclose(self) -> None:
+        if self._connection:
+            await self._connection.close()
+        await self.fallback.aclose()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取帧传输统计信息"""
+        connection = self._connection
+        return {
+            "type": "framed",
+            "connected": bool(connection and not connection.closed),
+            "in_flight": connection.in_flight if connection else 0,
+            "connects": self.connects,
+            "framed_requests": self.framed_requests,
+            "fallback_requests": self.fallback_requests,
+        }
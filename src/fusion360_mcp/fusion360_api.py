@@ -2,57 +2,425 @@
 Fusion 360 API 基础客户端
 """
 
+import asyncio
+import json
 import logging
-from typing import Any, Dict, Optional
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterator, Optional, Tuple
 
 import httpx
 
+from .cache import STATIC_PREFIXES, ETagStore, ResponseCache, is_success
+from . import codec
+from .codec import Codec
 from .config import get_settings
+from .events import EventCallback, EventStream
+from .framed_transport import FramedTransport
+from .metrics import ClientMetrics
+from .resilience import (
+    IDEMPOTENT_METHODS, REJECTED_STATUS_CODES, RETRYABLE_STATUS_CODES,
+    CircuitBreaker, CircuitOpenError, DeadlineExceededError, backoff_delay, parse_retry_after
+)
 
 
 logger = logging.getLogger(__name__)
 
 
+# 插件据此丢弃客户端已经放弃等待的排队任务
+REQUEST_TIMEOUT_HEADER = "X-Request-Timeout"
+
+# 当前调用的截止时间（time.monotonic() 时间点），由 request_deadline 设置
+_request_deadline: ContextVar[Optional[float]] = ContextVar("fusion360_request_deadline", default=None)
+
+
+@contextmanager
+def request_deadline(seconds: Optional[float]) -> Iterator[None]:
+    """在此上下文中发出的所有 Fusion 360 请求共享一个截止时间（秒，从现在起算）"""
+    if seconds is None:
+        yield
+        return
+
+    deadline = time.monotonic() + seconds
+    current = _request_deadline.get()
+    if current is not None:
+        deadline = min(deadline, current)
+
+    token = _request_deadline.set(deadline)
+    try:
+        yield
+    finally:
+        _request_deadline.reset(token)
+
+
+class SingleFlight:
+    """合并并发的相同请求
+
+    同一个 key 同时只有一个请求在进行，其余调用等待并共享它的结果（或异常）。
+    共享的结果是同一个对象，调用方不应修改。
+    """
+
+    def __init__(self) -> None:
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+
+        # 统计信息
+        self.executed = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            task = asyncio.ensure_future(func())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+            self.executed += 1
+
+        # shield: 某个等待方被取消时不影响共享的请求
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Future) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取合并统计信息"""
+        return {
+            "in_flight": len(self._inflight),
+            "executed": self.executed,
+            "coalesced": self.coalesced,
+        }
+
+
 class Fusion360API:
     """Fusion 360 API 客户端"""
 
-    def __init__(self):
+    def __init__(self) -> None:
         self.settings = get_settings()
-        self.client = None
+        self.client: Optional[httpx.AsyncClient] = None
+        self.transport: Optional[FramedTransport] = None
         self.base_url = "http://localhost:9000"  # Fusion 360 插件服务地址
+        self.breaker = CircuitBreaker(
+            failure_threshold=self.settings.fusion360_circuit_failure_threshold,
+            cooldown=self.settings.fusion360_circuit_cooldown
+        )
+        self._probe_lock = asyncio.Lock()
+        self.singleflight = SingleFlight()
+        self.cache = ResponseCache(max_entries=self.settings.fusion360_cache_max_entries)
+        self.etags = ETagStore(
+            max_entries=self.settings.fusion360_etag_max_entries,
+            max_bytes=self.settings.fusion360_etag_max_bytes
+        )
+        self.codec = Codec(self.settings.fusion360_encoding)
+        self.metrics = ClientMetrics()
+        self.events: Optional[EventStream] = None
+        self.last_selection: Dict[str, Any] = {}
 
     async def _get_client(self) -> httpx.AsyncClient:
         """获取 HTTP 客户端"""
         if self.client is None:
+            limits = httpx.Limits(max_connections=10, max_keepalive_connections=5)
+            # 设置了 Unix 域套接字时 HTTP 经套接字发送，base_url 中的主机和端口只用于构造请求
+            http_transport = httpx.AsyncHTTPTransport(limits=limits, uds=self.settings.fusion360_uds_path)
+            if self.settings.fusion360_transport == "framed":
+                self.transport = FramedTransport(
+                    httpx.URL(self.base_url).host,
+                    self.settings.fusion360_framed_port,
+                    fallback=http_transport
+                )
             self.client = httpx.AsyncClient(
-                timeout=self.settings.fusion360_api_timeout,
-                limits=httpx.Limits(max_connections=10, max_keepalive_connections=5)
+                timeout=httpx.Timeout(
+                    self.settings.fusion360_api_timeout,
+                    connect=self.settings.fusion360_connect_timeout
+                ),
+                transport=self.transport or http_transport
             )
         return self.client
 
     async def _request(self, method: str, endpoint: str, data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-        """发送请求到 Fusion 360 插件"""
+        """发送请求到 Fusion 360 插件
+
+        GET 请求先查读取缓存（只缓存成功的结果），并发的相同 GET 请求合并为一次；
+        其他请求完成后（无论成功与否）失效受影响的缓存条目。合并键包含缓存的 generation，
+        修改完成后发起的读取不会加入修改之前就在途的请求。
+        每次调用的耗时和结果（ok/cache/error）按路由记录到 metrics。
+        """
+        with self.metrics.track(method, endpoint) as observation:
+            if method.upper() != "GET":
+                try:
+                    return await self._send_request(method, endpoint, data)
+                finally:
+                    self.cache.invalidate_for_mutation(method, endpoint)
+
+            key = self._cache_key(endpoint, data)
+            ttl = self._get_cache_ttl(endpoint)
+            if ttl:
+                cached: Optional[Dict[str, Any]] = self.cache.get(key)
+                if cached is not None:
+                    observation.outcome = "cache"
+                    return cached
+
+            generation = self.cache.generation
+            result: Dict[str, Any]
+            if self.settings.fusion360_singleflight_enabled:
+                result = await self.singleflight.do(
+                    (key, generation), lambda: self._send_request(method, endpoint, data)
+                )
+            else:
+                result = await self._send_request(method, endpoint, data)
+
+            if ttl and is_success(result):
+                self.cache.set(key, result, ttl, generation=generation)
+            return result
+
+    async def _request_raw(self, endpoint: str) -> Tuple[bytes, str]:
+        """GET 原始字节响应（如截图），返回 (内容, Content-Type)，不经过 JSON 解码"""
+        with self.metrics.track("GET", endpoint):
+            result = await self._send_request("GET", endpoint, raw=True)
+        return result["data"], result["mime_type"]
+
+    @staticmethod
+    def _cache_key(endpoint: str, data: Optional[Dict[str, Any]]) -> Hashable:
+        """缓存键：端点 + 规范化的请求体"""
+        return (endpoint, json.dumps(data, sort_keys=True, default=str) if data else "")
+
+    def _get_cache_ttl(self, endpoint: str) -> float:
+        """按端点前缀查找缓存时间，0 表示不缓存"""
+        if not self.settings.fusion360_cache_enabled:
+            return 0.0
+
+        ttl, matched = 0.0, ""
+        for prefix, value in self.settings.fusion360_cache_ttls.items():
+            if endpoint.startswith(prefix) and len(prefix) > len(matched):
+                matched, ttl = prefix, value
+        return ttl
+
+    async def _send_request(
+        self,
+        method: str,
+        endpoint: str,
+        data: Optional[Dict[str, Any]] = None,
+        raw: bool = False
+    ) -> Dict[str, Any]:
+        """发送单个请求
+
+        幂等方法在传输错误时按指数退避重试；插件明确拒绝（429/503）或连接未建立时
+        任何方法都会重试。连续连接失败会打开熔断器，冷却期内直接失败。
+        每次尝试的读取超时取端点超时与 request_deadline 剩余时间中的较小者。
+        GET 请求携带上次的 ETag，插件返回 304 时复用已保存的内容；保存的内容在请求期间
+        被淘汰时，不带 If-None-Match 立即重新请求一次。
+        请求体和响应体的编码见 Codec（默认 JSON，可协商 MessagePack）。
+        raw 为 True 时不解码响应体，返回 {"data": 字节, "mime_type": Content-Type}。
+        """
         client = await self._get_client()
         url = f"{self.base_url}{endpoint}"
+        method = method.upper()
+        max_retry = self.settings.fusion360_max_retry
+        deadline = _request_deadline.get()
+        etag_key = self._cache_key(endpoint, data) if method == "GET" else None
+
+        await self._check_circuit(client)
+
+        attempt = 0
+        use_etag = etag_key is not None
+        while True:
+            retry_after = None
+            timeout = self._get_timeout(endpoint, deadline)
+            headers = {
+                "Accept": self.codec.accept,
+                "Accept-Encoding": codec.ACCEPT_ENCODING,
+                REQUEST_TIMEOUT_HEADER: f"{timeout.read:.3f}"
+            }
+            content = None
+            if data is not None:
+                headers["Content-Type"] = self.codec.request_type
+                content = codec.encode(data, self.codec.request_type)
+            etag = self.etags.get_etag(etag_key) if use_etag else None
+            if etag:
+                headers["If-None-Match"] = etag
+            try:
+                # 读取原始字节后由 codec 解压，以便统计解压耗时
+                response = await client.send(
+                    client.build_request(method=method, url=url, content=content, headers=headers, timeout=timeout),
+                    stream=True
+                )
+                try:
+                    raw_body = None if response.is_stream_consumed else b"".join(
+                        [chunk async for chunk in response.aiter_raw()]
+                    )
+                finally:
+                    await response.aclose()
+                self.breaker.record_success()
+                if response.status_code == 304 and etag:
+                    self.metrics.observe_transfer(method, endpoint, len(content or b""), 0)
+                    stored: Optional[Dict[str, Any]] = self.etags.get_body(etag_key, etag)
+                    if stored is not None:
+                        return stored
+                    self.etags.discard(etag_key)
+                    use_etag = False
+                    continue
+                body, wire_bytes = self.codec.decompress_response(response, raw_body)
+                response.raise_for_status()
+                self.metrics.observe_transfer(method, endpoint, len(content or b""), wire_bytes)
+                if raw:
+                    result = {
+                        "data": body,
+                        "mime_type": response.headers.get("Content-Type", "application/octet-stream")
+                    }
+                else:
+                    result = self.codec.decode_response(body, response.headers.get("Content-Type"))
+                if etag_key and response.headers.get("ETag"):
+                    self.etags.store(etag_key, response.headers["ETag"], result, len(body))
+                return result
+            except httpx.RequestError as e:
+                # 连接未建立时请求肯定没有被执行，非幂等方法也可以重试
+                connect_failed = isinstance(e, (httpx.ConnectError, httpx.ConnectTimeout))
+                if connect_failed:
+                    self.breaker.record_failure()
+                retryable = connect_failed or method in IDEMPOTENT_METHODS
+                if not retryable or attempt >= max_retry or self.breaker.state != CircuitBreaker.CLOSED:
+                    logger.error(f"请求 Fusion 360 API 失败: {e}")
+                    raise Exception(f"无法连接到 Fusion 360: {e}")
+                reason = str(e) or type(e).__name__
+            except httpx.HTTPStatusError as e:
+                status = e.response.status_code
+                error_text = self.codec.error_text(body, e.response.headers.get("Content-Type"))
+                retryable = status in REJECTED_STATUS_CODES or (
+                    method in IDEMPOTENT_METHODS and status in RETRYABLE_STATUS_CODES
+                )
+                if not retryable or attempt >= max_retry:
+                    logger.error(f"Fusion 360 API 返回错误: {status} - {error_text}")
+                    raise Exception(f"Fusion 360 操作失败: {error_text}")
+                retry_after = parse_retry_after(e.response.headers.get("Retry-After"))
+                reason = f"HTTP {status}"
+
+            delay = backoff_delay(
+                attempt,
+                self.settings.fusion360_retry_backoff_base,
+                self.settings.fusion360_retry_backoff_max,
+                retry_after
+            )
+            if deadline is not None and time.monotonic() + delay >= deadline:
+                logger.error(f"{method} {endpoint} 失败 ({reason})，剩余时间不足以重试")
+                raise DeadlineExceededError(f"Fusion 360 请求超过截止时间: {reason}")
+            attempt += 1
+            self.metrics.observe_retry(method, endpoint)
+            logger.warning(f"{method} {endpoint} 失败 ({reason})，{delay:.2f} 秒后第 {attempt} 次重试")
+            await asyncio.sleep(delay)
+
+    def _get_timeout(self, endpoint: str, deadline: Optional[float] = None) -> httpx.Timeout:
+        """按端点前缀选择读取超时，并受截止时间约束"""
+        read_timeout = float(self.settings.fusion360_api_timeout)
+        matched = ""
+        for prefix, value in self.settings.fusion360_endpoint_timeouts.items():
+            if endpoint.startswith(prefix) and len(prefix) > len(matched):
+                matched, read_timeout = prefix, value
+
+        if deadline is not None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise DeadlineExceededError(f"Fusion 360 请求超过截止时间: {endpoint}")
+            read_timeout = min(read_timeout, remaining)
+
+        return httpx.Timeout(read_timeout, connect=min(self.settings.fusion360_connect_timeout, read_timeout))
+
+    async def _check_circuit(self, client: httpx.AsyncClient) -> None:
+        """熔断检查：打开时快速失败，半开时用健康检查探测一次"""
+        state = self.breaker.state
+        if state == CircuitBreaker.CLOSED:
+            return
 
-        try:
-            response = await client.request(
-                method=method,
-                url=url,
-                json=data,
-                headers={"Content-Type": "application/json"}
+        if state == CircuitBreaker.OPEN:
+            self.breaker.rejected += 1
+            raise CircuitOpenError(
+                f"无法连接到 Fusion 360: 连接熔断中，{self.breaker.remaining_cooldown():.1f} 秒后重试"
             )
-            response.raise_for_status()
-            return response.json()
-        except httpx.RequestError as e:
-            logger.error(f"请求 Fusion 360 API 失败: {e}")
-            raise Exception(f"无法连接到 Fusion 360: {e}")
-        except httpx.HTTPStatusError as e:
-            logger.error(f"Fusion 360 API 返回错误: {e.response.status_code} - {e.response.text}")
-            raise Exception(f"Fusion 360 操作失败: {e.response.text}")
-
-    async def close(self):
+
+        async with self._probe_lock:
+            # 等锁期间其他调用方可能已经完成探测
+            if self.breaker.state != CircuitBreaker.HALF_OPEN:
+                return await self._check_circuit(client)
+
+            try:
+                response = await client.get(
+                    f"{self.base_url}/api/health",
+                    timeout=self.settings.fusion360_circuit_probe_timeout
+                )
+                response.raise_for_status()
+            except httpx.HTTPError as e:
+                self.breaker.trip()
+                self.breaker.rejected += 1
+                logger.warning(f"Fusion 360 健康检查探测失败，熔断器重新打开: {e}")
+                raise CircuitOpenError(f"无法连接到 Fusion 360: 健康检查探测失败: {e}")
+
+            self.breaker.record_success()
+            logger.info("Fusion 360 健康检查探测成功，熔断器关闭")
+
+    def start_event_stream(self, on_event: Optional[EventCallback] = None) -> Optional[EventStream]:
+        """订阅插件事件流（只订阅一次），on_event 在缓存失效之后调用"""
+        if not self.settings.fusion360_events_enabled:
+            return None
+        if self.events is None:
+            async def dispatch(event: Dict[str, Any]) -> None:
+                self.handle_event(event)
+                if on_event:
+                    result = on_event(event)
+                    if asyncio.iscoroutine(result):
+                        await result
+
+            self.events = EventStream(
+                self._get_client,
+                f"{self.base_url}/api/events",
+                on_event=dispatch,
+                on_reconnect=self._on_event_stream_reconnect,
+                connect_timeout=self.settings.fusion360_connect_timeout,
+                reconnect_base=self.settings.fusion360_retry_backoff_base,
+                reconnect_max=self.settings.fusion360_events_reconnect_max
+            )
+        self.events.start()
+        return self.events
+
+    async def stop_event_stream(self) -> None:
+        """停止订阅插件事件流"""
+        if self.events:
+            await self.events.stop()
+
+    def handle_event(self, event: Dict[str, Any]) -> None:
+        """处理插件推送的事件：失效受影响的缓存"""
+        event_type = str(event.get("type", ""))
+        removed = self.cache.invalidate_for_event(event_type)
+        if event_type == "selection":
+            self.last_selection = event.get("data", {})
+        logger.debug(f"收到插件事件 {event_type}，失效缓存 {removed} 条")
+
+    def _on_event_stream_reconnect(self) -> None:
+        # 断线期间的事件已丢失，除静态内容外全部失效
+        self.cache.invalidate(keep=STATIC_PREFIXES)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取客户端统计信息"""
+        return {
+            "cache": self.cache.get_stats(),
+            "etag": self.etags.get_stats(),
+            "singleflight": self.singleflight.get_stats(),
+            "circuit_breaker": self.breaker.get_stats(),
+            "events": self.events.get_stats() if self.events else None,
+            "transport": self.transport.get_stats() if self.transport else {
+                "type": "uds" if self.settings.fusion360_uds_path else "http",
+            },
+            "encoding": {
+                "preferred": self.codec.encoding,
+                "request": self.codec.request_type,
+                "compression": self.codec.get_compression_stats(),
+            },
+            "requests": self.metrics.get_stats(),
+        }
+
+    async def close(self) -> None:
         """关闭客户端"""
+        await self.stop_event_stream()
         if self.client:
             await self.client.aclose()
 
@@ -87,29 +87,87 @@ def print_tools_help():
                 {"name": "target_position", "type": "list", "description": "目标位置 [x,y,z]", "optional": True},
                 {"name": "format", "type": "str", "description": "图片格式", "optional": True, "default": "png"},
                 {"name": "width", "type": "int", "description": "图片宽度", "optional": True, "default": "1920"},
-                {"name": "height", "type": "int", "description": "图片高度", "optional": True, "default": "1080"}
+                {"name": "height", "type": "int", "description": "图片高度", "optional": True, "default": "1080"},
+                {"name": "raw", "type": "bool", "description": "直接返回图片内容（不经过 base64 JSON）", "optional": True, "default": "False"},
+                {"name": "quality", "type": "str", "description": "质量预设（preview: 低分辨率快速预览 / final: 全尺寸全效果）", "optional": True, "default": "final"}
             ],
             "example": 'get_view(width=800, height=600)'
         },
+        {
+            "name": "get_views",
+            "description": "一次调用按多个相机预设截图（分别返回或拼接为网格图）",
+            "parameters": [
+                {"name": "presets", "type": "list", "description": "相机预设（front/back/top/bottom/left/right/iso 等）", "optional": True, "default": "[front, top, right, iso]"},
+                {"name": "format", "type": "str", "description": "图片格式", "optional": True, "default": "png"},
+                {"name": "width", "type": "int", "description": "每张图片宽度", "optional": True, "default": "800"},
+                {"name": "height", "type": "int", "description": "每张图片高度", "optional": True, "default": "600"},
+                {"name": "quality", "type": "str", "description": "质量预设（preview/final）", "optional": True, "default": "final"},
+                {"name": "layout", "type": "str", "description": "separate: 分别返回 / sheet: 拼接为网格图（需要 Pillow）", "optional": True, "default": "separate"}
+            ],
+            "example": 'get_views(["front", "top", "iso"], layout="sheet")'
+        },
         {
             "name": "get_objects",
-            "description": "获取文档中的所有对象",
-            "parameters": [],
-            "example": 'get_objects()'
+            "description": "分页获取文档中的对象（包括所有子装配）",
+            "parameters": [
+                {"name": "page_size", "type": "int", "description": "每页数量（默认50，最大500）", "optional": True},
+                {"name": "cursor", "type": "str", "description": "上一页返回的 next_cursor", "optional": True},
+                {"name": "object_type", "type": "str", "description": "对象类型（body/occurrence）", "optional": True},
+                {"name": "name", "type": "str", "description": "名称通配符", "optional": True},
+                {"name": "visible", "type": "bool", "description": "按可见性过滤", "optional": True},
+                {"name": "component", "type": "str", "description": "组件路径通配符", "optional": True},
+                {"name": "fields", "type": "List[str]", "description": "只返回的字段（bounding_box、physical_properties 需显式请求）", "optional": True}
+            ],
+            "example": 'get_objects(page_size=100, name="Bolt*")'
         },
         {
             "name": "get_object",
             "description": "获取文档中的特定对象",
             "parameters": [
-                {"name": "object_id", "type": "str", "description": "对象ID", "optional": False}
+                {"name": "object_id", "type": "str", "description": "对象ID", "optional": False},
+                {"name": "fields", "type": "List[str]", "description": "只返回的字段（bounding_box、physical_properties 需显式请求）", "optional": True}
             ],
-            "example": 'get_object("obj_123")'
+            "example": 'get_object("obj_123", fields=["id", "bounding_box"])'
         },
         {
             "name": "get_parts_list",
             "description": "获取零件库中的零件列表",
             "parameters": [],
             "example": 'get_parts_list()'
+        },
+        {
+            "name": "batch_operations",
+            "description": "在一次往返中按顺序执行多个操作，可用 ${ref.字段} 引用前面的结果",
+            "parameters": [
+                {"name": "operations", "type": "list", "description": "操作列表 [{action, parameters, ref}]", "optional": False},
+                {"name": "mode", "type": "str", "description": "stop_on_error 或 continue", "optional": True, "default": "stop_on_error"},
+                {"name": "transaction", "type": "bool", "description": "整批在时间线事务中执行，失败时整批回滚", "optional": True, "default": "False"}
+            ],
+            "example": 'batch_operations([{"action": "create_object", "parameters": {...}, "ref": "cyl"}])'
+        },
+        {
+            "name": "transaction",
+            "description": "控制时间线事务，事务中有失败的修改时整体回滚",
+            "parameters": [
+                {"name": "action", "type": "str", "description": "begin / commit / rollback / status", "optional": False}
+            ],
+            "example": 'transaction("begin")'
+        },
+        {
+            "name": "get_changes",
+            "description": "获取某个设计版本号之后创建、修改、删除的对象",
+            "parameters": [
+                {"name": "since", "type": "int | str", "description": "上次返回的 revision_token（旧的整数 revision 也可用）", "optional": True, "default": "0"}
+            ],
+            "example": 'get_changes(since="3f2a...:12")'
+        },
+        {
+            "name": "get_metrics",
+            "description": "获取按路由统计的请求次数、错误和耗时（MCP 服务器端和插件端）",
+            "parameters": [
+                {"name": "format", "type": "str", "description": "summary 或 prometheus", "optional": True, "default": "summary"}
+            ],
+            "example": 'get_metrics(format="prometheus")'
         }
     ]
 
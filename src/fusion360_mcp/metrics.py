@@ -0,0 +1,170 @@
+"""
+MCP 服务器端的插件请求指标
+
+与插件的 /api/metrics 对应：按方法和路由统计 Fusion360API._request 的调用次数、
+结果（ok：请求插件成功，cache：读取缓存命中，error：失败）、耗时、重试次数
+和请求/响应体大小，直方图使用固定的桶，可输出 Prometheus 文本格式。
+"""
+
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Sequence, Tuple
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# 秒
+DURATION_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+# 字节
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+HISTOGRAM_HELP = {
+    "request_duration_seconds": "Fusion360API._request 耗时（秒），包括排队、重试和退避",
+    "request_size_bytes": "发送给插件的请求体大小（字节）",
+    "response_size_bytes": "插件响应体传输大小（字节，压缩后）",
+}
+
+ROUTE_PREFIXES = ("/api/object/",)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def route_label(endpoint: str) -> str:
+    """去掉查询参数，把 /api/object/<id> 归并为 /api/object/{id}"""
+    path = endpoint.split("?", 1)[0]
+    for prefix in ROUTE_PREFIXES:
+        if path.startswith(prefix) and len(path) > len(prefix):
+            return prefix + "{id}"
+    return path
+
+
+class Histogram:
+    """固定桶直方图"""
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.sum += value
+        self.count += 1
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[index] += 1
+                break
+
+    def cumulative(self) -> Iterator[Tuple[float, int]]:
+        total = 0
+        for bound, count in zip(self.buckets, self.counts):
+            total += count
+            yield bound, total
+
+
+class Observation:
+    """一次请求的观测结果，调用方可以修改 outcome"""
+
+    def __init__(self) -> None:
+        self.outcome = "ok"
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: Labels) -> str:
+    return ",".join(f'{name}="{_escape(value)}"' for name, value in labels)
+
+
+class ClientMetrics:
+    """插件请求指标（只在事件循环线程中更新，不加锁）"""
+
+    def __init__(self, prefix: str = "fusion360_mcp_client"):
+        self.prefix = prefix
+        self._requests: Dict[Tuple[str, str, str], int] = {}  # (方法, 路由, 结果) -> 次数
+        self._retries: Dict[Tuple[str, str], int] = {}
+        self._histograms: Dict[Tuple[str, Labels], Histogram] = {}
+
+    def _histogram(self, name: str, labels: Labels, buckets: Sequence[float]) -> Histogram:
+        key = (name, labels)
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            histogram = self._histograms[key] = Histogram(buckets)
+        return histogram
+
+    @contextmanager
+    def track(self, method: str, endpoint: str) -> Iterator[Observation]:
+        """记录一次调用的耗时和结果，抛出异常时结果为 error"""
+        observation = Observation()
+        started = time.perf_counter()
+        try:
+            yield observation
+        except BaseException:
+            observation.outcome = "error"
+            raise
+        finally:
+            self.observe_request(
+                method.upper(), route_label(endpoint), observation.outcome, time.perf_counter() - started
+            )
+
+    def observe_request(self, method: str, route: str, outcome: str, seconds: float) -> None:
+        key = (method, route, outcome)
+        self._requests[key] = self._requests.get(key, 0) + 1
+        labels = (("method", method), ("route", route))
+        self._histogram("request_duration_seconds", labels, DURATION_BUCKETS).observe(seconds)
+
+    def observe_transfer(self, method: str, endpoint: str, request_bytes: int, response_bytes: int) -> None:
+        """记录一次发送到插件的请求体和收到的响应体大小"""
+        labels = (("method", method.upper()), ("route", route_label(endpoint)))
+        self._histogram("request_size_bytes", labels, SIZE_BUCKETS).observe(request_bytes)
+        self._histogram("response_size_bytes", labels, SIZE_BUCKETS).observe(response_bytes)
+
+    def observe_retry(self, method: str, endpoint: str) -> None:
+        key = (method.upper(), route_label(endpoint))
+        self._retries[key] = self._retries.get(key, 0) + 1
+
+    def render(self) -> str:
+        """输出 Prometheus 文本格式"""
+        lines: List[str] = []
+        name = f"{self.prefix}_requests_total"
+        lines.append(f"# HELP {name} 按方法、路由和结果（ok/cache/error）统计的请求数")
+        lines.append(f"# TYPE {name} counter")
+        for (method, route, outcome), count in sorted(self._requests.items()):
+            label_text = _format_labels((("method", method), ("route", route), ("outcome", outcome)))
+            lines.append(f"{name}{{{label_text}}} {count}")
+
+        name = f"{self.prefix}_retries_total"
+        lines.append(f"# HELP {name} 重试次数")
+        lines.append(f"# TYPE {name} counter")
+        for (method, route), count in sorted(self._retries.items()):
+            lines.append(f"{name}{{{_format_labels((('method', method), ('route', route)))}}} {count}")
+
+        by_name: Dict[str, List[Tuple[Labels, Histogram]]] = {}
+        for (metric, labels), histogram in self._histograms.items():
+            by_name.setdefault(metric, []).append((labels, histogram))
+        for metric in sorted(by_name):
+            name = f"{self.prefix}_{metric}"
+            lines.append(f"# HELP {name} {HISTOGRAM_HELP.get(metric, metric)}")
+            lines.append(f"# TYPE {name} histogram")
+            for labels, histogram in sorted(by_name[metric], key=lambda item: item[0]):
+                label_text = _format_labels(labels)
+                for bound, count in histogram.cumulative():
+                    lines.append(f'{name}_bucket{{{label_text},le="{float(bound)!r}"}} {count}')
+                lines.append(f'{name}_bucket{{{label_text},le="+Inf"}} {histogram.count}')
+                lines.append(f"{name}_sum{{{label_text}}} {float(histogram.sum)!r}")
+                lines.append(f"{name}_count{{{label_text}}} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """按方法和路由汇总各结果的次数、重试次数和平均耗时（毫秒）"""
+        stats: Dict[str, Dict[str, Any]] = {}
+        for (method, route, outcome), count in self._requests.items():
+            entry = stats.setdefault(f"{method} {route}", {})
+            entry[outcome] = count
+        for (method, route), count in self._retries.items():
+            stats.setdefault(f"{method} {route}", {})["retries"] = count
+        for (metric, labels), histogram in self._histograms.items():
+            if metric == "request_duration_seconds" and histogram.count:
+                entry = stats.setdefault(f"{labels[0][1]} {labels[1][1]}", {})
+                entry["avg_ms"] = round(histogram.sum / histogram.count * 1000, 3)
+        return stats
@@ -0,0 +1,35 @@
+"""
+Fusion 360 请求指标工具
+"""
+
+import logging
+from typing import Any, Dict
+
+from .fusion360_api import get_api
+
+logger = logging.getLogger(__name__)
+
+
+async def get_metrics(format: str = "summary") -> Dict[str, Any]:
+    """获取请求次数、错误和耗时指标
+
+    summary：MCP 服务器端按路由汇总的统计（含缓存、熔断器、压缩等，见 Fusion360API.get_stats）；
+    prometheus：服务器端指标与插件 /api/metrics 的 Prometheus 文本，插件不可用时只返回服务器端部分。
+    """
+    if format not in ("summary", "prometheus"):
+        raise ValueError(f"不支持的格式: {format}，可选 summary、prometheus")
+
+    api = get_api()
+    if format == "summary":
+        return api.get_stats()
+
+    text = api.metrics.render()
+    try:
+        addin_text, _ = await api._request_raw("/api/metrics")
+        text += addin_text.decode("utf-8")
+        addin_available = True
+    except Exception as e:
+        logger.warning(f"获取插件指标失败: {e}")
+        text += f"# 插件指标不可用: {e}\n"
+        addin_available = False
+    return {"format": "prometheus", "addin": addin_available, "text": text}
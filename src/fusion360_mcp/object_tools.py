@@ -3,6 +3,7 @@ Fusion 360 对象操作工具
 """
 
 import logging
+import urllib.parse
 from typing import Any, Dict, List, Optional
 
 from .fusion360_api import get_api
@@ -11,6 +12,11 @@ from .fusion360_api import get_api
 logger = logging.getLogger(__name__)
 
 
+def _object_endpoint(object_id: str) -> str:
+    """/api/object/<id>，实体令牌中的 /、%、+ 等字符全部转义（插件对路径做 unquote）"""
+    return f"/api/object/{urllib.parse.quote(object_id, safe='')}"
+
+
 async def create_object(
     object_type: str,
     parameters: Dict[str, Any],
@@ -47,7 +53,7 @@ async def edit_object(object_id: str, parameters: Dict[str, Any]) -> Dict[str, A
         }
     }
 
-    result = await api._request("PUT", f"/api/object/{object_id}", data)
+    result = await api._request("PUT", _object_endpoint(object_id), data)
     logger.info(f"编辑对象成功: {object_id}")
     return result
 
@@ -56,25 +62,79 @@ async def delete_object(object_id: str) -> Dict[str, Any]:
     """在 Fusion 360 中删除对象"""
     api = get_api()
 
-    result = await api._request("DELETE", f"/api/object/{object_id}")
+    result = await api._request("DELETE", _object_endpoint(object_id))
     logger.info(f"删除对象成功: {object_id}")
     return result
 
 
-async def get_objects() -> Dict[str, Any]:
-    """获取文档中的所有对象"""
+OBJECT_TYPES = ("body", "occurrence")
+
+# 可投影的字段；bounding_box、physical_properties 计算开销大，只在显式请求时返回
+OBJECT_FIELDS = (
+    "id", "name", "type", "visible", "material", "appearance", "component", "path",
+    "is_solid", "bounding_box", "physical_properties", "bodies"
+)
+
+
+def _format_fields(fields: Optional[List[str]]) -> Optional[str]:
+    """校验并拼接 fields 参数"""
+    if not fields:
+        return None
+    unknown = [field for field in fields if field not in OBJECT_FIELDS]
+    if unknown:
+        raise ValueError(f"不支持的字段: {unknown}，可选: {list(OBJECT_FIELDS)}")
+    return ",".join(fields)
+
+
+async def get_objects(
+    page_size: Optional[int] = None,
+    cursor: Optional[str] = None,
+    object_type: Optional[str] = None,
+    name: Optional[str] = None,
+    visible: Optional[bool] = None,
+    component: Optional[str] = None,
+    fields: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    """分页获取文档中的对象（包括所有子装配）
+
+    name 和 component 支持通配符（如 "Bolt*"、"Frame:1*"），
+    结果中的 next_cursor 非空时，传入 cursor 获取下一页。
+    fields 指定只返回的字段，如 ["id", "name"]。
+    """
+    if object_type is not None and object_type not in OBJECT_TYPES:
+        raise ValueError(f"不支持的对象类型: {object_type}，可选: {list(OBJECT_TYPES)}")
+    if page_size is not None and page_size < 1:
+        raise ValueError("page_size 必须大于 0")
+
     api = get_api()
 
-    result = await api._request("GET", "/api/objects")
-    logger.info(f"获取对象列表成功，共 {len(result.get('objects', []))} 个对象")
+    params = {
+        "page_size": page_size,
+        "cursor": cursor,
+        "type": object_type,
+        "name": name,
+        "visible": None if visible is None else str(visible).lower(),
+        "component": component,
+        "fields": _format_fields(fields)
+    }
+    query = urllib.parse.urlencode({key: value for key, value in params.items() if value is not None})
+    endpoint = f"/api/objects?{query}" if query else "/api/objects"
+
+    result = await api._request("GET", endpoint)
+    logger.info(f"获取对象列表成功，本页 {len(result.get('objects', []))} 个对象")
     return result
 
 
-async def get_object(object_id: str) -> Dict[str, Any]:
-    """获取文档中的特定对象"""
+async def get_object(object_id: str, fields: Optional[List[str]] = None) -> Dict[str, Any]:
+    """获取文档中的特定对象，fields 指定只返回的字段"""
     api = get_api()
 
-    result = await api._request("GET", f"/api/object/{object_id}")
+    endpoint = _object_endpoint(object_id)
+    field_list = _format_fields(fields)
+    if field_list:
+        endpoint += f"?{urllib.parse.urlencode({'fields': field_list})}"
+
+    result = await api._request("GET", endpoint)
     logger.info(f"获取对象成功: {object_id}")
     return result
 
@@ -0,0 +1,117 @@
+"""
+Fusion 360 API 请求的重试退避与熔断
+"""
+
+import random
+import time
+from typing import Any, Callable, Dict, Optional
+
+# 幂等方法在传输错误时可以安全重试
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+# 插件在执行之前就拒绝的状态码（队列已满 / 调度器未启动），任何方法都可以重试
+REJECTED_STATUS_CODES = frozenset({429, 503})
+
+# 幂等方法可以重试的状态码
+RETRYABLE_STATUS_CODES = frozenset({429, 502, 503, 504})
+
+
+class CircuitOpenError(Exception):
+    """熔断器打开，请求被快速拒绝"""
+
+
+class DeadlineExceededError(Exception):
+    """调用超过了截止时间"""
+
+
+def backoff_delay(
+    attempt: int,
+    base: float,
+    maximum: float,
+    retry_after: Optional[float] = None
+) -> float:
+    """计算第 attempt 次重试前的等待时间（指数退避 + 抖动）"""
+    if retry_after is not None:
+        return max(0.0, min(retry_after, maximum))
+
+    delay: float = min(maximum, base * (2 ** attempt))
+    # 保留一半固定等待，另一半随机，避免多个调用方同时重试
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """解析 Retry-After 头（只支持秒数）"""
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+class CircuitBreaker:
+    """连接熔断器
+
+    连续 failure_threshold 次连接失败后打开，cooldown 秒内直接拒绝请求；
+    冷却结束后进入半开状态，由调用方探测一次健康检查决定关闭还是重新打开。
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        cooldown: float = 10.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self._clock = clock
+        self._consecutive_failures = 0
+        self._opened_at: Optional[float] = None
+
+        # 统计信息
+        self.trips = 0
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return self.CLOSED
+        if self._clock() - self._opened_at >= self.cooldown:
+            return self.HALF_OPEN
+        return self.OPEN
+
+    def remaining_cooldown(self) -> float:
+        """距离进入半开状态的剩余秒数"""
+        if self._opened_at is None:
+            return 0.0
+        return max(0.0, self.cooldown - (self._clock() - self._opened_at))
+
+    def record_success(self) -> None:
+        """记录一次成功连接，关闭熔断器"""
+        self._consecutive_failures = 0
+        self._opened_at = None
+
+    def record_failure(self) -> None:
+        """记录一次连接失败，达到阈值时打开熔断器"""
+        self._consecutive_failures += 1
+        if self._opened_at is None and self._consecutive_failures >= self.failure_threshold:
+            self.trip()
+
+    def trip(self) -> None:
+        """打开熔断器（半开探测失败时也会重新打开）"""
+        self._opened_at = self._clock()
+        self.trips += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取熔断器统计信息"""
+        return {
+            "state": self.state,
+            "consecutive_failures": self._consecutive_failures,
+            "remaining_cooldown": round(self.remaining_cooldown(), 3),
+            "trips": self.trips,
+            "rejected": self.rejected,
+        }
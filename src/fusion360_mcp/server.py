@@ -3,20 +3,58 @@ FastMCP 服务器配置和初始化
 """
 
 import logging
-from typing import Any, Dict, List, Optional
+import weakref
+from contextlib import asynccontextmanager
+from typing import Annotated, Any, AsyncIterator, Dict, List, Literal, Optional, Union
 
-from fastmcp import FastMCP
-from pydantic import BaseModel
+from fastmcp import Context, FastMCP
+from fastmcp.utilities.types import Image
+from pydantic import BaseModel, Field
 
 from .config import get_settings
+from .events import EVENT_RESOURCES, OBJECTS_RESOURCE, SELECTION_RESOURCE, STATUS_RESOURCE
+from .fusion360_api import get_api, get_fusion360_status, request_deadline
 from . import tools
 
 
 logger = logging.getLogger(__name__)
 
 
+# 读取过资源的 MCP 会话，插件事件到达时向它们发送 resources/updated 通知
+_sessions: "weakref.WeakSet[Any]" = weakref.WeakSet()
+
+
+async def forward_resource_updates(event: Dict[str, Any]) -> None:
+    """把插件事件转发为 MCP 资源更新通知"""
+    for uri in EVENT_RESOURCES.get(str(event.get("type", "")), ()):
+        for session in list(_sessions):
+            try:
+                await session.send_resource_updated(uri)
+            except Exception as e:
+                logger.debug(f"发送资源更新通知失败，移除会话: {e}")
+                _sessions.discard(session)
+
+
+@asynccontextmanager
+async def lifespan(server: FastMCP) -> AsyncIterator[None]:
+    """服务器启动时订阅一次插件事件流，关闭时停止"""
+    api = get_api()
+    api.start_event_stream(on_event=forward_resource_updates)
+    try:
+        yield
+    finally:
+        await api.stop_event_stream()
+
+
 # 创建 FastMCP 应用实例
-app = FastMCP("Fusion360 MCP Server")
+app = FastMCP("Fusion360 MCP Server", lifespan=lifespan)
+
+
+# 所有工具共用的截止时间参数，超时后插件会丢弃仍在排队的任务
+Deadline = Annotated[
+    Optional[float],
+    Field(description="本次调用的截止时间（秒，从调用开始计算），不填则使用各端点的默认超时")
+]
 
 
 # 数据模型定义
@@ -41,6 +79,20 @@ class CodeRequest(BaseModel):
     context: Optional[Dict[str, Any]] = None
 
 
+class BatchOperation(BaseModel):
+    """批量操作中的单个操作"""
+    action: str
+    parameters: Dict[str, Any] = {}
+    ref: Optional[str] = None
+
+
+class BatchRequest(BaseModel):
+    """批量操作请求"""
+    operations: List[BatchOperation]
+    mode: str = "stop_on_error"
+    transaction: bool = False
+
+
 class ViewRequest(BaseModel):
     """视图请求"""
     camera_position: Optional[List[float]] = None
@@ -48,18 +100,24 @@ class ViewRequest(BaseModel):
     format: str = "png"
     width: int = 1920
     height: int = 1080
+    raw: bool = Field(default=False, description="直接返回图片内容（原始字节传输，不经过 base64 JSON）")
+    quality: Literal["preview", "final"] = Field(
+        default="final",
+        description="preview：缩小到 640x480 以内并临时降低显示效果，适合快速预览；final：全尺寸、全效果"
+    )
 
 
 # 注册 MCP 工具
 @app.tool()
-async def create_document(request: DocumentRequest) -> Dict[str, Any]:
+async def create_document(request: DocumentRequest, deadline: Deadline = None) -> Dict[str, Any]:
     """在 Fusion 360 中创建新文档"""
     try:
-        result = await tools.create_document(
-            name=request.name,
-            template=request.template,
-            units=request.units
-        )
+        with request_deadline(deadline):
+            result = await tools.create_document(
+                name=request.name,
+                template=request.template,
+                units=request.units
+            )
         return {"success": True, "result": result}
     except Exception as e:
         logger.error(f"创建文档失败: {e}")
@@ -67,15 +125,16 @@ async def create_document(request: DocumentRequest) -> Dict[str, Any]:
 
 
 @app.tool()
-async def create_object(request: ObjectRequest) -> Dict[str, Any]:
+async def create_object(request: ObjectRequest, deadline: Deadline = None) -> Dict[str, Any]:
     """在 Fusion 360 中创建新对象"""
     try:
-        result = await tools.create_object(
-            object_type=request.object_type,
-            parameters=request.parameters,
-            position=request.position,
-            rotation=request.rotation
-        )
+        with request_deadline(deadline):
+            result = await tools.create_object(
+                object_type=request.object_type,
+                parameters=request.parameters,
+                position=request.position,
+                rotation=request.rotation
+            )
         return {"success": True, "result": result}
     except Exception as e:
         logger.error(f"创建对象失败: {e}")
@@ -83,10 +142,11 @@ async def create_object(request: ObjectRequest) -> Dict[str, Any]:
 
 
 @app.tool()
-async def edit_object(object_id: str, parameters: Dict[str, Any]) -> Dict[str, Any]:
+async def edit_object(object_id: str, parameters: Dict[str, Any], deadline: Deadline = None) -> Dict[str, Any]:
     """在 Fusion 360 中编辑对象"""
     try:
-        result = await tools.edit_object(object_id, parameters)
+        with request_deadline(deadline):
+            result = await tools.edit_object(object_id, parameters)
         return {"success": True, "result": result}
     except Exception as e:
         logger.error(f"编辑对象失败: {e}")
@@ -94,10 +154,11 @@ async def edit_object(object_id: str, parameters: Dict[str, Any]) -> Dict[str, A
 
 
 @app.tool()
-async def delete_object(object_id: str) -> Dict[str, Any]:
+async def delete_object(object_id: str, deadline: Deadline = None) -> Dict[str, Any]:
     """在 Fusion 360 中删除对象"""
     try:
-        result = await tools.delete_object(object_id)
+        with request_deadline(deadline):
+            result = await tools.delete_object(object_id)
         return {"success": True, "result": result}
     except Exception as e:
         logger.error(f"删除对象失败: {e}")
@@ -105,10 +166,11 @@ async def delete_object(object_id: str) -> Dict[str, Any]:
 
 
 @app.tool()
-async def execute_code(request: CodeRequest) -> Dict[str, Any]:
+async def execute_code(request: CodeRequest, deadline: Deadline = None) -> Dict[str, Any]:
     """在 Fusion 360 中执行任意 Python 代码"""
     try:
-        result = await tools.execute_code(request.code, request.context)
+        with request_deadline(deadline):
+            result = await tools.execute_code(request.code, request.context)
         return {"success": True, "result": result}
     except Exception as e:
         logger.error(f"执行代码失败: {e}")
@@ -116,10 +178,11 @@ async def execute_code(request: CodeRequest) -> Dict[str, Any]:
 
 
 @app.tool()
-async def insert_part_from_library(library_name: str, part_name: str, position: Optional[List[float]] = None) -> Dict[str, Any]:
+async def insert_part_from_library(library_name: str, part_name: str, position: Optional[List[float]] = None, deadline: Deadline = None) -> Dict[str, Any]:
     """从零件库中插入零件"""
     try:
-        result = await tools.insert_part_from_library(library_name, part_name, position)
+        with request_deadline(deadline):
+            result = await tools.insert_part_from_library(library_name, part_name, position)
         return {"success": True, "result": result}
     except Exception as e:
         logger.error(f"插入零件失败: {e}")
@@ -127,16 +190,21 @@ async def insert_part_from_library(library_name: str, part_name: str, position:
 
 
 @app.tool()
-async def get_view(request: ViewRequest) -> Dict[str, Any]:
-    """获取活动视图的截图"""
-    try:
-        result = await tools.get_view(
-            camera_position=request.camera_position,
-            target_position=request.target_position,
-            format=request.format,
-            width=request.width,
-            height=request.height
-        )
+async def get_view(request: ViewRequest, deadline: Deadline = None) -> Union[Image, Dict[str, Any]]:
+    """获取活动视图的截图，raw 为 True 时直接返回图片内容；quality 为 preview 时返回 base64 预览图和渲染耗时"""
+    try:
+        with request_deadline(deadline):
+            result = await tools.get_view(
+                camera_position=request.camera_position,
+                target_position=request.target_position,
+                format=request.format,
+                width=request.width,
+                height=request.height,
+                raw=request.raw,
+                quality=request.quality
+            )
+        if isinstance(result, Image):
+            return result
         return {"success": True, "result": result}
     except Exception as e:
         logger.error(f"获取视图失败: {e}")
@@ -144,10 +212,67 @@ async def get_view(request: ViewRequest) -> Dict[str, Any]:
 
 
 @app.tool()
-async def get_objects() -> Dict[str, Any]:
-    """获取文档中的所有对象"""
+async def get_views(
+    presets: Optional[List[str]] = None,
+    format: str = "png",
+    width: int = 800,
+    height: int = 600,
+    quality: Literal["preview", "final"] = "final",
+    layout: Literal["separate", "sheet"] = "separate",
+    deadline: Deadline = None
+) -> Union[List[Union[str, Image]], Dict[str, Any]]:
+    """一次调用按多个相机预设截图
+
+    presets: front、back、top、bottom、left、right、iso、iso_top_left、iso_bottom_right、
+    iso_bottom_left，默认 front、top、right、iso。所有预设在插件中一次渲染完成，
+    相机切换不使用平滑过渡，结束后恢复原视角。
+    layout: separate 分别返回每张图片（前面带预设名），sheet 拼接为一张网格图。
+    """
     try:
-        result = await tools.get_objects()
+        with request_deadline(deadline):
+            return await tools.get_views(
+                presets=presets,
+                format=format,
+                width=width,
+                height=height,
+                quality=quality,
+                layout=layout
+            )
+    except Exception as e:
+        logger.error(f"获取多视图失败: {e}")
+        return {"success": False, "error": str(e)}
+
+
+@app.tool()
+async def get_objects(
+    page_size: Optional[int] = None,
+    cursor: Optional[str] = None,
+    object_type: Optional[str] = None,
+    name: Optional[str] = None,
+    visible: Optional[bool] = None,
+    component: Optional[str] = None,
+    fields: Optional[List[str]] = None,
+    deadline: Deadline = None
+) -> Dict[str, Any]:
+    """分页获取文档中的对象（包括所有子装配）
+
+    page_size: 每页数量（默认 50，最大 500）；cursor: 上一页返回的 next_cursor。
+    object_type: body 或 occurrence；name / component: 名称 / 组件路径通配符；
+    visible: 按可见性过滤。
+    fields: 只返回的字段（默认 id、name、type、visible、material、component、path），
+    bounding_box、physical_properties 开销较大，需要显式请求。
+    """
+    try:
+        with request_deadline(deadline):
+            result = await tools.get_objects(
+                page_size=page_size,
+                cursor=cursor,
+                object_type=object_type,
+                name=name,
+                visible=visible,
+                component=component,
+                fields=fields
+            )
         return {"success": True, "result": result}
     except Exception as e:
         logger.error(f"获取对象列表失败: {e}")
@@ -155,10 +280,18 @@ async def get_objects() -> Dict[str, Any]:
 
 
 @app.tool()
-async def get_object(object_id: str) -> Dict[str, Any]:
-    """获取文档中的特定对象"""
+async def get_object(
+    object_id: str,
+    fields: Optional[List[str]] = None,
+    deadline: Deadline = None
+) -> Dict[str, Any]:
+    """获取文档中的特定对象
+
+    fields: 只返回的字段，bounding_box、physical_properties 需要显式请求。
+    """
     try:
-        result = await tools.get_object(object_id)
+        with request_deadline(deadline):
+            result = await tools.get_object(object_id, fields=fields)
         return {"success": True, "result": result}
     except Exception as e:
         logger.error(f"获取对象失败: {e}")
@@ -166,16 +299,116 @@ async def get_object(object_id: str) -> Dict[str, Any]:
 
 
 @app.tool()
-async def get_parts_list() -> Dict[str, Any]:
+async def get_parts_list(deadline: Deadline = None) -> Dict[str, Any]:
     """获取零件库中的零件列表"""
     try:
-        result = await tools.get_parts_list()
+        with request_deadline(deadline):
+            result = await tools.get_parts_list()
         return {"success": True, "result": result}
     except Exception as e:
         logger.error(f"获取零件列表失败: {e}")
         return {"success": False, "error": str(e)}
 
 
+@app.tool()
+async def batch_operations(request: BatchRequest, deadline: Deadline = None) -> Dict[str, Any]:
+    """在一次往返中按顺序执行多个操作
+
+    action 可选 create_document、create_object、edit_object、delete_object、capture_view、
+    get_objects、get_object、get_status、get_view，
+    parameters 与对应单个请求相同。后续操作可用 "${ref.字段}" 或 "${序号.字段}"
+    引用前面操作的结果，例如 {"object_id": "${cyl.object_id}"}。
+    mode 为 stop_on_error（遇错停止）或 continue（继续执行）。
+    transaction 为 True 时整批操作在一个时间线事务中执行，失败则整批回滚。
+    """
+    try:
+        with request_deadline(deadline):
+            result = await tools.batch_operations(
+                operations=[op.model_dump(exclude_none=True) for op in request.operations],
+                mode=request.mode,
+                transaction=request.transaction
+            )
+        return {"success": True, "result": result}
+    except Exception as e:
+        logger.error(f"批量操作失败: {e}")
+        return {"success": False, "error": str(e)}
+
+
+@app.tool()
+async def transaction(action: str, deadline: Deadline = None) -> Dict[str, Any]:
+    """控制时间线事务
+
+    action: begin（开始，记录时间线位置）、commit（提交）、
+    rollback（回滚到开始时的时间线位置）、status（查询状态）。
+    事务中任一修改操作失败时，commit 会自动回滚。
+    """
+    try:
+        with request_deadline(deadline):
+            result = await tools.transaction(action)
+        return {"success": True, "result": result}
+    except Exception as e:
+        logger.error(f"事务操作失败: {e}")
+        return {"success": False, "error": str(e)}
+
+
+@app.tool()
+async def get_changes(since: Union[int, str] = 0, deadline: Deadline = None) -> Dict[str, Any]:
+    """获取设计版本号 since 之后创建、修改、删除的对象（增量）
+
+    首次调用传 0 或上次 get_status 返回的 revision_token，
+    之后把返回的 revision_token 作为下次的 since。resync_required 为 True 时
+    （客户端落后太多、切换了文档、在界面中做了修改或插件重新加载过）需要调用 get_objects 全量获取。
+    """
+    try:
+        with request_deadline(deadline):
+            result = await tools.get_changes(since)
+        return {"success": True, "result": result}
+    except Exception as e:
+        logger.error(f"获取变更失败: {e}")
+        return {"success": False, "error": str(e)}
+
+
+@app.tool()
+async def get_metrics(
+    format: Literal["summary", "prometheus"] = "summary",
+    deadline: Deadline = None
+) -> Dict[str, Any]:
+    """获取请求次数、错误和耗时指标
+
+    summary：MCP 服务器端按路由汇总的调用次数（ok/cache/error）、重试次数和平均耗时，
+    以及缓存、熔断器、压缩等统计；prometheus：服务器端与插件端（队列等待、主线程执行时间、
+    响应大小直方图）的 Prometheus 文本。
+    """
+    try:
+        with request_deadline(deadline):
+            result = await tools.get_metrics(format)
+        return {"success": True, "result": result}
+    except Exception as e:
+        logger.error(f"获取指标失败: {e}")
+        return {"success": False, "error": str(e)}
+
+
+@app.resource(STATUS_RESOURCE, mime_type="application/json")
+async def design_status(ctx: Context) -> Dict[str, Any]:
+    """Fusion 360 连接状态和当前设计版本号，设计变化时推送更新通知"""
+    _sessions.add(ctx.session)
+    return await get_fusion360_status()
+
+
+@app.resource(OBJECTS_RESOURCE, mime_type="application/json")
+async def design_objects(ctx: Context) -> Dict[str, Any]:
+    """当前设计中的对象（第一页），设计变化时推送更新通知"""
+    _sessions.add(ctx.session)
+    return await tools.get_objects()
+
+
+@app.resource(SELECTION_RESOURCE, mime_type="application/json")
+async def selection(ctx: Context) -> Dict[str, Any]:
+    """用户在 Fusion 360 中最近一次选择的对象，选择变化时推送更新通知"""
+    _sessions.add(ctx.session)
+    return get_api().last_selection
+
+
 # FastMCP 服务器初始化完成
 # 所有工具已通过 @app.tool() 装饰器注册
 logger.info("Fusion360 MCP 服务器配置完成")
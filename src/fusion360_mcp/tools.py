@@ -8,9 +8,16 @@ from .object_tools import (
     create_object, edit_object, delete_object, get_objects, get_object,
     create_primitive, OBJECT_TEMPLATES
 )
-from .view_tools import get_view
+from .view_tools import get_view, get_views
 from .part_tools import insert_part_from_library, get_parts_list
 from .execute_tools import execute_code
+from .batch_tools import batch_operations
+from .transaction_tools import (
+    transaction, begin_transaction, commit_transaction, rollback_transaction,
+    get_transaction_status
+)
+from .change_tools import get_changes
+from .metrics_tools import get_metrics
 from .fusion360_api import (
     Fusion360API, get_api, validate_fusion360_connection, get_fusion360_status
 )
@@ -31,6 +38,7 @@ __all__ = [
 
     # 视图操作
     "get_view",
+    "get_views",
 
     # 零件操作
     "insert_part_from_library",
@@ -39,6 +47,22 @@ __all__ = [
     # 代码执行
     "execute_code",
 
+    # 批量操作
+    "batch_operations",
+
+    # 事务
+    "transaction",
+    "begin_transaction",
+    "commit_transaction",
+    "rollback_transaction",
+    "get_transaction_status",
+
+    # 变更日志
+    "get_changes",
+
+    # 请求指标
+    "get_metrics",
+
     # API基础
     "Fusion360API",
     "get_api",
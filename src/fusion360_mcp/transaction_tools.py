@@ -0,0 +1,60 @@
+"""
+Fusion 360 时间线事务工具
+"""
+
+import logging
+from typing import Any, Dict
+
+from .fusion360_api import get_api
+
+logger = logging.getLogger(__name__)
+
+
+TRANSACTION_ACTIONS = ("begin", "commit", "rollback", "status")
+
+
+async def begin_transaction() -> Dict[str, Any]:
+    """开始事务，记录当前的时间线位置"""
+    api = get_api()
+
+    result = await api._request("POST", "/api/transaction/begin", {"action": "begin_transaction"})
+    logger.info("事务开始")
+    return result
+
+
+async def commit_transaction() -> Dict[str, Any]:
+    """提交事务，事务中有失败操作时插件会回滚"""
+    api = get_api()
+
+    result = await api._request("POST", "/api/transaction/commit", {"action": "commit_transaction"})
+    logger.info(f"事务提交: {'成功' if result.get('success') else '失败'}")
+    return result
+
+
+async def rollback_transaction() -> Dict[str, Any]:
+    """回滚事务到开始时的时间线位置"""
+    api = get_api()
+
+    result = await api._request("POST", "/api/transaction/rollback", {"action": "rollback_transaction"})
+    logger.info("事务已回滚")
+    return result
+
+
+async def get_transaction_status() -> Dict[str, Any]:
+    """获取当前事务状态"""
+    api = get_api()
+
+    return await api._request("GET", "/api/transaction")
+
+
+async def transaction(action: str) -> Dict[str, Any]:
+    """按动作名称控制事务"""
+    handlers = {
+        "begin": begin_transaction,
+        "commit": commit_transaction,
+        "rollback": rollback_transaction,
+        "status": get_transaction_status,
+    }
+    if action not in handlers:
+        raise ValueError(f"不支持的事务动作: {action}，可选: {list(TRANSACTION_ACTIONS)}")
+    return await handlers[action]()
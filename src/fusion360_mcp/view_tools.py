@@ -2,11 +2,22 @@
 Fusion 360 视图操作工具
 """
 
+import io
 import logging
-from typing import Any, Dict, List, Optional
+import math
+import urllib.parse
+from typing import Any, Dict, List, Literal, Optional, Union
 
+from fastmcp.utilities.types import Image
+
+from .codec import media_type, parse_multipart
 from .fusion360_api import get_api
 
+try:
+    from PIL import Image as PILImage, ImageDraw
+except ImportError:
+    PILImage = None
+
 
 logger = logging.getLogger(__name__)
 
@@ -16,11 +27,43 @@ async def get_view(
     target_position: Optional[List[float]] = None,
     format: str = "png",
     width: int = 1920,
-    height: int = 1080
-) -> Dict[str, Any]:
-    """获取活动视图的截图"""
+    height: int = 1080,
+    raw: bool = False,
+    quality: Literal["preview", "final"] = "final"
+) -> Union[Image, Dict[str, Any]]:
+    """获取活动视图的截图
+
+    raw 为 True 时从 /api/view/raw 获取图片原始字节，返回 MCP 图片内容，
+    插件和本进程都不再经过 base64 与 JSON 中转。
+    quality 为 preview 时插件缩小尺寸（不超过 640x480）并临时降低显示效果，速度更快。
+    GET /api/view 只返回相机信息、不渲染，所以非 raw 的 preview 通过 POST /api/view
+    实际截图，返回 base64 图片数据和插件端的渲染耗时 capture_ms。
+    """
+    if quality not in ("preview", "final"):
+        raise ValueError("quality 必须是 preview 或 final")
     api = get_api()
 
+    if raw:
+        query = urllib.parse.urlencode({"width": width, "height": height, "format": format, "quality": quality})
+        image, mime_type = await api._request_raw(f"/api/view/raw?{query}")
+        logger.info(f"获取视图截图成功: {len(image)} 字节")
+        return Image(data=image, format=media_type(mime_type).split("/")[-1])
+
+    if quality == "preview":
+        data = {
+            "action": "capture_view",
+            "parameters": {
+                "format": format,
+                "width": width,
+                "height": height,
+                "quality": quality,
+                "return_base64": True
+            }
+        }
+        result = await api._request("POST", "/api/view", data)
+        logger.info(f"获取预览截图成功: {result.get('capture_ms')} ms")
+        return result
+
     data = {
         "action": "get_view",
         "parameters": {
@@ -35,3 +78,78 @@ async def get_view(
     result = await api._request("GET", "/api/view", data)
     logger.info("获取视图截图成功")
     return result
+
+
+# 插件支持的相机预设
+CAMERA_PRESETS = (
+    "front", "back", "top", "bottom", "left", "right",
+    "iso", "iso_top_left", "iso_bottom_right", "iso_bottom_left",
+)
+
+
+async def get_views(
+    presets: Optional[List[str]] = None,
+    format: str = "png",
+    width: int = 800,
+    height: int = 600,
+    quality: Literal["preview", "final"] = "final",
+    layout: Literal["separate", "sheet"] = "separate"
+) -> List[Union[str, Image]]:
+    """按多个命名相机预设截图，一次往返、一个主线程任务完成
+
+    presets 默认为 front、top、right、iso。layout 为 separate 时返回
+    [预设名, 图片, 预设名, 图片, ...]；为 sheet 时拼接成一张带标签的网格图（需要 Pillow）。
+    """
+    presets = presets or ["front", "top", "right", "iso"]
+    unknown = [name for name in presets if name not in CAMERA_PRESETS]
+    if unknown:
+        raise ValueError(f"未知的相机预设: {', '.join(unknown)}，可选: {', '.join(CAMERA_PRESETS)}")
+    if quality not in ("preview", "final"):
+        raise ValueError("quality 必须是 preview 或 final")
+    if layout not in ("separate", "sheet"):
+        raise ValueError("layout 必须是 separate 或 sheet")
+
+    api = get_api()
+    query = urllib.parse.urlencode({
+        "presets": ",".join(presets),
+        "width": width,
+        "height": height,
+        "format": format,
+        "quality": quality,
+    })
+    body, content_type = await api._request_raw(f"/api/views?{query}")
+    parts = parse_multipart(body, content_type)
+    logger.info(f"获取多视图截图成功: {', '.join(name for name, _, _ in parts)}")
+
+    if layout == "sheet":
+        if PILImage is None:
+            logger.warning("未安装 Pillow，无法拼接网格图，改为分别返回图片")
+        else:
+            sheet = make_contact_sheet([(name, data) for name, _, data in parts])
+            return [", ".join(name for name, _, _ in parts), Image(data=sheet, format="png")]
+
+    result: List[Union[str, Image]] = []
+    for name, part_type, data in parts:
+        result.append(name)
+        result.append(Image(data=data, format=media_type(part_type).split("/")[-1]))
+    return result
+
+
+def make_contact_sheet(images: List[Any], columns: Optional[int] = None) -> bytes:
+    """把 [(标签, 图片字节)] 拼接为带标签的网格 PNG"""
+    tiles = [(label, PILImage.open(io.BytesIO(data)).convert("RGB")) for label, data in images]
+    columns = columns or math.ceil(math.sqrt(len(tiles)))
+    rows = math.ceil(len(tiles) / columns)
+    tile_width = max(tile.width for _, tile in tiles)
+    tile_height = max(tile.height for _, tile in tiles)
+
+    sheet = PILImage.new("RGB", (tile_width * columns, tile_height * rows), "white")
+    draw = ImageDraw.Draw(sheet)
+    for index, (label, tile) in enumerate(tiles):
+        x, y = (index % columns) * tile_width, (index // columns) * tile_height
+        sheet.paste(tile, (x, y))
+        draw.text((x + 8, y + 8), label, fill="black")
+
+    output = io.BytesIO()
+    sheet.save(output, format="PNG")
+    return output.getvalue()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+消息编码基准测试 - 比较 JSON 与 MessagePack 的编解码时间和负载大小
+
+负载取自插件的典型响应：对象列表（字符串多）和几何数据（浮点数多）。
+MessagePack 部分需要安装 msgpack。
+
+用法:
+    python tests/benchmark_encoding.py [重复次数]
+"""
+
+import json
+import os
+import sys
+import time
+
+# 添加插件目录到路径
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(project_root, "addin", "fusion360_mcp_addin"))
+
+import codec  # noqa: E402
+
+
+def object_list(count=500):
+    """模拟 /api/objects 一页的响应"""
+    return {
+        "success": True,
+        "count": count,
+        "has_more": False,
+        "objects": [
+            {
+                "id": f"/v4BAAEAAwAAAAAAAAAAAAAA{i:08d}",
+                "name": f"实体{i}",
+                "type": "body",
+                "visible": True,
+                "material": "钢",
+                "component": "根组件",
+                "path": f"部件{i // 10}:1",
+                "bounding_box": {"min": [i * 0.5, -1.25, 0.0], "max": [i * 0.5 + 10.0, 1.25, 20.0]},
+            }
+            for i in range(count)
+        ]
+    }
+
+
+def geometry(vertices=20000):
+    """模拟网格/坐标数据与相机矩阵"""
+    return {
+        "success": True,
+        "camera": {
+            "eye": [152.38469251, -98.11720346, 87.60918835],
+            "target": [0.0, 0.0, 0.0],
+            "up": [0.0, 0.0, 1.0],
+            "matrix": [[0.70710678 * (r + c + 1) for c in range(4)] for r in range(4)],
+        },
+        "vertices": [[i * 0.013, i * -0.027 + 3.5, (i % 97) * 0.1013] for i in range(vertices)],
+        "normals": [[0.0, 0.57735027, 0.81649658] for _ in range(vertices)],
+        "triangles": [[i, i + 1, i + 2] for i in range(0, vertices - 2, 3)],
+    }
+
+
+def measure(func, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    return (time.perf_counter() - started) / repeat * 1000, result
+
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    types = codec.supported_types()
+    if codec.MSGPACK_TYPE not in types:
+        print("未安装 msgpack，只测试 JSON\n")
+
+    print(f"{'负载':<10} {'编码':<22} {'大小':>10} {'编码 ms':>9} {'解码 ms':>9}")
+    for name, data in (("对象列表", object_list()), ("几何数据", geometry())):
+        for content_type in reversed(types):
+            encode_ms, body = measure(lambda: codec.encode(data, content_type), repeat)
+            decode_ms, decoded = measure(lambda: codec.decode(body, content_type), repeat)
+            assert decoded == json.loads(json.dumps(data))
+            print(f"{name:<10} {content_type:<22} {len(body):>10} {encode_ms:>9.3f} {decode_ms:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+日志基准测试 - 比较每次请求的日志开销
+
+旧方式：每次请求用 f-string 格式化完整的请求数据（含 execute_code 源码），
+并像 common.log_safe 的备用路径那样每条消息重新打开文件写入。
+新方式：AddinLogger 的级别过滤、按路径采样、入队后由后台线程格式化（截断长参数）。
+
+用法:
+    python tests/benchmark_logging.py [重复次数]
+"""
+
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+# 添加插件目录到路径
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(project_root, "addin", "fusion360_mcp_addin"))
+
+from addin_log import DEBUG, INFO, AddinLogger, PathSampler  # noqa: E402
+
+# 模拟一次 execute_code 请求：约 20KB 的脚本源码
+PAYLOAD = {"code": "\n".join(f"sketch.sketchCurves.sketchLines.addByTwoPoints(p{i}, p{i + 1})" for i in range(300))}
+
+
+def measure(func, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - started) / repeat * 1_000_000
+
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    log_dir = tempfile.mkdtemp()
+    legacy_path = os.path.join(log_dir, "temp_error.log")
+
+    def legacy():
+        message = f"POST 请求: /api/execute, 数据: {PAYLOAD}"
+        with open(legacy_path, "a", encoding="utf-8") as f:
+            f.write(f"{datetime.now().strftime('%Y-%m-%d %H:%M:%S')} - INFO - {message}\n")
+
+    logger = AddinLogger(level=INFO, queue_size=repeat * 4)
+    logger.start(os.path.join(log_dir, "addin.log"))
+    sampler = PathSampler({"/api/health": 100})
+
+    def filtered():
+        if logger.enabled(DEBUG) and sampler.allow("/api/execute"):
+            logger.debug("%s 请求: %s, 数据: %s", "POST", "/api/execute", PAYLOAD)
+
+    def queued():
+        logger.info("%s 请求: %s, 数据: %s", "POST", "/api/execute", PAYLOAD)
+
+    def sampled():
+        if sampler.allow("/api/health"):
+            logger.info("%s 请求: %s", "GET", "/api/health")
+
+    print(f"重复 {repeat} 次，请求数据 {len(PAYLOAD['code'])} 字符\n")
+    print(f"{'场景':<28} {'请求线程 µs/次':>14}")
+    print(f"{'旧方式（格式化 + 打开文件）':<24} {measure(legacy, repeat):>14.2f}")
+    print(f"{'DEBUG 未启用':<26} {measure(filtered, repeat):>14.2f}")
+    print(f"{'INFO 入队（后台格式化）':<24} {measure(queued, repeat):>14.2f}")
+    print(f"{'/api/health 采样 1/100':<28} {measure(sampled, repeat):>14.2f}")
+
+    started = time.perf_counter()
+    logger.stop()
+    print(f"\n后台线程写完剩余记录 {(time.perf_counter() - started) * 1000:.1f} ms，"
+          f"共写入 {logger.get_stats()['written']} 条")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+静态响应基准测试 - 比较每次请求重新构造并序列化 /api/list 与使用预先序列化的响应
+
+不需要 Fusion 360：负载与插件 get_fusion_api_list 的结构相同（8 个分类，约 40 个 API）。
+
+用法:
+    python tests/benchmark_static_responses.py [重复次数]
+"""
+
+import os
+import sys
+import time
+
+# 添加插件目录到路径
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(project_root, "addin", "fusion360_mcp_addin"))
+
+import codec  # noqa: E402
+from compress import ResponseCompressor  # noqa: E402
+from static_responses import StaticResponseRegistry  # noqa: E402
+
+
+def api_list():
+    """模拟 get_fusion_api_list：每次调用都重新构造嵌套字典"""
+    categories = {
+        f"category{c}_apis": {
+            "name": f"分类{c}",
+            "description": "用于创建和编辑3D模型的核心设计功能",
+            "apis": [
+                {
+                    "name": f"features.feature{c}_{i}",
+                    "chinese_name": "拉伸特征",
+                    "description": "将2D草图拉伸成3D实体",
+                    "common_operations": ["add", "createInput", "setDistanceExtent", "setToExtent"],
+                }
+                for i in range(5)
+            ],
+        }
+        for c in range(8)
+    }
+    return {
+        "success": True,
+        "message": "Fusion 360 API 功能列表",
+        "statistics": {
+            "total_categories": len(categories),
+            "total_apis": sum(len(category["apis"]) for category in categories.values()),
+        },
+        "categories": categories,
+    }
+
+
+def measure(func, repeat):
+    started = time.process_time()
+    for _ in range(repeat):
+        func()
+    return (time.process_time() - started) / repeat * 1_000_000
+
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    compressor = ResponseCompressor()
+    data = api_list()
+    registry = StaticResponseRegistry()
+    slices = {name: dict(data, categories={name: category}) for name, category in data["categories"].items()}
+    route = registry.register("/api/list", data, slices=slices, slice_param="category")
+    health = registry.register("/api/health", {"status": "healthy", "message": "运行正常"})
+
+    cases = [
+        ("api_list 每次序列化", lambda: codec.encode(api_list())),
+        ("api_list 静态", lambda: route.select("").body(codec.JSON_TYPE)),
+        ("api_list gzip 每次", lambda: compressor.compress(codec.encode(api_list()), "gzip")),
+        ("api_list gzip 静态", lambda: route.select("").compressed(codec.JSON_TYPE, "gzip", compressor)),
+        ("category 每次过滤", lambda: codec.encode(dict(data, categories={"category3_apis": api_list()["categories"]["category3_apis"]}))),
+        ("category 静态切片", lambda: route.select("category=category3_apis").body(codec.JSON_TYPE)),
+        ("health 每次序列化", lambda: codec.encode({"status": "healthy", "message": "运行正常"})),
+        ("health 静态", lambda: health.select("").body(codec.JSON_TYPE)),
+    ]
+
+    print(f"重复 {repeat} 次，/api/list 响应 {len(route.response.body(codec.JSON_TYPE))} 字节\n")
+    print(f"{'场景':<20} {'每次请求 CPU µs':>16}")
+    for name, func in cases:
+        print(f"{name:<20} {measure(func, repeat):>16.2f}")
+
+
+if __name__ == "__main__":
+    main()
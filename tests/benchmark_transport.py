@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+传输方式基准测试 - 比较 TCP HTTP（HTTP/1.0 与 keep-alive）、Unix 域套接字 HTTP 和帧传输的请求延迟
+
+不需要 Fusion 360：在本进程中启动与插件相同结构的服务器，返回固定的 JSON 响应。
+
+用法:
+    python tests/benchmark_transport.py [请求数] [并发数]
+"""
+
+import asyncio
+import json
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from http.server import ThreadingHTTPServer
+
+import httpx
+
+# 添加项目根目录和插件目录到路径
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+sys.path.insert(0, os.path.join(project_root, "addin", "fusion360_mcp_addin"))
+
+from framed import FramedServer  # noqa: E402
+from http_server import (  # noqa: E402
+    KeepAliveHTTPServer,
+    KeepAliveRequestHandler,
+    UnixHTTPServer,
+)
+
+from src.fusion360_mcp.framed_transport import FramedTransport  # noqa: E402
+
+# 模拟 /api/objects 一页的响应
+PAYLOAD = json.dumps({
+    "success": True,
+    "objects": [
+        {"id": f"token-{i}", "name": f"实体{i}", "type": "body", "visible": True, "path": ""}
+        for i in range(20)
+    ]
+}, ensure_ascii=False).encode("utf-8")
+
+
+class BenchmarkHandler(KeepAliveRequestHandler):
+    """与插件 MCPRequestHandler 相同：HTTP/1.1 keep-alive"""
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(PAYLOAD)))
+        self.end_headers()
+        self.wfile.write(PAYLOAD)
+
+
+class LegacyHandler(BenchmarkHandler):
+    """旧版插件：HTTP/1.0，每个请求一个连接"""
+
+    protocol_version = "HTTP/1.0"
+
+
+def framed_handler(method, path, headers, body):
+    return 200, {"Content-Type": "application/json"}, PAYLOAD
+
+
+def start_thread(server):
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+async def run_client(name, client, url, requests, concurrency):
+    """先预热，再按给定并发数发送请求并统计延迟"""
+    for _ in range(10):
+        await client.get(url)
+
+    latencies = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with semaphore:
+            started = time.perf_counter()
+            response = await client.get(url)
+            response.json()
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*[one() for _ in range(requests)])
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    print(
+        f"{name:<12} {requests / elapsed:>9.0f} req/s   "
+        f"平均 {statistics.mean(latencies) * 1000:>6.3f} ms   "
+        f"p50 {latencies[len(latencies) // 2] * 1000:>6.3f} ms   "
+        f"p99 {latencies[int(len(latencies) * 0.99) - 1] * 1000:>6.3f} ms"
+    )
+
+
+async def main():
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 1
+
+    legacy_server = start_thread(ThreadingHTTPServer(("127.0.0.1", 0), LegacyHandler))
+    legacy_port = legacy_server.server_address[1]
+    tcp_server = start_thread(KeepAliveHTTPServer(("127.0.0.1", 0), BenchmarkHandler))
+    tcp_port = tcp_server.server_address[1]
+
+    framed_server = FramedServer("127.0.0.1", 0, framed_handler)
+    framed_server.start()
+
+    print(f"请求数 {requests}，并发 {concurrency}，响应 {len(PAYLOAD)} 字节\n")
+
+    async with httpx.AsyncClient() as client:
+        await run_client("HTTP/1.0", client, f"http://127.0.0.1:{legacy_port}/api/objects", requests, concurrency)
+
+    async with httpx.AsyncClient() as client:
+        await run_client("TCP HTTP", client, f"http://127.0.0.1:{tcp_port}/api/objects", requests, concurrency)
+
+    if UnixHTTPServer is not None:
+        uds_path = os.path.join(tempfile.mkdtemp(), "benchmark.sock")
+        start_thread(UnixHTTPServer(uds_path, BenchmarkHandler))
+        async with httpx.AsyncClient(transport=httpx.AsyncHTTPTransport(uds=uds_path)) as client:
+            await run_client("UDS HTTP", client, "http://localhost/api/objects", requests, concurrency)
+    else:
+        print("UDS HTTP     当前平台不支持 AF_UNIX，跳过")
+
+    transport = FramedTransport("127.0.0.1", framed_server.port, fallback=httpx.AsyncHTTPTransport())
+    async with httpx.AsyncClient(transport=transport) as client:
+        await run_client("帧传输", client, "http://localhost/api/objects", requests, concurrency)
+
+    framed_server.stop()
+    tcp_server.shutdown()
+    legacy_server.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,168 @@
+"""
+用于在 Linux 上测试插件代码的 adsk 模拟模块
+
+FakeApplication 用一个后台线程模拟 Fusion 360 的主线程事件循环，
+fireCustomEvent 触发的事件会在该线程上依次分发给处理器。
+"""
+
+import queue
+import sys
+import threading
+import types
+
+
+class CustomEventHandler:
+    """模拟 adsk.core.CustomEventHandler"""
+
+    def __init__(self):
+        pass
+
+    def notify(self, args):
+        pass
+
+
+class EventHandler:
+    """模拟 adsk.core 中的各类事件处理器基类"""
+
+    def __init__(self):
+        pass
+
+    def notify(self, args):
+        pass
+
+
+class FakeCollection(list):
+    """模拟 Fusion 的集合对象（BRepBodies、OccurrenceList 等）：count 和 item(索引)"""
+
+    @property
+    def count(self):
+        return len(self)
+
+    def item(self, index):
+        return self[index]
+
+
+class CustomEventArgs:
+    """模拟 adsk.core.CustomEventArgs"""
+
+    def __init__(self, additional_info=""):
+        self.additionalInfo = additional_info
+
+
+class FakeCustomEvent:
+    """模拟 adsk.core.CustomEvent"""
+
+    def __init__(self, event_id):
+        self.eventId = event_id
+        self.handlers = []
+
+    def add(self, handler):
+        self.handlers.append(handler)
+        return True
+
+    def remove(self, handler):
+        if handler in self.handlers:
+            self.handlers.remove(handler)
+        return True
+
+
+class FakeApplication:
+    """模拟 adsk.core.Application，自带主线程事件循环"""
+
+    def __init__(self):
+        self.custom_events = {}
+        self.fired = 0
+        self.activeDocument = None
+        self.activeProduct = None
+        self.activeViewport = None
+        self.userInterface = None
+        self.productName = "Fusion 360 (fake)"
+        self.version = "0.0.0"
+
+        self._loop_queue = queue.Queue()
+        self.main_thread = threading.Thread(target=self._run_loop, daemon=True)
+        self.main_thread.start()
+
+    def _run_loop(self):
+        while True:
+            item = self._loop_queue.get()
+            if item is None:
+                break
+            func = item
+            func()
+
+    def run_on_main(self, func, timeout=5):
+        """在模拟主线程中执行函数并等待结果"""
+        done = threading.Event()
+        result = {}
+
+        def wrapper():
+            try:
+                result["value"] = func()
+            except Exception as e:
+                result["error"] = e
+            finally:
+                done.set()
+
+        self._loop_queue.put(wrapper)
+        if not done.wait(timeout):
+            raise TimeoutError("模拟主线程执行超时")
+        if "error" in result:
+            raise result["error"]
+        return result.get("value")
+
+    def registerCustomEvent(self, event_id):
+        event = FakeCustomEvent(event_id)
+        self.custom_events[event_id] = event
+        return event
+
+    def unregisterCustomEvent(self, event_id):
+        return self.custom_events.pop(event_id, None) is not None
+
+    def fireCustomEvent(self, event_id, additional_info=""):
+        self.fired += 1
+
+        def dispatch():
+            event = self.custom_events.get(event_id)
+            if event:
+                for handler in list(event.handlers):
+                    handler.notify(CustomEventArgs(additional_info))
+
+        self._loop_queue.put(dispatch)
+        return True
+
+    def shutdown(self):
+        self._loop_queue.put(None)
+        self.main_thread.join(timeout=5)
+
+
+def install(app=None):
+    """把模拟的 adsk 模块注册到 sys.modules，返回 (adsk 模块, 应用实例)"""
+    app = app or FakeApplication()
+
+    adsk = types.ModuleType("adsk")
+    core = types.ModuleType("adsk.core")
+    fusion = types.ModuleType("adsk.fusion")
+
+    core.CustomEventHandler = CustomEventHandler
+    core.CustomEventArgs = CustomEventArgs
+    core.Application = types.SimpleNamespace(get=lambda: app)
+    core.VisualStyles = types.SimpleNamespace(ShadedVisualStyle=0, ShadedWithVisibleEdgesOnlyVisualStyle=1)
+    core.SaveImageFileOptions = types.SimpleNamespace(
+        create=lambda path: types.SimpleNamespace(filename=path, width=0, height=0, isAntiAliased=True)
+    )
+    for name in ("DocumentEventHandler", "ApplicationCommandEventHandler",
+                 "ActiveSelectionEventHandler", "CameraEventHandler"):
+        setattr(core, name, type(name, (EventHandler,), {}))
+
+    # 测试中的 activeProduct 就是设计对象
+    fusion.Design = types.SimpleNamespace(cast=lambda product: product)
+
+    adsk.core = core
+    adsk.fusion = fusion
+
+    sys.modules["adsk"] = adsk
+    sys.modules["adsk.core"] = core
+    sys.modules["adsk.fusion"] = fusion
+
+    return adsk, app
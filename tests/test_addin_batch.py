@@ -0,0 +1,100 @@
+"""
+插件批量操作执行器的单元测试
+"""
+
+import os
+import sys
+
+ADDIN_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "addin", "fusion360_mcp_addin"
+)
+sys.path.insert(0, ADDIN_DIR)
+
+import pytest  # noqa: E402
+from batch import BatchReferenceError, execute_batch, resolve_references  # noqa: E402
+
+
+def make_handlers(calls):
+    counter = {"n": 0}
+
+    def create(data):
+        calls.append(data)
+        counter["n"] += 1
+        return {"success": True, "object_id": f"token_{counter['n']}"}
+
+    def edit(data):
+        calls.append(data)
+        return {"success": True, "object_id": data["parameters"]["object_id"]}
+
+    def fail(data):
+        calls.append(data)
+        return {"success": False, "error": "失败了"}
+
+    return {"create_object": create, "edit_object": edit, "fail": fail}
+
+
+class TestExecuteBatch:
+    """execute_batch 测试类"""
+
+    def test_references_to_earlier_results(self):
+        """测试引用前面操作返回的 ID"""
+        calls = []
+        result = execute_batch([
+            {"action": "create_object", "parameters": {}, "ref": "cyl"},
+            {"action": "edit_object", "parameters": {"object_id": "${cyl.object_id}"}},
+            {"action": "edit_object", "parameters": {"object_id": "${0.object_id}", "tags": ["${1.object_id}"]}}
+        ], make_handlers(calls))
+
+        assert result["success"] is True
+        assert result["completed"] == 3
+        assert calls[1]["parameters"]["object_id"] == "token_1"
+        assert calls[2]["parameters"]["tags"] == ["token_1"]
+        assert result["results"][0]["ref"] == "cyl"
+
+    def test_stop_on_error_skips_rest(self):
+        """测试遇错停止模式跳过后续操作"""
+        calls = []
+        result = execute_batch([
+            {"action": "create_object"},
+            {"action": "fail"},
+            {"action": "create_object"}
+        ], make_handlers(calls))
+
+        assert result["success"] is False
+        assert (result["completed"], result["failed"], result["skipped"]) == (1, 1, 1)
+        assert len(calls) == 2
+        assert result["results"][2]["skipped"] is True
+
+    def test_continue_mode_runs_all(self):
+        """测试继续模式执行所有操作"""
+        calls = []
+        result = execute_batch([
+            {"action": "fail"},
+            {"action": "unknown"},
+            {"action": "create_object"}
+        ], make_handlers(calls), mode="continue")
+
+        assert (result["completed"], result["failed"], result["skipped"]) == (1, 2, 0)
+        assert "unknown" in result["results"][1]["error"]
+
+    def test_reference_to_failed_operation(self):
+        """测试引用失败的操作会使当前操作失败"""
+        result = execute_batch([
+            {"action": "fail", "ref": "bad"},
+            {"action": "edit_object", "parameters": {"object_id": "${bad.object_id}"}}
+        ], make_handlers([]), mode="continue")
+
+        assert result["failed"] == 2
+        assert "bad" in result["results"][1]["error"]
+
+    def test_invalid_mode(self):
+        """测试不支持的模式"""
+        result = execute_batch([], {}, mode="abort")
+        assert result["success"] is False
+
+    def test_resolve_references_keeps_plain_strings(self):
+        """测试普通字符串与缺失字段"""
+        assert resolve_references("plain ${x", {}) == "plain ${x"
+        with pytest.raises(BatchReferenceError):
+            resolve_references("${a.missing}", {"a": {"object_id": 1}})
@@ -0,0 +1,68 @@
+"""
+插件消息编码协商的单元测试
+"""
+
+import json
+import os
+import sys
+
+import pytest
+
+ADDIN_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "addin", "fusion360_mcp_addin"
+)
+sys.path.insert(0, ADDIN_DIR)
+
+import codec  # noqa: E402
+
+
+def test_json_is_default():
+    """测试没有 Accept 或只接受 JSON 时使用 JSON"""
+    assert codec.negotiate(None) == codec.JSON_TYPE
+    assert codec.negotiate("application/json") == codec.JSON_TYPE
+    assert codec.negotiate("*/*") == codec.JSON_TYPE
+    assert codec.negotiate("text/html") == codec.JSON_TYPE
+
+
+def test_json_round_trip():
+    """测试 JSON 编码保留非 ASCII 字符"""
+    body = codec.encode({"name": "实体1"})
+    assert body == '{"name": "实体1"}'.encode("utf-8")
+    assert codec.decode(body, "application/json; charset=utf-8") == {"name": "实体1"}
+    assert codec.decode(b"", "application/json") is None
+
+
+def test_unsupported_request_type():
+    """测试无法解析的请求体编码"""
+    with pytest.raises(codec.UnsupportedMediaType):
+        codec.decode(b"a=1", "application/x-www-form-urlencoded")
+
+
+def test_msgpack_negotiation(monkeypatch):
+    """测试按 q 值选择 MessagePack，插件没有 msgpack 时回退到 JSON"""
+    pytest.importorskip("msgpack")
+    accept = "application/msgpack, application/json;q=0.5"
+    assert codec.negotiate(accept) == codec.MSGPACK_TYPE
+    assert codec.negotiate("application/x-msgpack") == codec.MSGPACK_TYPE
+    assert codec.negotiate("application/json, application/msgpack;q=0.5") == codec.JSON_TYPE
+
+    monkeypatch.setattr(codec, "msgpack", None)
+    assert codec.negotiate(accept) == codec.JSON_TYPE
+    assert codec.supported_types() == (codec.JSON_TYPE,)
+    with pytest.raises(codec.UnsupportedMediaType):
+        codec.decode(b"\x80", codec.MSGPACK_TYPE)
+
+
+def test_msgpack_round_trip():
+    """测试 MessagePack 往返结果与 JSON 一致且更小"""
+    pytest.importorskip("msgpack")
+    data = {
+        "success": True,
+        "camera": {"eye": [120.25, -80.5, 64.125], "up": [0.0, 0.0, 1.0]},
+        "points": [[i * 0.1, i * 0.2, i * 0.3] for i in range(100)],
+    }
+    body = codec.encode(data, codec.MSGPACK_TYPE)
+    assert codec.decode(body, codec.MSGPACK_TYPE) == data
+    assert len(body) < len(codec.encode(data))
+    assert json.loads(codec.encode(data)) == data
@@ -0,0 +1,68 @@
+"""
+插件响应压缩的单元测试
+"""
+
+import gzip
+import os
+import sys
+
+import pytest
+
+ADDIN_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "addin", "fusion360_mcp_addin"
+)
+sys.path.insert(0, ADDIN_DIR)
+
+import compress  # noqa: E402
+from compress import ResponseCompressor, choose_encoding  # noqa: E402
+
+BODY = ('{"objects": [' + ", ".join(f'{{"name": "实体{i}"}}' for i in range(200)) + "]}").encode("utf-8")
+
+
+def test_choose_encoding(monkeypatch):
+    """测试按 q 值选择编码，不支持的编码被忽略"""
+    monkeypatch.setattr(compress, "zstandard", None)
+    assert choose_encoding(None) is None
+    assert choose_encoding("br") is None
+    assert choose_encoding("gzip, deflate") == "gzip"
+    assert choose_encoding("gzip;q=0") is None
+    assert choose_encoding("*") == "gzip"
+    assert choose_encoding("zstd, gzip;q=0.5") == "gzip"
+
+
+def test_prefers_zstd_when_available():
+    """测试安装 zstandard 时优先使用 zstd"""
+    zstandard = pytest.importorskip("zstandard")
+    assert choose_encoding("gzip, zstd") == "zstd"
+    assert choose_encoding("zstd;q=0.5, gzip") == "gzip"
+
+    body, encoding = ResponseCompressor().compress(BODY, "zstd")
+    assert encoding == "zstd"
+    assert zstandard.ZstdDecompressor().decompress(body) == BODY
+
+
+def test_gzip_above_threshold(monkeypatch):
+    """测试超过阈值的响应压缩，统计压缩比和 CPU 时间"""
+    monkeypatch.setattr(compress, "zstandard", None)
+    compressor = ResponseCompressor(min_size=1024)
+
+    body, encoding = compressor.compress(BODY, "gzip")
+    assert encoding == "gzip"
+    assert gzip.decompress(body) == BODY
+
+    stats = compressor.get_stats()["encodings"]["gzip"]
+    assert stats["responses"] == 1
+    assert stats["bytes_in"] == len(BODY)
+    assert stats["bytes_out"] == len(body)
+    assert stats["ratio"] > 5
+    assert stats["cpu_time"] >= 0
+
+
+def test_small_or_unaccepted_responses_unchanged():
+    """测试小于阈值或客户端不接受压缩时原样返回"""
+    compressor = ResponseCompressor(min_size=1024)
+    assert compressor.compress(b'{"success": true}', "gzip") == (b'{"success": true}', None)
+    assert compressor.compress(BODY, None) == (BODY, None)
+    assert compressor.get_stats()["skipped"] == 2
+    assert compressor.get_stats()["encodings"] == {}
@@ -0,0 +1,173 @@
+"""
+插件主线程调度器的单元测试（使用模拟的 adsk 事件循环）
+"""
+
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+from tests import fake_adsk
+
+ADDIN_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "addin", "fusion360_mcp_addin"
+)
+sys.path.insert(0, ADDIN_DIR)
+
+fake_adsk.install()
+
+from dispatcher import (  # noqa: E402
+    DeadlineExceededError,
+    DispatcherStoppedError,
+    MainThreadDispatcher,
+    QueueFullError,
+)
+
+
+class TestMainThreadDispatcher:
+    """MainThreadDispatcher 测试类"""
+
+    @pytest.fixture
+    def app(self):
+        app = fake_adsk.FakeApplication()
+        yield app
+        app.shutdown()
+
+    @pytest.fixture
+    def dispatcher(self, app):
+        dispatcher = MainThreadDispatcher(app, "test_event", max_depth=4, batch_size=2)
+        app.run_on_main(dispatcher.start)
+        yield dispatcher
+        dispatcher.stop()
+
+    def test_jobs_run_on_main_thread(self, app, dispatcher):
+        """测试任务在主线程中执行"""
+        result = dispatcher.call(threading.get_ident, timeout=5)
+        assert result == app.main_thread.ident
+        assert result != threading.get_ident()
+
+    def test_exception_propagates_to_caller(self, dispatcher):
+        """测试任务异常传递给等待方"""
+        def boom():
+            raise ValueError("失败")
+
+        with pytest.raises(ValueError):
+            dispatcher.call(boom, timeout=5)
+        assert dispatcher.get_stats()["failed"] == 1
+
+    def test_queue_full_raises(self, app, dispatcher):
+        """测试队列满时拒绝新任务"""
+        gate = threading.Event()
+        # 占住主线程，使后续任务只能排队
+        app._loop_queue.put(lambda: gate.wait(5))
+
+        futures = [dispatcher.submit(lambda: None) for _ in range(4)]
+        with pytest.raises(QueueFullError):
+            dispatcher.submit(lambda: None)
+
+        gate.set()
+        for future in futures:
+            future.result(timeout=5)
+
+        stats = dispatcher.get_stats()
+        assert stats["rejected"] == 1
+        assert stats["completed"] == 4
+
+    def test_drain_runs_in_batches(self, app, dispatcher):
+        """测试每次事件最多执行 batch_size 个任务"""
+        gate = threading.Event()
+        app._loop_queue.put(lambda: gate.wait(5))
+
+        futures = [dispatcher.submit(time.monotonic) for _ in range(4)]
+        fired_before = app.fired
+        gate.set()
+        for future in futures:
+            future.result(timeout=5)
+
+        # 4 个任务、每批 2 个，需要再额外触发一次事件
+        assert app.fired - fired_before >= 1
+
+    def test_submit_from_main_thread_runs_inline(self, app, dispatcher):
+        """测试在主线程中提交的任务直接执行"""
+        future = app.run_on_main(lambda: dispatcher.submit(lambda: 42))
+        assert future.done()
+        assert future.result() == 42
+
+    def test_stop_fails_pending_jobs(self, app):
+        """测试停止时未执行的任务失败"""
+        dispatcher = MainThreadDispatcher(app, "stop_event", max_depth=4)
+        app.run_on_main(dispatcher.start)
+
+        gate = threading.Event()
+        app._loop_queue.put(lambda: gate.wait(5))
+        future = dispatcher.submit(lambda: None)
+        dispatcher.stop()
+        gate.set()
+
+        with pytest.raises(DispatcherStoppedError):
+            future.result(timeout=5)
+        with pytest.raises(DispatcherStoppedError):
+            dispatcher.submit(lambda: None)
+
+    def test_expired_jobs_are_dropped(self, app, dispatcher):
+        """测试出队时已超过截止时间的任务不会执行"""
+        gate = threading.Event()
+        app._loop_queue.put(lambda: gate.wait(5))
+
+        executed = []
+        future = dispatcher.submit(executed.append, 1, deadline=time.monotonic() + 0.01)
+        time.sleep(0.05)
+        gate.set()
+
+        with pytest.raises(DeadlineExceededError):
+            future.result(timeout=5)
+        assert executed == []
+        assert dispatcher.get_stats()["expired"] == 1
+
+    def test_call_with_past_deadline_is_rejected(self, dispatcher):
+        """测试到达时已过期的请求不会入队"""
+        with pytest.raises(DeadlineExceededError):
+            dispatcher.call(lambda: None, deadline=time.monotonic() - 1)
+        assert dispatcher.get_stats()["submitted"] == 0
+
+    def test_wake_runs_on_drain_on_main_thread(self, app):
+        """测试没有任务时 wake 也会在主线程中执行 on_drain"""
+        called = threading.Event()
+        threads = []
+
+        def on_drain():
+            threads.append(threading.get_ident())
+            called.set()
+
+        dispatcher = MainThreadDispatcher(app, "test_event", on_drain=on_drain)
+        dispatcher.wake()  # 未启动时忽略
+        app.run_on_main(dispatcher.start)
+        try:
+            dispatcher.wake()
+            assert called.wait(5)
+            assert threads[0] == app.main_thread.ident
+        finally:
+            dispatcher.stop()
+
+    def test_on_job_done_reports_timings(self, app):
+        """测试每个任务执行后报告标签、排队时间和执行时间"""
+        timings = []
+        dispatcher = MainThreadDispatcher(
+            app, "test_event", on_job_done=lambda *args: timings.append(args)
+        )
+        app.run_on_main(dispatcher.start)
+        try:
+            dispatcher.call(time.sleep, 0.05, timeout=5, label="/api/view")
+            with pytest.raises(ValueError):
+                dispatcher.call(int, "x", timeout=5)
+        finally:
+            dispatcher.stop()
+
+        (label, wait, elapsed), (failed_label, _, _) = timings
+        assert label == "/api/view"
+        assert wait >= 0
+        assert elapsed >= 0.05
+        assert failed_label is None
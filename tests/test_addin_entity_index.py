@@ -0,0 +1,94 @@
+"""
+插件实体索引的单元测试
+"""
+
+import os
+import sys
+
+ADDIN_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "addin", "fusion360_mcp_addin"
+)
+sys.path.insert(0, ADDIN_DIR)
+
+from entity_index import EntityIndex  # noqa: E402
+
+
+class FakeEntity:
+    def __init__(self, token, object_type="adsk::fusion::BRepBody"):
+        self.entityToken = token
+        self.objectType = object_type
+        self.isValid = True
+
+
+class FakeDesign:
+    def __init__(self, *entities):
+        self.entities = {entity.entityToken: entity for entity in entities}
+        self.lookups = 0
+
+    def findEntityByToken(self, token):
+        self.lookups += 1
+        entity = self.entities.get(token)
+        return [entity] if entity else []
+
+
+def test_hit_after_add():
+    """测试登记后的查找不再调用 findEntityByToken"""
+    entity = FakeEntity("t1")
+    design = FakeDesign(entity)
+    index = EntityIndex()
+    index.add("t1", entity)
+
+    assert index.resolve("t1", design) is entity
+    assert design.lookups == 0
+    assert index.get_stats()["hits"] == 1
+
+
+def test_miss_falls_back_and_caches():
+    """测试未命中时回退到 findEntityByToken 并写回索引"""
+    entity = FakeEntity("t1")
+    design = FakeDesign(entity)
+    index = EntityIndex()
+
+    assert index.resolve("t1", design) is entity
+    assert index.resolve("t1", design) is entity
+    assert design.lookups == 1
+
+    stats = index.get_stats()
+    assert stats["misses"] == 1
+    assert stats["hits"] == 1
+
+
+def test_invalid_entity_is_re_resolved():
+    """测试失效的实体被丢弃并重新解析"""
+    old = FakeEntity("t1")
+    index = EntityIndex()
+    index.add("t1", old)
+    old.isValid = False
+
+    fresh = FakeEntity("t1")
+    assert index.resolve("t1", FakeDesign(fresh)) is fresh
+    assert index.get_stats()["stale"] == 1
+
+
+def test_not_found_remove_and_accept():
+    """测试查找不到、移除和类型过滤"""
+    index = EntityIndex()
+    design = FakeDesign(FakeEntity("sketch", "adsk::fusion::Sketch"))
+
+    assert index.resolve("missing", design) is None
+    assert index.resolve("sketch", design, accept=lambda e: e.objectType.endswith("BRepBody")) is None
+    assert index.get_stats()["not_found"] == 2
+
+    index.add("t1", FakeEntity("t1"))
+    index.remove("t1")
+    assert index.get_stats()["entries"] == 0
+
+
+def test_lru_bound():
+    """测试超出容量时淘汰最久未使用的条目"""
+    index = EntityIndex(max_entries=2)
+    for token in ("a", "b", "c"):
+        index.add(token, FakeEntity(token))
+    assert index.get_stats()["entries"] == 2
+    assert index.resolve("a", FakeDesign()) is None
@@ -0,0 +1,196 @@
+"""
+插件对象枚举与分页的单元测试
+"""
+
+import os
+import sys
+
+import pytest
+
+from tests.fake_adsk import FakeCollection
+
+ADDIN_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "addin", "fusion360_mcp_addin"
+)
+sys.path.insert(0, ADDIN_DIR)
+
+from enumeration import (  # noqa: E402
+    ObjectQuery,
+    ObjectQueryError,
+    decode_cursor,
+    encode_cursor,
+    list_objects,
+)
+
+
+class FakeBody:
+    def __init__(self, name, visible=True):
+        self.name = name
+        self.isVisible = visible
+        self.entityToken = f"token-{name}"
+        self.material = None
+
+
+class FakeComponent:
+    def __init__(self, name, bodies=(), occurrences=()):
+        self.name = name
+        self.bRepBodies = FakeCollection(bodies)
+        self.allOccurrences = FakeCollection(occurrences)
+
+
+class FakeOccurrence:
+    def __init__(self, path, bodies=(), visible=True):
+        self.name = path.split('+')[-1]
+        self.fullPathName = path
+        self.isVisible = visible
+        self.entityToken = f"token-{path}"
+        self.component = FakeComponent(self.name.split(':')[0])
+        self.bRepBodies = FakeCollection(bodies)
+
+
+@pytest.fixture
+def root():
+    return FakeComponent("root", bodies=[FakeBody(f"Base{i}") for i in range(3)], occurrences=[
+        FakeOccurrence("Frame:1", bodies=[FakeBody("Bolt1"), FakeBody("Bolt2", visible=False)]),
+        FakeOccurrence("Frame:1+Plate:1", bodies=[FakeBody("Plate")]),
+    ])
+
+
+def test_traverses_occurrences(root):
+    """测试遍历根组件和所有子装配"""
+    result = list_objects(root, ObjectQuery(page_size=100))
+    names = [obj["name"] for obj in result["objects"]]
+    assert names == ["Base0", "Base1", "Base2", "Frame:1", "Bolt1", "Bolt2", "Plate:1", "Plate"]
+    assert result["objects"][4]["path"] == "Frame:1"
+    assert result["has_more"] is False
+    assert result["next_cursor"] is None
+
+
+def test_pagination_with_cursor(root):
+    """测试按游标分页且不重复、不遗漏"""
+    seen = []
+    cursor = None
+    while True:
+        result = list_objects(root, ObjectQuery(page_size=3, cursor=cursor), revision=7)
+        seen.extend(obj["id"] for obj in result["objects"])
+        assert result["count"] <= 3
+        cursor = result["next_cursor"]
+        if not cursor:
+            break
+    assert len(seen) == len(set(seen)) == 8
+
+
+def test_cursor_resumes_inside_occurrence(root):
+    """测试游标可以停在子装配的实体之间，下一页从该实体继续"""
+    first = list_objects(root, ObjectQuery(page_size=4))
+    assert [obj["name"] for obj in first["objects"]] == ["Base0", "Base1", "Base2", "Frame:1"]
+    assert decode_cursor(first["next_cursor"])[0] == (0, 0)
+
+    second = list_objects(root, ObjectQuery(page_size=2, cursor=first["next_cursor"]))
+    assert [obj["name"] for obj in second["objects"]] == ["Bolt1", "Bolt2"]
+    third = list_objects(root, ObjectQuery(page_size=2, cursor=second["next_cursor"]))
+    assert [obj["name"] for obj in third["objects"]] == ["Plate:1", "Plate"]
+    assert third["has_more"] is False
+
+
+def test_paging_does_not_rescan_earlier_pages():
+    """测试翻页不再读取之前各页对象的属性，浏览全部对象的读取次数与对象数成正比"""
+    class CountingBody(FakeBody):
+        reads = 0
+
+        @property
+        def name(self):
+            CountingBody.reads += 1
+            return self._name
+
+        @name.setter
+        def name(self, value):
+            self._name = value
+
+    occurrences = [FakeOccurrence(f"Part:{i}", bodies=[CountingBody(f"P{i}")]) for i in range(100)]
+    root = FakeComponent("root", bodies=[CountingBody(f"B{i}") for i in range(100)], occurrences=occurrences)
+
+    seen, pages, cursor = 0, 0, None
+    while True:
+        result = list_objects(root, ObjectQuery(object_type="body", name="*", page_size=10, cursor=cursor, fields="id"))
+        seen += result["count"]
+        pages += 1
+        cursor = result["next_cursor"]
+        if not cursor:
+            break
+
+    assert seen == 200
+    # 每页只多读一次（下一页第一个对象的过滤判断）；每页从头扫描时约为 200 * 20 / 2 次
+    assert CountingBody.reads <= seen + pages
+
+
+def test_filters(root):
+    """测试类型、名称通配符、可见性和组件路径过滤"""
+    bolts = list_objects(root, ObjectQuery.from_params({"name": ["Bolt*"]}))
+    assert [obj["name"] for obj in bolts["objects"]] == ["Bolt1", "Bolt2"]
+
+    hidden = list_objects(root, ObjectQuery.from_params({"visible": ["false"]}))
+    assert [obj["name"] for obj in hidden["objects"]] == ["Bolt2"]
+
+    occurrences = list_objects(root, ObjectQuery(object_type="occurrence"))
+    assert [obj["type"] for obj in occurrences["objects"]] == ["occurrence", "occurrence"]
+
+    nested = list_objects(root, ObjectQuery(object_type="body", component="Frame:1+*"))
+    assert [obj["name"] for obj in nested["objects"]] == ["Plate"]
+
+
+def test_stale_cursor_flagged(root):
+    """测试设计版本号变化后游标被标记为过期"""
+    result = list_objects(root, ObjectQuery(cursor=encode_cursor((-1, 2), 1)), revision=2)
+    assert result["stale_cursor"] is True
+    assert result["objects"][0]["name"] == "Base2"
+
+
+def test_invalid_parameters():
+    """测试无效参数和游标"""
+    with pytest.raises(ObjectQueryError):
+        ObjectQuery(object_type="sketch")
+    with pytest.raises(ObjectQueryError):
+        ObjectQuery(page_size=0)
+    with pytest.raises(ObjectQueryError):
+        ObjectQuery(visible="maybe")
+    with pytest.raises(ObjectQueryError):
+        decode_cursor("not-a-cursor")
+    assert ObjectQuery(page_size=10000).page_size == 500
+    with pytest.raises(ObjectQueryError):
+        decode_cursor(encode_cursor((-1, -1), 3))
+    assert decode_cursor(encode_cursor((12, -1), 3)) == ((12, -1), 3)
+
+
+def test_field_projection(root):
+    """测试只计算请求的字段，昂贵字段默认不计算"""
+    class CountingBody(FakeBody):
+        reads = 0
+
+        @property
+        def material(self):
+            CountingBody.reads += 1
+            return None
+
+        @material.setter
+        def material(self, value):
+            pass
+
+        @property
+        def boundingBox(self):
+            raise AssertionError("默认不应计算包围盒")
+
+    root.bRepBodies = FakeCollection([CountingBody("A")])
+    root.allOccurrences = FakeCollection()
+
+    result = list_objects(root, ObjectQuery(fields="id,name"))
+    assert result["objects"] == [{"id": "token-A", "name": "A"}]
+    assert CountingBody.reads == 0
+
+    result = list_objects(root, ObjectQuery())
+    assert result["objects"][0]["material"] == "默认"
+    assert CountingBody.reads == 1
+
+    with pytest.raises(ObjectQueryError):
+        ObjectQuery(fields="id,secret")
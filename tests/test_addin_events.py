@@ -0,0 +1,70 @@
+"""
+插件事件推送的单元测试
+"""
+
+import json
+import os
+import sys
+import threading
+
+import pytest
+
+ADDIN_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "addin", "fusion360_mcp_addin"
+)
+sys.path.insert(0, ADDIN_DIR)
+
+from events import EventBroadcaster, format_sse  # noqa: E402
+
+
+def test_publish_to_all_subscribers():
+    """测试事件分发给所有订阅者，ID 递增"""
+    broadcaster = EventBroadcaster(clock=lambda: 1.0)
+    first, second = broadcaster.subscribe(), broadcaster.subscribe()
+
+    broadcaster.publish('design', {"revision": 3})
+    broadcaster.publish('selection', {"count": 0, "ids": []})
+
+    for subscription in (first, second):
+        assert subscription.get(timeout=1) == {
+            "id": 1, "type": "design", "time": 1.0, "data": {"revision": 3}
+        }
+        assert subscription.get(timeout=1)["id"] == 2
+        assert subscription.get(timeout=0.01) is None
+
+    broadcaster.unsubscribe(first)
+    assert broadcaster.get_stats()["subscribers"] == 1
+
+
+def test_slow_subscriber_drops_oldest():
+    """测试订阅者队列满时丢弃最旧的事件"""
+    broadcaster = EventBroadcaster(max_pending=2)
+    subscription = broadcaster.subscribe()
+    for revision in range(3):
+        broadcaster.publish('design', {"revision": revision})
+
+    assert subscription.get(timeout=1)["data"]["revision"] == 1
+    assert subscription.get(timeout=1)["data"]["revision"] == 2
+    assert broadcaster.get_stats()["dropped"] == 1
+
+
+def test_get_waits_for_publish_from_other_thread():
+    """测试订阅者阻塞等待其他线程发布的事件"""
+    broadcaster = EventBroadcaster()
+    subscription = broadcaster.subscribe()
+    threading.Timer(0.05, broadcaster.publish, args=('timeline',)).start()
+    assert subscription.get(timeout=5)["type"] == "timeline"
+
+
+def test_format_sse_and_invalid_type():
+    """测试 SSE 帧格式和无效事件类型"""
+    frame = format_sse({"id": 7, "type": "document", "data": {"document": "零件"}}).decode('utf-8')
+    lines = frame.split("\n")
+    assert lines[0] == "id: 7"
+    assert lines[1] == "event: document"
+    assert json.loads(lines[2][len("data: "):])["data"]["document"] == "零件"
+    assert frame.endswith("\n\n")
+
+    with pytest.raises(ValueError):
+        EventBroadcaster().publish('camera')
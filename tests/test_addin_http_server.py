@@ -0,0 +1,101 @@
+"""
+插件 HTTP/1.1 keep-alive 服务器的单元测试
+"""
+
+import json
+import os
+import socket
+import sys
+import threading
+import time
+
+import httpx
+import pytest
+
+ADDIN_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "addin", "fusion360_mcp_addin"
+)
+sys.path.insert(0, ADDIN_DIR)
+
+from http_server import KeepAliveHTTPServer, KeepAliveRequestHandler  # noqa: E402
+
+
+class Handler(KeepAliveRequestHandler):
+    """/slow 模拟等待主线程的截图，其余路径立即返回"""
+
+    def do_GET(self):
+        if self.path == "/slow":
+            time.sleep(0.5)
+        self.send_body({"path": self.path})
+
+    def do_POST(self):
+        body = self.read_body()
+        self.send_body({"path": self.path, "size": len(body)})
+
+    def send_body(self, data):
+        body = json.dumps(data).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def server():
+    server = KeepAliveHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.close_connections()
+    server.server_close()
+
+
+def url(server, path):
+    return f"http://127.0.0.1:{server.server_address[1]}{path}"
+
+
+def test_keep_alive_reuses_connection(server):
+    """测试同一客户端的多个请求复用一个连接，请求体被完整读取"""
+    with httpx.Client() as client:
+        for _ in range(3):
+            assert client.get(url(server, "/api/health")).json() == {"path": "/api/health"}
+        assert client.post(url(server, "/api/object"), content=b"x" * 1000).json()["size"] == 1000
+        assert client.get(url(server, "/api/health")).status_code == 200
+
+    stats = server.get_stats()
+    assert stats["accepted"] == 1
+    assert stats["requests"] == 5
+    assert stats["reused"] == 4
+
+
+def test_health_not_blocked_by_slow_request(server):
+    """测试慢请求进行中，其他连接上的健康检查不受影响"""
+    slow = threading.Thread(target=lambda: httpx.get(url(server, "/slow"), timeout=5))
+    slow.start()
+    time.sleep(0.05)
+
+    with httpx.Client() as client:
+        client.get(url(server, "/api/health"))
+        started = time.perf_counter()
+        for _ in range(10):
+            client.get(url(server, "/api/health"))
+        elapsed = (time.perf_counter() - started) / 10
+
+    slow.join()
+    # 远小于慢请求的 500ms，也没有 Nagle/延迟确认造成的 40ms 停顿
+    assert elapsed < 0.03
+
+
+def test_close_connections(server):
+    """测试停止时关闭空闲的 keep-alive 连接"""
+    sock = socket.create_connection(server.server_address)
+    sock.sendall(b"GET /api/health HTTP/1.1\r\nHost: localhost\r\n\r\n")
+    assert b"200 OK" in sock.recv(4096)
+    assert server.get_stats()["connections"] == 1
+
+    server.close_connections()
+    sock.settimeout(2)
+    assert sock.recv(4096) == b""
+    sock.close()
@@ -0,0 +1,91 @@
+"""
+插件变更日志的单元测试
+"""
+
+import os
+import sys
+
+import pytest
+
+ADDIN_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "addin", "fusion360_mcp_addin"
+)
+sys.path.insert(0, ADDIN_DIR)
+
+from journal import ChangeJournal  # noqa: E402
+
+
+def test_changes_since_revision():
+    """测试只返回 since 之后的变化，同一次提交共享版本号"""
+    journal = ChangeJournal()
+    journal.note('created', 'f1', 'feature')
+    journal.note('created', 'b1', 'body')
+    journal.commit(1)
+    journal.note('deleted', 'b1', 'body')
+    journal.commit(2)
+
+    result = journal.since(0, 2)
+    assert [(c["revision"], c["type"], c["id"]) for c in result["changes"]] == [
+        (1, 'created', 'f1'), (1, 'created', 'b1'), (2, 'deleted', 'b1')
+    ]
+    assert result["resync_required"] is False
+
+    result = journal.since(1, 2)
+    assert [c["id"] for c in result["changes"]] == ['b1']
+    assert journal.since(2, 2)["changes"] == []
+
+
+def test_overflow_requires_resync():
+    """测试环形缓冲覆盖了客户端未读的条目时要求全量同步"""
+    journal = ChangeJournal(max_entries=2)
+    for revision in (1, 2, 3):
+        journal.note('modified', f't{revision}')
+        journal.commit(revision)
+
+    assert journal.since(0, 3)["resync_required"] is True
+    assert journal.since(0, 3)["reason"] == 'journal_overflow'
+    result = journal.since(1, 3)
+    assert result["resync_required"] is False
+    assert [c["id"] for c in result["changes"]] == ['t2', 't3']
+
+
+def test_reset_and_revision_ahead():
+    """测试无法跟踪的变化和插件重启后要求全量同步"""
+    journal = ChangeJournal()
+    journal.note('created', 't1')
+    journal.reset(5, 'document_activated')
+    journal.commit(6)
+
+    result = journal.since(4, 6)
+    assert result["resync_required"] is True
+    assert result["reason"] == 'document_activated'
+    assert journal.since(5, 6)["resync_required"] is False
+    assert journal.since(9, 6)["reason"] == 'revision_ahead'
+
+
+def test_epoch_change_requires_resync():
+    """测试插件重新加载后，版本号追上旧 since 时仍按 epoch 要求全量同步"""
+    before = ChangeJournal(epoch='old')
+    before.note('modified', 't1')
+    before.commit(3)
+    token = before.since(0, 3)["revision_token"]
+    assert token == 'old:3'
+
+    reloaded = ChangeJournal(epoch='new')
+    for revision in (1, 2, 3, 4):
+        reloaded.note('modified', f'n{revision}')
+        reloaded.commit(revision)
+
+    result = reloaded.since(3, 4, epoch='old')
+    assert result["resync_required"] is True
+    assert result["reason"] == 'epoch_changed'
+    assert result["changes"] == []
+    assert result["revision_token"] == 'new:4'
+    assert [c["id"] for c in reloaded.since(3, 4, epoch='new')["changes"]] == ['n4']
+
+
+def test_invalid_change_type():
+    """测试不支持的变化类型"""
+    with pytest.raises(ValueError):
+        ChangeJournal().note('renamed', 't1')
@@ -0,0 +1,146 @@
+"""
+插件日志模块的单元测试
+"""
+
+import os
+import sys
+
+ADDIN_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "addin", "fusion360_mcp_addin"
+)
+sys.path.insert(0, ADDIN_DIR)
+
+from addin_log import (  # noqa: E402
+    DEBUG,
+    ERROR,
+    INFO,
+    AddinLogger,
+    PathSampler,
+    truncate,
+)
+
+
+class CountingRepr:
+    """记录 repr 被调用的次数，用于验证延迟格式化"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def __repr__(self):
+        self.calls += 1
+        return "payload"
+
+
+def test_truncate():
+    """测试长参数被截断，数字保持原样"""
+    assert truncate("abc", 10) == "abc"
+    assert truncate("x" * 50, 10) == "x" * 10 + "...（共 50 字符）"
+    assert truncate(42, 1) == 42
+    assert truncate({"code": "y" * 100}, 20).startswith("{'code': 'yyyyyyyyy")
+
+
+def test_level_filter_and_lazy_format():
+    """测试低于级别的调用不入队，格式化推迟到 flush"""
+    logger = AddinLogger(level=INFO)
+    payload = CountingRepr()
+
+    logger.debug("请求数据: %s", payload)
+    assert logger.get_stats()["pending"] == 0
+
+    logger.info("请求数据: %s", payload)
+    assert payload.calls == 0
+    logger.flush()
+    assert payload.calls == 1
+    assert logger.recent()[-1]["message"] == "请求数据: payload"
+    assert logger.get_stats()["counts"]["INFO"] == 1
+
+
+def test_errors_not_truncated():
+    """测试 WARNING 以上级别保留完整参数"""
+    logger = AddinLogger(level=DEBUG, max_arg_chars=10)
+    logger.debug("代码: %s", "a" * 100)
+    logger.error("堆栈: %s", "b" * 100)
+    logger.flush()
+    debug, error = logger.recent()
+    assert len(debug["message"]) < 50
+    assert error["message"] == "堆栈: " + "b" * 100
+    assert logger.recent(level=ERROR) == [error]
+
+
+def test_bounded_queue_and_ring():
+    """测试队列满时丢弃新记录，环形缓冲区只保留最近的记录"""
+    logger = AddinLogger(ring_size=3, queue_size=5)
+    for i in range(8):
+        logger.info("消息 %d", i)
+    logger.flush()
+    assert [record["message"] for record in logger.recent()] == ["消息 2", "消息 3", "消息 4"]
+    assert logger.get_stats()["dropped"] == 3
+    assert logger.recent(limit=0) == []
+
+
+def test_palette_drain():
+    """测试面板消息由 drain_palette 分批写出，并通知有待写消息"""
+    logger = AddinLogger(palette_level=INFO, palette_batch=2)
+    notified = []
+    logger.on_palette_pending = lambda: notified.append(True)
+
+    logger.debug("不显示")
+    for i in range(3):
+        logger.info("显示 %d", i)
+    logger.flush()
+    assert notified == [True]
+
+    written = []
+    logger.drain_palette(written.append)
+    assert written == [["显示 0", "显示 1"]]
+    assert len(notified) == 2  # 还有剩余，再次通知
+    logger.drain_palette(written.append)
+    assert written[-1] == ["显示 2"]
+    assert logger.get_stats()["palette_pending"] == 0
+
+
+def test_path_sampler():
+    """测试按路径采样"""
+    sampler = PathSampler({"/api/health": 10})
+    allowed = [sampler.allow("/api/health") for _ in range(25)]
+    assert allowed.count(True) == 3
+    assert all(sampler.allow("/api/object") for _ in range(5))
+    assert sampler.skipped == 22
+
+
+def test_rotating_file(tmp_path):
+    """测试日志文件超过大小后轮转，最多保留 backup_count 个旧文件"""
+    path = str(tmp_path / "addin.log")
+    logger = AddinLogger()
+    logger.start(path, max_bytes=200, backup_count=2)
+    for i in range(10):
+        logger.info("%02d" + "x" * 38, i)
+    logger.flush()
+
+    stats = logger.get_stats()
+    assert stats["file"] == path
+    assert stats["rotations"] == 4
+    logger.stop()
+
+    assert sorted(os.listdir(tmp_path)) == ["addin.log", "addin.log.1", "addin.log.2"]
+    assert os.path.getsize(path) <= 200
+    with open(path, encoding="utf-8") as f:
+        lines = f.read().splitlines()
+    assert [line.split("] ", 1)[1][:2] for line in lines] == ["08", "09"]
+
+
+def test_background_writer(tmp_path):
+    """测试后台线程写入文件，stop 时写完剩余记录"""
+    path = str(tmp_path / "logs" / "addin.log")
+    logger = AddinLogger()
+    logger.start(path)
+    for i in range(100):
+        logger.info("请求 %s", i)
+    logger.stop()
+
+    with open(path, encoding="utf-8") as f:
+        lines = f.read().splitlines()
+    assert len(lines) == 100
+    assert "INFO" in lines[0] and lines[-1].endswith("请求 99")
+    assert logger.get_stats()["written"] == 100
@@ -0,0 +1,84 @@
+"""
+插件请求指标的单元测试
+"""
+
+import os
+import sys
+
+ADDIN_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "addin", "fusion360_mcp_addin"
+)
+sys.path.insert(0, ADDIN_DIR)
+
+from metrics import Histogram, MetricsRegistry, TextResponse, route_label  # noqa: E402
+
+ROUTES = ("/api/objects", "/api/view", "/api/object")
+
+
+def samples(text):
+    """解析 Prometheus 文本中的样本行为 {名称{标签}: 值}"""
+    result = {}
+    for line in text.splitlines():
+        if line and not line.startswith("#"):
+            name, value = line.rsplit(" ", 1)
+            result[name] = float(value)
+    return result
+
+
+def test_route_label():
+    """测试路由标签归并对象 ID，未知路径归为 other"""
+    assert route_label("/api/objects?limit=10", ROUTES) == "/api/objects"
+    assert route_label("/api/object/abc%2F123", ROUTES) == "/api/object/{id}"
+    assert route_label("/api/object", ROUTES) == "/api/object"
+    assert route_label("/wp-admin", ROUTES) == "other"
+
+
+def test_histogram_cumulative():
+    """测试直方图按桶累计，超出最大桶的值只计入 +Inf"""
+    histogram = Histogram((0.1, 1.0))
+    for value in (0.05, 0.5, 0.7, 5.0):
+        histogram.observe(value)
+    assert list(histogram.cumulative()) == [(0.1, 1), (1.0, 3)]
+    assert histogram.count == 4
+    assert histogram.sum == 6.25
+
+
+def test_render_prometheus_text():
+    """测试请求数、错误数和直方图的 Prometheus 输出"""
+    metrics = MetricsRegistry(known_routes=ROUTES)
+    metrics.observe_request("GET", "/api/view", 200, 0.3, 0, 150000)
+    metrics.observe_request("GET", "/api/view", 200, 0.002, 0, 200)
+    metrics.observe_request("POST", "/api/object", 200, 0.05, 120, 80, error=True)
+    metrics.observe_request("GET", "other", 404, 0.0001)
+    metrics.observe_main_thread("/api/view", 0.004, 0.29)
+    metrics.observe_main_thread(None, 0.0, 0.001)
+
+    text = metrics.render({"queue_depth": ("队列深度", 3)})
+    values = samples(text)
+    prefix = "fusion360_mcp_addin"
+
+    assert values[f'{prefix}_requests_total{{method="GET",route="/api/view",status="200"}}'] == 2
+    assert values[f'{prefix}_request_errors_total{{method="POST",route="/api/object"}}'] == 1
+    assert values[f'{prefix}_request_errors_total{{method="GET",route="other"}}'] == 1
+    duration = f'{prefix}_request_duration_seconds'
+    assert values[f'{duration}_bucket{{method="GET",route="/api/view",le="0.0025"}}'] == 1
+    assert values[f'{duration}_bucket{{method="GET",route="/api/view",le="+Inf"}}'] == 2
+    assert values[f'{duration}_count{{method="GET",route="/api/view"}}'] == 2
+    assert values[f'{prefix}_response_size_bytes_bucket{{method="GET",route="/api/view",le="262144.0"}}'] == 2
+    assert values[f'{prefix}_main_thread_seconds_bucket{{route="/api/view",le="0.25"}}'] == 0
+    assert values[f'{prefix}_queue_wait_seconds_count{{route="other"}}'] == 1
+    assert values[f"{prefix}_queue_depth"] == 3
+    assert f"# TYPE {duration} histogram" in text
+
+    stats = metrics.get_stats()
+    assert stats["GET /api/view"]["requests"] == 2
+    assert stats["POST /api/object"]["errors"] == 1
+    assert stats["GET /api/view"]["avg_ms"] == 151.0
+
+
+def test_text_response_chunks():
+    """测试文本响应与 FileResponse 接口一致"""
+    response = TextResponse("a" * 10)
+    assert response.content_type.startswith("text/plain")
+    assert b"".join(response.iter_chunks(chunk_size=4)) == response.read() == b"a" * 10
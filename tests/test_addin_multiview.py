@@ -0,0 +1,59 @@
+"""
+插件多视图截图（相机预设解析、multipart 响应）的单元测试
+"""
+
+import os
+import sys
+
+import pytest
+
+from src.fusion360_mcp.codec import parse_multipart
+
+ADDIN_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "addin", "fusion360_mcp_addin"
+)
+sys.path.insert(0, ADDIN_DIR)
+
+from multiview import DEFAULT_PRESETS, MultipartResponse, parse_presets  # noqa: E402
+
+
+def test_parse_presets():
+    """测试预设解析：默认值、去重、大小写"""
+    assert parse_presets(None) == list(DEFAULT_PRESETS)
+    assert parse_presets("") == list(DEFAULT_PRESETS)
+    assert parse_presets("Front, top,front,iso") == ["front", "top", "iso"]
+
+
+def test_parse_unknown_preset():
+    with pytest.raises(ValueError, match="diagonal"):
+        parse_presets("front,diagonal")
+
+
+def test_multipart_round_trip(tmp_path):
+    """测试 multipart 响应分块发送后，客户端按名称还原每张图片"""
+    front = tmp_path / "front.png"
+    front.write_bytes(b"\x89PNG\r\n\r\n--front" * 100)
+    iso = tmp_path / "iso.jpg"
+    iso.write_bytes(b"\xff\xd8\r\n" + bytes(range(256)))
+
+    response = MultipartResponse([
+        ("front", str(front), "image/png"),
+        ("iso", str(iso), "image/jpeg"),
+    ], chunk_size=64)
+    body = b"".join(response.iter_chunks())
+    assert body == response.read()
+
+    parts = parse_multipart(body, response.content_type)
+    assert parts == [
+        ("front", "image/png", front.read_bytes()),
+        ("iso", "image/jpeg", iso.read_bytes()),
+    ]
+    # 文件归截图缓存管理，发送后保留
+    response.close()
+    assert front.exists()
+
+
+def test_parse_multipart_requires_boundary():
+    with pytest.raises(ValueError):
+        parse_multipart(b"", "multipart/mixed")
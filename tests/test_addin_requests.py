@@ -0,0 +1,460 @@
+"""
+插件请求处理的单元测试（使用模拟的 adsk 模块导入插件主文件）
+
+请求经过 handle_api_request 和真实的主线程调度器，设计、实体都是模拟对象。
+"""
+
+import os
+import socket
+import sys
+import threading
+import types
+
+import httpx
+import pytest
+
+from tests import fake_adsk
+
+ADDIN_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "addin", "fusion360_mcp_addin"
+)
+sys.path.insert(0, ADDIN_DIR)
+
+fake_adsk.install()
+
+import fusion360_mcp_addin as addin  # noqa: E402
+from dispatcher import MainThreadDispatcher  # noqa: E402
+from http_server import KeepAliveHTTPServer  # noqa: E402
+
+
+class FakeBody:
+    """模拟 BRepBody：deleteMe 后失效并从设计中移除"""
+
+    objectType = 'adsk::fusion::BRepBody'
+
+    def __init__(self, design, token, name):
+        self.design = design
+        self.entityToken = token
+        self.name = name
+        self.isLightBulbOn = True
+        self.isValid = True
+        self.material = None
+
+    @property
+    def isVisible(self):
+        return self.isLightBulbOn
+
+    def deleteMe(self):
+        self.isValid = False
+        self.design.bodies.remove(self)
+        return True
+
+
+class FakeDesign:
+    """模拟设计：findEntityByToken 线性查找并计数"""
+
+    def __init__(self, names=()):
+        self.bodies = fake_adsk.FakeCollection()
+        self.lookups = 0
+        self.timeline = None
+        self.rootComponent = types.SimpleNamespace(bRepBodies=self.bodies, allOccurrences=fake_adsk.FakeCollection())
+        for name in names:
+            self.bodies.append(FakeBody(self, f"token-{name}", name))
+
+    def findEntityByToken(self, token):
+        self.lookups += 1
+        return [body for body in self.bodies if body.entityToken == token]
+
+
+class FakeViewport:
+    """模拟 Viewport：截图写出文件并记录使用的选项和视觉样式"""
+
+    def __init__(self):
+        point = types.SimpleNamespace(x=0.0, y=0.0, z=0.0)
+        self.camera = types.SimpleNamespace(eye=point, target=point, upVector=point)
+        self.visualStyle = 1
+        self.captures = []
+
+    def saveAsImageFile(self, path, width, height):
+        return self._write(path, ("final", width, height, True))
+
+    def saveAsImageFileWithOptions(self, options):
+        return self._write(options.filename, ("preview", options.width, options.height, options.isAntiAliased))
+
+    def _write(self, path, capture):
+        self.captures.append(capture + (self.visualStyle,))
+        with open(path, "wb") as f:
+            f.write(b"png")
+        return True
+
+
+@pytest.fixture
+def design():
+    app = fake_adsk.FakeApplication()
+    dispatcher = MainThreadDispatcher(app, "test_addin_requests")
+    app.run_on_main(dispatcher.start)
+
+    design = FakeDesign(["Base", "Bolt"])
+    app.activeDocument = types.SimpleNamespace(name="Test")
+    app.activeProduct = design
+    addin.app = app
+    addin.main_thread_dispatcher = dispatcher
+    addin.entity_index.clear()
+    yield design
+
+    addin.active_transaction = None
+    addin.main_thread_dispatcher = None
+    addin.app = None
+    dispatcher.stop()
+    app.shutdown()
+
+
+def request(method, path, data=None, headers=None):
+    return addin.handle_api_request(method, path, headers or {}, data)
+
+
+class TestBatchRevision:
+    """批量请求只在执行过修改动作时递增设计版本号"""
+
+    def test_read_only_batch_keeps_revision(self, design):
+        """测试只读批量请求不改变版本号和 ETag"""
+        revision = addin.design_revision.value
+        _, _, headers = request('GET', '/api/objects')
+
+        status, result, _ = request('POST', '/api/batch', {"operations": [
+            {"action": "get_status"},
+            {"action": "get_objects", "parameters": {"page_size": 1}},
+        ]})
+        assert status == 200
+        assert result["success"] is True
+        assert addin.design_revision.value == revision
+
+        status, _, _ = request('GET', '/api/objects', headers={'If-None-Match': headers['ETag']})
+        assert status == 304
+
+    def test_rejected_batch_keeps_revision(self, design):
+        """测试被拒绝或在修改前失败的批量请求不改变版本号"""
+        revision = addin.design_revision.value
+
+        _, result, _ = request('POST', '/api/batch', {"operations": [{"action": "get_status"}], "mode": "bogus"})
+        assert result["success"] is False
+        _, result, _ = request('POST', '/api/batch', {"operations": [
+            {"action": "unknown"},
+            {"action": "delete_object", "parameters": {"object_id": "token-Base"}},
+        ]})
+        assert result["results"][1]["skipped"] is True
+        assert addin.design_revision.value == revision
+        assert len(design.bodies) == 2
+
+    def test_mutating_batch_bumps_once(self, design):
+        """测试执行修改动作的批量请求只递增一次版本号，变化使用同一个版本号"""
+        revision = addin.design_revision.value
+
+        _, result, _ = request('POST', '/api/batch', {"operations": [
+            {"action": "edit_object", "parameters": {"object_id": "token-Base", "parameters": {"visible": False}}},
+            {"action": "delete_object", "parameters": {"object_id": "token-Bolt"}},
+        ]})
+        assert result["success"] is True
+        assert addin.design_revision.value == revision + 1
+
+        _, changes, _ = request('GET', f'/api/changes?since={revision}')
+        assert [(c["type"], c["id"], c["revision"]) for c in changes["changes"]] == [
+            ("modified", "token-Base", revision + 1),
+            ("deleted", "token-Bolt", revision + 1),
+        ]
+
+
+def test_changes_since_token(design):
+    """测试 /api/changes 接受 revision_token，epoch 不同时要求全量同步"""
+    _, status, _ = request('GET', '/api/status')
+    token = status["revision_token"]
+    request('PUT', '/api/object/token-Base', {"parameters": {"parameters": {"visible": False}}})
+
+    _, changes, _ = request('GET', f'/api/changes?since={token}')
+    assert [c["id"] for c in changes["changes"]] == ["token-Base"]
+    assert changes["revision_token"] == addin.design_revision.token()
+
+    revision = token.rpartition(':')[2]
+    _, changes, _ = request('GET', f'/api/changes?since=stale:{revision}')
+    assert (changes["resync_required"], changes["reason"]) == (True, 'epoch_changed')
+    _, result, _ = request('GET', '/api/changes?since=abc')
+    assert result["success"] is False
+
+
+class TestTransactionDocument:
+    """事务只作用于开始事务时的设计"""
+
+    @pytest.fixture
+    def timeline(self, design):
+        design.timeline = types.SimpleNamespace(markerPosition=3, deleted=0)
+        design.timeline.deleteAllAfterMarker = lambda: setattr(design.timeline, 'deleted', design.timeline.deleted + 1)
+        return design.timeline
+
+    def switch_document(self):
+        other = FakeDesign(["Other"])
+        addin.app.activeDocument = types.SimpleNamespace(name="Other")
+        addin.app.activeProduct = other
+        return other
+
+    @pytest.mark.parametrize("action", ["commit", "rollback"])
+    def test_switched_document_aborts(self, design, timeline, action):
+        """测试活动文档切换后提交或回滚只中止事务，不移动原设计的时间线标记"""
+        request('POST', '/api/transaction/begin')
+        request('PUT', '/api/object/token-Base', {"parameters": {"parameters": {"visible": False}}})
+        timeline.markerPosition = 4
+        self.switch_document()
+
+        _, result, _ = request('POST', f'/api/transaction/{action}')
+        assert result["success"] is False
+        assert result["aborted"] is True
+        assert (timeline.markerPosition, timeline.deleted) == (4, 0)
+        _, status, _ = request('GET', '/api/transaction')
+        assert status["transaction"] == {"active": False}
+
+    def test_document_activated_aborts(self, design, timeline):
+        """测试 documentActivated 事件在文档切换后中止事务，同一文档的事件不影响事务"""
+        request('POST', '/api/transaction/begin')
+        handler = addin.DocumentRevisionHandler('document_activated')
+        args = types.SimpleNamespace(document=None)
+
+        addin.app.run_on_main(lambda: handler.notify(args))
+        assert addin.active_transaction is not None
+
+        self.switch_document()
+        addin.app.run_on_main(lambda: handler.notify(args))
+        assert addin.active_transaction is None
+        assert (timeline.markerPosition, timeline.deleted) == (3, 0)
+
+
+class TestConditionalGet:
+    """304 只在内容确实没有变化时返回"""
+
+    def test_objects_not_modified_until_mutation(self, design):
+        """测试对象列表在修改之前返回 304，修改之后返回新内容和新 ETag"""
+        status, result, headers = request('GET', '/api/objects')
+        assert status == 200
+        etag = headers['ETag']
+
+        status, result, not_modified = request('GET', '/api/objects', headers={'If-None-Match': etag})
+        assert (status, result, not_modified['ETag']) == (304, None, etag)
+
+        request('PUT', '/api/object/token-Base', {"parameters": {"parameters": {"visible": False}}})
+        status, result, headers = request('GET', '/api/objects', headers={'If-None-Match': etag})
+        assert status == 200
+        assert headers['ETag'] != etag
+        assert result["objects"][0]["visible"] is False
+
+    def test_reload_changes_etags(self, design, monkeypatch):
+        """测试插件重新加载、版本号从头计数后，旧 ETag 不再匹配"""
+        revision = addin.design_revision.value
+        status, _, headers = request('GET', '/api/objects')
+        assert headers['X-Design-Revision'] == f"{addin.design_revision.epoch}:{revision}"
+
+        reloaded = addin.RevisionCounter()
+        for _ in range(revision):
+            reloaded.bump()
+        monkeypatch.setattr(addin, "design_revision", reloaded)
+
+        status, _, after = request('GET', '/api/objects', headers={'If-None-Match': headers['ETag']})
+        assert status == 200
+        assert after['ETag'] != headers['ETag']
+        assert after['X-Design-Revision'] == f"{reloaded.epoch}:{revision}"
+
+    def test_view_etags_follow_camera(self, design):
+        """测试单视图和多视图截图的 ETag 在视角变化后改变"""
+        query = 'presets=front,iso'
+        etags = {path: addin.get_resource_etag(path, query) for path in addin.CAMERA_GET_PATHS}
+        assert '/api/views' in etags
+
+        addin.camera_revision.bump('camera_changed')
+        for path, etag in etags.items():
+            status, _, _ = request('GET', f'{path}?{query}', headers={'If-None-Match': etag})
+            assert status != 304
+            assert addin.get_resource_etag(path, query) != etag
+
+    def test_transaction_and_status_not_cached(self, design):
+        """测试事务状态和插件状态不生成 ETag，开始事务后立即看到新状态"""
+        _, before, headers = request('GET', '/api/transaction')
+        assert before["transaction"] == {"active": False}
+        assert 'ETag' not in headers
+        _, _, status_headers = request('GET', '/api/status')
+        assert 'ETag' not in status_headers
+
+        _, begin, _ = request('POST', '/api/transaction/begin')
+        assert begin["success"] is True
+
+        status, after, _ = request('GET', '/api/transaction', headers={'If-None-Match': '*'})
+        assert status == 200
+        assert after["transaction"]["active"] is True
+        _, status_result, _ = request('GET', '/api/status', headers={'If-None-Match': '*'})
+        assert status_result["success"] is True
+
+
+class TestObjectMutations:
+    """PUT/DELETE /api/object/<id>：实体索引、版本号和变更日志"""
+
+    def test_put_edits_object(self, design):
+        """测试编辑对象递增版本号、登记 modified 并推送 design 事件"""
+        revision = addin.design_revision.value
+        subscription = addin.event_broadcaster.subscribe()
+        try:
+            status, result, _ = request('PUT', '/api/object/token-Base', {"parameters": {"parameters": {"name": "Top"}}})
+            event = subscription.get(timeout=1)
+        finally:
+            addin.event_broadcaster.unsubscribe(subscription)
+
+        assert status == 200
+        assert result == {"success": True, "object_id": "token-Base", "updated": ["name"]}
+        assert design.bodies[0].name == "Top"
+        assert addin.design_revision.value == revision + 1
+        assert event["type"] == "design"
+        assert event["data"]["changes"] == [
+            {"revision": revision + 1, "type": "modified", "id": "token-Base", "kind": "body"}
+        ]
+
+    def test_index_hit_after_first_lookup(self, design):
+        """测试第一次解析后写入索引，之后的编辑不再调用 findEntityByToken"""
+        stats = addin.entity_index.get_stats()
+        for visible in (False, True):
+            _, result, _ = request('PUT', '/api/object/token-Bolt', {"parameters": {"parameters": {"visible": visible}}})
+            assert result["success"] is True
+
+        after = addin.entity_index.get_stats()
+        assert design.lookups == 1
+        assert after["misses"] - stats["misses"] == 1
+        assert after["hits"] - stats["hits"] == 1
+        assert design.bodies[1].isLightBulbOn is True
+
+    def test_stale_entry_is_re_resolved(self, design):
+        """测试索引中的实体失效（撤销、时间线变化）后重新查找"""
+        request('PUT', '/api/object/token-Base', {"parameters": {"parameters": {"visible": False}}})
+        old = design.bodies[0]
+        old.isValid = False
+        design.bodies[0] = FakeBody(design, "token-Base", "Base")
+        stale = addin.entity_index.get_stats()["stale"]
+
+        _, result, _ = request('PUT', '/api/object/token-Base', {"parameters": {"parameters": {"visible": False}}})
+        assert result["success"] is True
+        assert design.bodies[0].isLightBulbOn is False
+        assert old.isLightBulbOn is False
+        assert addin.entity_index.get_stats()["stale"] == stale + 1
+        assert design.lookups == 2
+
+    def test_delete_object(self, design):
+        """测试删除对象后从索引移除、登记 deleted，再次获取或删除时报告不存在"""
+        _, _, headers = request('GET', '/api/object/token-Bolt')
+        revision = addin.design_revision.value
+
+        status, result, _ = request('DELETE', '/api/object/token-Bolt')
+        assert (status, result) == (200, {"success": True, "object_id": "token-Bolt"})
+        assert [body.name for body in design.bodies] == ["Base"]
+        assert addin.design_revision.value == revision + 1
+
+        status, result, _ = request('GET', '/api/object/token-Bolt', headers={'If-None-Match': headers['ETag']})
+        assert status == 200
+        assert result == {"success": False, "error": "对象不存在: token-Bolt"}
+
+        _, result, _ = request('DELETE', '/api/object/token-Bolt')
+        assert result["success"] is False
+        _, changes, _ = request('GET', f'/api/changes?since={revision}')
+        assert [(c["type"], c["id"]) for c in changes["changes"]] == [("deleted", "token-Bolt")]
+
+    def test_invalid_edits(self, design):
+        """测试未知对象、没有可编辑参数和未知路径"""
+        _, result, _ = request('PUT', '/api/object/token-Missing', {"parameters": {"parameters": {"name": "x"}}})
+        assert result == {"success": False, "error": "对象不存在: token-Missing"}
+        _, result, _ = request('PUT', '/api/object/token-Base', {"parameters": {"parameters": {"color": "red"}}})
+        assert result["success"] is False
+        _, result, _ = request('DELETE', '/api/objects')
+        assert result == {"success": False, "error": "未知路径: /api/objects"}
+        status, _, _ = request('PATCH', '/api/object/token-Base')
+        assert status == 405
+
+
+def test_http_routes(design):
+    """测试 MCPRequestHandler 的 PUT/DELETE 路由和 304 响应"""
+    server = KeepAliveHTTPServer(("127.0.0.1", 0), addin.MCPRequestHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        with httpx.Client(base_url=f"http://127.0.0.1:{server.server_address[1]}") as client:
+            first = client.get("/api/object/token-Base")
+            assert first.json()["object"]["name"] == "Base"
+            etag = first.headers["ETag"]
+            assert client.get("/api/object/token-Base", headers={"If-None-Match": etag}).status_code == 304
+
+            edited = client.put("/api/object/token-Base", json={"parameters": {"parameters": {"name": "Top"}}})
+            assert edited.json()["updated"] == ["name"]
+            second = client.get("/api/object/token-Base", headers={"If-None-Match": etag})
+            assert second.status_code == 200
+            assert second.json()["object"]["name"] == "Top"
+
+            assert client.delete("/api/object/token-Base").json() == {"success": True, "object_id": "token-Base"}
+            assert [body.name for body in design.bodies] == ["Bolt"]
+    finally:
+        server.shutdown()
+        server.close_connections()
+        server.server_close()
+
+
+def test_unreadable_body_closes_connection(design):
+    """测试请求体无法读取时返回 400 并关闭连接，剩余字节不会被当作下一个请求"""
+    server = KeepAliveHTTPServer(("127.0.0.1", 0), addin.MCPRequestHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        with socket.create_connection(server.server_address, timeout=5) as conn:
+            conn.sendall(
+                b"POST /api/object HTTP/1.1\r\nHost: x\r\nContent-Length: abc\r\n\r\n"
+                b"DELETE /api/object/token-Base HTTP/1.1\r\nHost: x\r\nContent-Length: 0\r\n\r\n"
+            )
+            response = b""
+            while chunk := conn.recv(65536):
+                response += chunk
+        assert response.startswith(b"HTTP/1.1 400")
+        assert b"Connection: close" in response
+        assert response.count(b"HTTP/1.1") == 1
+        assert len(design.bodies) == 2
+    finally:
+        server.shutdown()
+        server.close_connections()
+        server.server_close()
+
+
+def test_file_response_pins_cached_screenshot(tmp_path):
+    """测试截图发送期间被缓存淘汰时文件仍可读取，发送结束后才删除"""
+    cache = addin.ScreenshotCache(str(tmp_path), max_entries=1)
+    path = cache.new_path("png")
+    with open(path, "wb") as f:
+        f.write(b"png" * 1000)
+    cache.put("a", path)
+    cache.pin(path)
+    response = addin.FileResponse(path, "image/png", release=cache.release)
+
+    # HTTP 线程开始读取之前，主线程登记新截图，淘汰了这个文件
+    other = cache.new_path("png")
+    open(other, "wb").close()
+    cache.put("b", other)
+
+    assert b"".join(response.iter_chunks(chunk_size=1000)) == b"png" * 1000
+    assert os.path.exists(path)
+    response.close()
+    assert not os.path.exists(path)
+
+
+def test_preview_view_renders(design, tmp_path, monkeypatch):
+    """测试 get_view(quality="preview") 发出的 POST /api/view 在插件中按预览预设实际截图"""
+    monkeypatch.setattr(addin, "screenshot_cache", addin.ScreenshotCache(str(tmp_path)))
+    viewport = addin.app.activeViewport = FakeViewport()
+
+    status, result, _ = request('POST', '/api/view', {"action": "capture_view", "parameters": {
+        "format": "png", "width": 1920, "height": 1080, "quality": "preview", "return_base64": True
+    }})
+    assert status == 200
+    assert result["success"] is True
+    assert (result["quality"], result["cached"]) == ("preview", False)
+    assert result["dimensions"] == {"width": 640, "height": 360}
+    assert result["capture_ms"] >= 0
+    assert result["image_data"] == "cG5n"
+    # 截图期间使用纯着色样式、关闭抗锯齿，之后恢复原样式
+    assert viewport.captures == [("preview", 640, 360, False, 0)]
+    assert viewport.visualStyle == 1
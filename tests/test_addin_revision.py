@@ -0,0 +1,51 @@
+"""
+插件设计版本号与 ETag 的单元测试
+"""
+
+import os
+import sys
+
+ADDIN_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "addin", "fusion360_mcp_addin"
+)
+sys.path.insert(0, ADDIN_DIR)
+
+from revision import RevisionCounter, etag_matches, make_etag  # noqa: E402
+
+
+def test_revision_counter_bumps():
+    """测试版本号递增并记录原因"""
+    counter = RevisionCounter()
+    assert counter.value == 0
+    assert counter.bump("create_object") == 1
+    assert counter.bump("documentOpened") == 2
+    assert counter.value == 2
+    assert counter.last_reason == "documentOpened"
+
+
+def test_revision_token_includes_epoch():
+    """测试每个计数器（每次插件加载）的 epoch 不同，版本号文本带 epoch"""
+    first, second = RevisionCounter(), RevisionCounter()
+    assert first.epoch != second.epoch
+    first.bump()
+    assert first.token() == f"{first.epoch}:1"
+    assert first.token(0) == f"{first.epoch}:0"
+
+
+def test_make_etag_depends_on_parts():
+    """测试 ETag 随版本号变化"""
+    etag = make_etag("/api/objects", "", 1)
+    assert etag.startswith('"') and etag.endswith('"')
+    assert etag == make_etag("/api/objects", "", 1)
+    assert etag != make_etag("/api/objects", "", 2)
+
+
+def test_etag_matches():
+    """测试 If-None-Match 匹配规则"""
+    etag = make_etag("x", 1)
+    assert etag_matches(etag, etag)
+    assert etag_matches(f'"other", W/{etag}', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches('"other"', etag)
+    assert not etag_matches(None, etag)
@@ -0,0 +1,132 @@
+"""
+插件截图缓存的单元测试
+"""
+
+import os
+import sys
+
+import pytest
+
+ADDIN_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "addin", "fusion360_mcp_addin"
+)
+sys.path.insert(0, ADDIN_DIR)
+
+from screenshot_cache import ScreenshotCache, make_screenshot_key  # noqa: E402
+
+
+def render(cache, key, size=100):
+    """模拟 saveAsImageFile：写入 size 字节后登记"""
+    path = cache.new_path("png")
+    with open(path, "wb") as f:
+        f.write(b"x" * size)
+    return cache.put(key, path)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ScreenshotCache(str(tmp_path / "views"), max_bytes=350, max_entries=10)
+
+
+def test_key_ignores_float_noise():
+    """测试相机坐标的浮点噪声不影响缓存键，其他参数变化时键不同"""
+    eye, target, up = (10.0, 20.0, 30.0), (0.0, 0.0, 0.0), (0.0, 0.0, 1.0)
+    key = make_screenshot_key(3, eye, target, up, 800, 600, "png", 0)
+    assert make_screenshot_key(3, (10.0000000001, 20.0, 30.0), target, up, 800, 600, "png", 0) == key
+    assert make_screenshot_key(4, eye, target, up, 800, 600, "png", 0) != key
+    assert make_screenshot_key(3, eye, target, up, 800, 600, "png", 1) != key
+    assert make_screenshot_key(3, eye, target, up, 800, 600, "jpg", 0) != key
+
+
+def test_hit_and_miss(cache):
+    """测试命中返回同一文件，文件被外部删除后视为未命中"""
+    assert cache.get("a") is None
+    path = render(cache, "a")
+    assert cache.get("a") == path
+
+    os.remove(path)
+    assert cache.get("a") is None
+    assert cache.get_stats()["entries"] == 0
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_evicts_lru_over_size_cap(cache):
+    """测试超过总大小上限时淘汰最久未用的条目并删除文件"""
+    a = render(cache, "a")
+    b = render(cache, "b")
+    render(cache, "c")
+    cache.get("a")
+    render(cache, "d")
+
+    assert not os.path.exists(b)
+    assert os.path.exists(a)
+    assert cache.get_stats()["bytes"] == 300
+    assert cache.evictions == 1
+
+
+def test_evicts_over_entry_cap(tmp_path):
+    """测试超过条目数上限时淘汰"""
+    cache = ScreenshotCache(str(tmp_path), max_bytes=10000, max_entries=2)
+    first = render(cache, "a")
+    render(cache, "b")
+    render(cache, "c")
+    assert not os.path.exists(first)
+    assert cache.get_stats()["entries"] == 2
+
+
+def test_oversized_entry_is_kept(cache):
+    """测试单个超过上限的截图仍然返回，下一次写入时被淘汰"""
+    path = render(cache, "big", size=1000)
+    assert os.path.exists(path)
+    render(cache, "a")
+    assert not os.path.exists(path)
+
+
+def test_cleanup_and_clear(cache, tmp_path):
+    """测试清理未登记的旧文件和旧版本截图，clear 删除所有缓存文件"""
+    kept = render(cache, "a")
+    orphan = cache.new_path("png")
+    open(orphan, "wb").close()
+    legacy = tmp_path / "fusion360_view_20240101_120000.png"
+    legacy.write_bytes(b"old")
+
+    assert cache.cleanup(extra_patterns=(str(tmp_path / "fusion360_view_*"),)) == 2
+    assert os.path.exists(kept)
+    assert not os.path.exists(orphan)
+    assert not legacy.exists()
+
+    cache.clear()
+    assert not os.path.exists(kept)
+    assert cache.get_stats()["bytes"] == 0
+
+
+def test_pinned_file_survives_eviction(cache):
+    """测试正在发送的文件被淘汰后保留到 release，多个响应共享时等最后一个结束"""
+    path = render(cache, "a")
+    cache.pin(path)
+    cache.pin(path)
+    for key in ("b", "c", "d"):
+        render(cache, key)
+
+    assert cache.get("a") is None
+    assert os.path.exists(path)
+    assert cache.get_stats()["pinned"] == 1
+
+    cache.release(path)
+    assert os.path.exists(path)
+    cache.release(path)
+    assert not os.path.exists(path)
+    assert cache.get_stats()["pinned"] == 0
+
+
+def test_release_of_cached_file_keeps_it(cache):
+    """测试未被淘汰的文件 release 后仍在缓存中，clear 时忽略遗留的 pin"""
+    path = render(cache, "a")
+    cache.pin(path)
+    cache.release(path)
+    assert cache.get("a") == path
+
+    cache.pin(path)
+    cache.clear()
+    assert not os.path.exists(path)
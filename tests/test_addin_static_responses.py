@@ -0,0 +1,80 @@
+"""
+插件静态响应注册表的单元测试
+"""
+
+import json
+import os
+import sys
+from unittest.mock import MagicMock
+
+import pytest
+
+ADDIN_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "addin", "fusion360_mcp_addin"
+)
+sys.path.insert(0, ADDIN_DIR)
+
+import codec  # noqa: E402
+from compress import ResponseCompressor  # noqa: E402
+from static_responses import StaticResponse, StaticResponseRegistry  # noqa: E402
+
+API_LIST = {
+    "success": True,
+    "categories": {
+        "design_apis": {"name": "设计API", "apis": [{"name": "sketches"}] * 30},
+        "data_apis": {"name": "数据API", "apis": [{"name": "dataFiles"}]},
+    },
+}
+
+
+def test_serialized_once_with_strong_etag():
+    """测试启动时序列化，ETag 为内容哈希的强 ETag"""
+    response = StaticResponse(API_LIST)
+    assert json.loads(response.body(codec.JSON_TYPE)) == API_LIST
+    assert response.etag.startswith('"') and not response.etag.startswith("W/")
+    assert StaticResponse(API_LIST).etag == response.etag
+    assert StaticResponse({"success": False}).etag != response.etag
+
+    if codec.msgpack:
+        assert codec.decode(response.body(codec.MSGPACK_TYPE), codec.MSGPACK_TYPE) == API_LIST
+    else:
+        assert response.body(codec.MSGPACK_TYPE) == response.body(codec.JSON_TYPE)
+
+
+def test_select_slices():
+    """测试按 category 参数返回预先拆分的切片"""
+    registry = StaticResponseRegistry()
+    slices = {name: {"categories": {name: category}} for name, category in API_LIST["categories"].items()}
+    route = registry.register("/api/list", API_LIST, slices=slices, slice_param="category")
+
+    assert registry.get("/api/list") is route
+    assert registry.get("/api/status") is None
+    assert route.select("") is route.response
+    assert route.select("fields=name") is route.response
+    data_slice = route.select("category=data_apis")
+    assert json.loads(data_slice.body(codec.JSON_TYPE)) == {"categories": {"data_apis": API_LIST["categories"]["data_apis"]}}
+    assert data_slice.etag != route.response.etag
+    with pytest.raises(KeyError):
+        route.select("category=unknown")
+
+    stats = registry.get_stats()["/api/list"]
+    assert stats["hits"] == 4
+    assert stats["slices"] == 2
+
+
+def test_compressed_variant_cached():
+    """测试同一组 Accept-Encoding 只压缩一次"""
+    compressor = MagicMock(wraps=ResponseCompressor(min_size=100))
+    response = StaticResponse(API_LIST)
+
+    first = response.compressed(codec.JSON_TYPE, "gzip", compressor)
+    second = response.compressed(codec.JSON_TYPE, "gzip", compressor)
+    assert first == second
+    assert first[1] == "gzip"
+    assert compressor.compress.call_count == 1
+
+    body, encoding = response.compressed(codec.JSON_TYPE, None, compressor)
+    assert encoding is None
+    assert body == response.body(codec.JSON_TYPE)
+    assert compressor.compress.call_count == 2
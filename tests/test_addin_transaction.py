@@ -0,0 +1,121 @@
+"""
+插件时间线事务的单元测试
+"""
+
+import os
+import sys
+
+ADDIN_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "addin", "fusion360_mcp_addin"
+)
+sys.path.insert(0, ADDIN_DIR)
+
+from transaction import DesignTransaction  # noqa: E402
+
+
+class FakeTimeline:
+    """模拟时间线：features 列表，markerPosition 之后的特征可被删除"""
+
+    def __init__(self, count=0):
+        self.features = [f"feature_{i}" for i in range(count)]
+        self.markerPosition = count
+
+    def add(self, name):
+        self.features.append(name)
+        self.markerPosition = len(self.features)
+
+    def deleteAllAfterMarker(self):
+        del self.features[self.markerPosition:]
+        return True
+
+
+class FakeDesign:
+    """模拟设计：与 Fusion 的 Design 一样没有 isComputeDeferred，设置未知属性会报错"""
+
+    __slots__ = ('timeline',)
+
+    def __init__(self, timeline=None):
+        self.timeline = timeline
+
+
+class TestDesignTransaction:
+    """DesignTransaction 测试类"""
+
+    def test_commit_keeps_mutations(self):
+        """测试全部成功时提交保留事务中的修改，不设置 Design 上不存在的属性"""
+        design = FakeDesign(FakeTimeline(2))
+        transaction = DesignTransaction(design)
+        transaction.begin()
+        assert transaction.start_marker == 2
+
+        for i in range(5):
+            design.timeline.add(f"new_{i}")
+            transaction.record({"success": True})
+
+        result = transaction.commit()
+        assert result["success"] is True
+        assert result["mutations"] == 5
+        assert len(design.timeline.features) == 7
+
+    def test_failed_mutation_rolls_back_on_commit(self):
+        """测试事务中有失败操作时提交会回滚"""
+        design = FakeDesign(FakeTimeline(2))
+        transaction = DesignTransaction(design)
+        transaction.begin()
+
+        design.timeline.add("ok")
+        transaction.record({"success": True})
+        transaction.record({"success": False, "error": "不支持的对象类型"})
+
+        result = transaction.commit()
+        assert result["success"] is False
+        assert result["rolled_back"] is True
+        assert design.timeline.features == ["feature_0", "feature_1"]
+
+    def test_rollback_failure_reported(self):
+        """测试删除特征失败时提交报告未回滚"""
+        class BrokenTimeline(FakeTimeline):
+            def deleteAllAfterMarker(self):
+                raise RuntimeError("delete failed")
+
+        design = FakeDesign(BrokenTimeline(1))
+        transaction = DesignTransaction(design)
+        transaction.begin()
+        transaction.record({"success": False})
+
+        result = transaction.commit()
+        assert result["success"] is False
+        assert result["rolled_back"] is False
+        assert result["errors"] == ["操作失败"]
+
+    def test_explicit_rollback(self):
+        """测试显式回滚"""
+        design = FakeDesign(FakeTimeline(3))
+        transaction = DesignTransaction(design)
+        transaction.begin()
+        design.timeline.add("a")
+        design.timeline.add("b")
+
+        result = transaction.rollback()
+        assert result["rolled_back"] is True
+        assert len(design.timeline.features) == 3
+
+    def test_rollback_without_timeline(self):
+        """测试直接建模（无时间线）时回滚报告失败"""
+        design = FakeDesign(timeline=None)
+        transaction = DesignTransaction(design)
+        transaction.begin()
+
+        result = transaction.rollback()
+        assert result["rolled_back"] is False
+        assert "error" in result
+
+    def test_belongs_to_start_design(self):
+        """测试事务只属于开始时的设计"""
+        design = FakeDesign(FakeTimeline(1))
+        transaction = DesignTransaction(design)
+        transaction.begin()
+        assert transaction.belongs_to(design) is True
+        assert transaction.belongs_to(FakeDesign(FakeTimeline(1))) is False
+        assert transaction.belongs_to(None) is False
@@ -0,0 +1,69 @@
+"""
+插件截图质量预设的单元测试
+"""
+
+import os
+import sys
+
+ADDIN_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "addin", "fusion360_mcp_addin"
+)
+sys.path.insert(0, ADDIN_DIR)
+
+from view_quality import CaptureTimings, DisplayOverrides, preset_size  # noqa: E402
+
+
+class FakeViewport:
+    def __init__(self):
+        self.visualStyle = 1
+        self.isAntiAliased = True
+
+
+def test_preset_size():
+    """测试 preview 等比缩小到预设尺寸以内，final 保持原尺寸"""
+    assert preset_size("final", 1920, 1080) == (1920, 1080)
+    assert preset_size("preview", 1920, 1080) == (640, 360)
+    assert preset_size("preview", 1000, 2000) == (240, 480)
+    assert preset_size("preview", 320, 240) == (320, 240)
+    assert preset_size("preview", 4096, 100) == (640, 100)
+
+
+def test_display_overrides_restored():
+    """测试临时设置在退出时恢复，缺少的属性被跳过"""
+    viewport = FakeViewport()
+    with DisplayOverrides([
+        (viewport, "visualStyle", 0),
+        (viewport, "isAntiAliased", True),
+        (viewport, "groundShadow", False),
+    ]) as overrides:
+        assert viewport.visualStyle == 0
+        assert overrides.applied == ["visualStyle"]
+    assert viewport.visualStyle == 1
+
+
+def test_display_overrides_restored_on_error():
+    """测试截图失败时同样恢复设置"""
+    viewport = FakeViewport()
+    try:
+        with DisplayOverrides([(viewport, "visualStyle", 0)]):
+            raise RuntimeError("截图失败")
+    except RuntimeError:
+        pass
+    assert viewport.visualStyle == 1
+
+
+def test_capture_timings():
+    """测试按预设分别统计截图耗时和缓存命中"""
+    timings = CaptureTimings()
+    timings.record("preview", 0.010)
+    timings.record("preview", 0.030)
+    timings.record("preview", 0, cached=True)
+    timings.record("final", 0.200)
+
+    stats = timings.get_stats()
+    assert stats["preview"]["renders"] == 2
+    assert stats["preview"]["cache_hits"] == 1
+    assert stats["preview"]["avg_ms"] == 20.0
+    assert stats["preview"]["max_ms"] == 30.0
+    assert stats["final"]["last_ms"] == 200.0
@@ -0,0 +1,59 @@
+"""
+batch_operations 工具的单元测试
+"""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.fusion360_mcp.batch_tools import batch_operations
+
+
+class TestBatchOperations:
+    """batch_operations 工具测试类"""
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        api = MagicMock()
+        api._request = AsyncMock(return_value={"success": True, "completed": 2, "failed": 0, "skipped": 0})
+        with patch('src.fusion360_mcp.batch_tools.get_api', return_value=api):
+            self.mock_api = api
+            yield
+
+    @pytest.mark.asyncio
+    async def test_batch_sends_single_request(self):
+        """测试整批操作只发送一次请求"""
+        operations = [
+            {"action": "create_object", "parameters": {"type": "extrude"}, "ref": "cyl"},
+            {"action": "get_objects", "parameters": {}}
+        ]
+
+        result = await batch_operations(operations)
+
+        self.mock_api._request.assert_called_once_with(
+            "POST",
+            "/api/batch",
+            {"action": "batch", "mode": "stop_on_error", "transaction": False, "operations": operations}
+        )
+        assert result["completed"] == 2
+
+    @pytest.mark.asyncio
+    async def test_batch_continue_mode(self):
+        """测试 continue 模式透传"""
+        await batch_operations([{"action": "get_status"}], mode="continue")
+
+        sent = self.mock_api._request.call_args[0][2]
+        assert sent["mode"] == "continue"
+
+    @pytest.mark.asyncio
+    async def test_batch_invalid_mode(self):
+        """测试不支持的模式"""
+        with pytest.raises(ValueError):
+            await batch_operations([{"action": "get_status"}], mode="abort")
+        self.mock_api._request.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_batch_empty_operations(self):
+        """测试空操作列表"""
+        with pytest.raises(ValueError):
+            await batch_operations([])
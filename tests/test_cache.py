@@ -0,0 +1,250 @@
+"""
+读取缓存的单元测试
+"""
+
+import httpx
+import pytest
+
+from src.fusion360_mcp.cache import ETagStore, ResponseCache
+from tests.test_fusion360_api import make_api
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestResponseCache:
+    """ResponseCache 测试类"""
+
+    def test_ttl_expiry(self):
+        """测试条目过期"""
+        clock = FakeClock()
+        cache = ResponseCache(clock=clock)
+        cache.set(("/api/objects", ""), {"objects": []}, ttl=5)
+
+        assert cache.get(("/api/objects", "")) == {"objects": []}
+        clock.now = 5.0
+        assert cache.get(("/api/objects", "")) is None
+
+        stats = cache.get_stats()
+        assert (stats["hits"], stats["misses"], stats["expirations"]) == (1, 1, 1)
+
+    def test_lru_eviction(self):
+        """测试超过容量时淘汰最久未使用的条目"""
+        cache = ResponseCache(max_entries=2)
+        cache.set(("/api/object/a", ""), 1, ttl=60)
+        cache.set(("/api/object/b", ""), 2, ttl=60)
+        cache.get(("/api/object/a", ""))
+        cache.set(("/api/object/c", ""), 3, ttl=60)
+
+        assert cache.get(("/api/object/b", "")) is None
+        assert cache.get(("/api/object/a", "")) == 1
+        assert cache.get_stats()["evictions"] == 1
+
+    def test_mutation_invalidates_design_state_only(self):
+        """测试普通修改只失效设计状态相关条目"""
+        cache = ResponseCache()
+        for endpoint in ("/api/objects", "/api/object/t1", "/api/parts", "/api/list"):
+            cache.set((endpoint, ""), endpoint, ttl=60)
+
+        assert cache.invalidate_for_mutation("POST", "/api/object") == 2
+        assert cache.get(("/api/parts", "")) == "/api/parts"
+        assert cache.get(("/api/list", "")) == "/api/list"
+
+    def test_broad_mutation_keeps_static_entries(self):
+        """测试执行代码和新建文档失效除静态内容外的所有条目"""
+        cache = ResponseCache()
+        for endpoint in ("/api/objects", "/api/parts", "/api/list"):
+            cache.set((endpoint, ""), endpoint, ttl=60)
+
+        cache.invalidate_for_mutation("POST", "/api/execute")
+        assert cache.get(("/api/parts", "")) is None
+        assert cache.get(("/api/list", "")) == "/api/list"
+
+    def test_read_only_post_does_not_invalidate(self):
+        """测试截图请求不失效缓存"""
+        cache = ResponseCache()
+        cache.set(("/api/objects", ""), 1, ttl=60)
+        assert cache.invalidate_for_mutation("POST", "/api/view") == 0
+        assert cache.get(("/api/objects", "")) == 1
+
+    def test_stale_generation_not_stored(self):
+        """测试失效之前发起的读取结果不会写回缓存"""
+        cache = ResponseCache()
+        generation = cache.generation
+        cache.invalidate_for_mutation("DELETE", "/api/object/t1")
+
+        assert cache.set(("/api/objects", ""), "stale", ttl=60, generation=generation) is False
+        assert cache.get(("/api/objects", "")) is None
+
+
+class TestApiCaching:
+    """Fusion360API 缓存集成测试类"""
+
+    @pytest.mark.asyncio
+    async def test_cached_reads_and_invalidation(self):
+        """测试重复读取命中缓存，修改操作之后重新请求"""
+        calls = []
+
+        def handler(request):
+            calls.append((request.method, request.url.path))
+            return httpx.Response(200, json={"success": True, "objects": [len(calls)]})
+
+        api = make_api(handler)
+        first = await api._request("GET", "/api/objects")
+        second = await api._request("GET", "/api/objects")
+        assert first == second
+        assert len(calls) == 1
+
+        await api._request("POST", "/api/object", {"action": "create_object"})
+        third = await api._request("GET", "/api/objects")
+        assert third != first
+        assert len(calls) == 3
+
+    @pytest.mark.asyncio
+    async def test_uncached_endpoints_and_disable(self):
+        """测试未配置 TTL 的端点和关闭缓存"""
+        calls = []
+
+        def handler(request):
+            calls.append(request.url.path)
+            return httpx.Response(200, json={"success": True})
+
+        api = make_api(handler)
+        await api._request("GET", "/api/status")
+        await api._request("GET", "/api/status")
+        assert len(calls) == 2
+
+        api = make_api(handler, fusion360_cache_enabled=False)
+        await api._request("GET", "/api/objects")
+        await api._request("GET", "/api/objects")
+        assert len(calls) == 4
+
+    @pytest.mark.asyncio
+    async def test_failures_not_cached(self):
+        """测试 success 为 false 的结果不写入缓存，下次读取重新请求"""
+        calls = []
+
+        def handler(request):
+            calls.append(request.url.path)
+            if len(calls) == 1:
+                return httpx.Response(200, json={"success": False, "error": "没有活动文档"})
+            return httpx.Response(200, json={"success": True, "objects": []})
+
+        api = make_api(handler)
+        first = await api._request("GET", "/api/objects")
+        second = await api._request("GET", "/api/objects")
+        third = await api._request("GET", "/api/objects")
+
+        assert first["success"] is False
+        assert second == third == {"success": True, "objects": []}
+        assert len(calls) == 2
+
+
+def test_invalidate_for_event():
+    """测试插件事件的失效范围"""
+    cache = ResponseCache()
+    for endpoint in ("/api/objects", "/api/parts", "/api/list"):
+        cache.set((endpoint, ""), endpoint, ttl=60)
+
+    assert cache.invalidate_for_event("selection") == 0
+    assert cache.invalidate_for_event("design") == 1
+    assert cache.get(("/api/parts", "")) == "/api/parts"
+    assert cache.invalidate_for_event("document") == 1
+    assert cache.get(("/api/list", "")) == "/api/list"
+
+
+class TestETag:
+    """ETag 条件请求测试类"""
+
+    @pytest.mark.asyncio
+    async def test_not_modified_reuses_stored_body(self):
+        """测试携带 If-None-Match，收到 304 时复用上次内容"""
+        seen = []
+
+        def handler(request):
+            seen.append(request.headers.get("If-None-Match"))
+            if request.headers.get("If-None-Match") == '"rev1"':
+                return httpx.Response(304, headers={"ETag": '"rev1"'})
+            return httpx.Response(200, json={"success": True, "revision": 1}, headers={"ETag": '"rev1"'})
+
+        api = make_api(handler, fusion360_cache_enabled=False)
+        first = await api._request("GET", "/api/status")
+        second = await api._request("GET", "/api/status")
+
+        assert seen == [None, '"rev1"']
+        assert first == second == {"success": True, "revision": 1}
+        assert api.get_stats()["etag"]["not_modified"] == 1
+
+    @pytest.mark.asyncio
+    async def test_not_modified_after_eviction_refetches(self):
+        """测试请求期间保存的内容被淘汰时，收到 304 后不带 If-None-Match 重新请求"""
+        seen = []
+
+        def handler(request):
+            seen.append(request.headers.get("If-None-Match"))
+            if request.headers.get("If-None-Match") == '"rev1"':
+                # 模拟请求在途时其他响应把这条内容挤出了 ETag 存储
+                api.etags.discard(("/api/status", ""))
+                return httpx.Response(304, headers={"ETag": '"rev1"'})
+            return httpx.Response(200, json={"success": True, "revision": 1}, headers={"ETag": '"rev1"'})
+
+        api = make_api(handler, fusion360_cache_enabled=False)
+        await api._request("GET", "/api/status")
+        result = await api._request("GET", "/api/status")
+
+        assert seen == [None, '"rev1"', None]
+        assert result == {"success": True, "revision": 1}
+        assert api.etags.get_etag(("/api/status", "")) == '"rev1"'
+
+    @pytest.mark.asyncio
+    async def test_post_does_not_send_if_none_match(self):
+        """测试非 GET 请求不携带 ETag"""
+        seen = []
+
+        def handler(request):
+            seen.append(request.headers.get("If-None-Match"))
+            return httpx.Response(200, json={"success": True}, headers={"ETag": '"rev1"'})
+
+        api = make_api(handler, fusion360_cache_enabled=False)
+        await api._request("POST", "/api/view", {"action": "capture_view"})
+        await api._request("POST", "/api/view", {"action": "capture_view"})
+        assert seen == [None, None]
+        assert api.get_stats()["etag"]["entries"] == 0
+
+
+def test_etag_store_bounded_by_bytes():
+    """测试 ETag 内容按总字节数淘汰，超过上限的单个响应不保存"""
+    store = ETagStore(max_entries=10, max_bytes=100)
+    store.store("a", '"a"', b"a" * 60, 60)
+    store.store("b", '"b"', b"b" * 60, 60)
+    assert store.get_etag("a") is None
+    assert store.get_etag("b") == '"b"'
+
+    store.store("b", '"b2"', b"b" * 30, 30)
+    store.store("c", '"c"', b"c" * 200, 200)
+    assert store.get_etag("c") is None
+    stats = store.get_stats()
+    assert (stats["entries"], stats["bytes"], stats["skipped"]) == (1, 30, 1)
+
+
+@pytest.mark.asyncio
+async def test_large_raw_screenshot_not_kept():
+    """测试超过字节上限的截图原始字节不保存在 ETag 内容中"""
+    seen = []
+
+    def handler(request):
+        seen.append(request.headers.get("If-None-Match"))
+        return httpx.Response(200, content=b"\x89PNG" * 1024, headers={"Content-Type": "image/png", "ETag": '"v1"'})
+
+    api = make_api(handler)
+    api.etags = ETagStore(max_bytes=1024)
+    for _ in range(2):
+        data, _ = await api._request_raw("/api/view/raw?width=800&height=600")
+        assert len(data) == 4096
+    assert seen == [None, None]
+    assert api.get_stats()["etag"]["bytes"] == 0
@@ -0,0 +1,39 @@
+"""
+get_changes 工具的单元测试
+"""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.fusion360_mcp.change_tools import get_changes
+
+
+@pytest.mark.asyncio
+async def test_get_changes_requests_delta():
+    """测试按 since 请求增量"""
+    api = MagicMock()
+    api._request = AsyncMock(return_value={"success": True, "changes": [], "revision": 3})
+    with patch('src.fusion360_mcp.change_tools.get_api', return_value=api):
+        result = await get_changes(since=2)
+
+    api._request.assert_called_once_with("GET", "/api/changes?since=2")
+    assert result["revision"] == 3
+
+
+@pytest.mark.asyncio
+async def test_get_changes_rejects_negative_since():
+    """测试 since 不能为负数"""
+    with pytest.raises(ValueError):
+        await get_changes(since=-1)
+
+
+@pytest.mark.asyncio
+async def test_get_changes_passes_revision_token():
+    """测试 since 可以是上次返回的 revision_token"""
+    api = MagicMock()
+    api._request = AsyncMock(return_value={"success": True, "changes": [], "revision_token": "e1:3"})
+    with patch('src.fusion360_mcp.change_tools.get_api', return_value=api):
+        await get_changes(since="e1:2")
+
+    api._request.assert_called_once_with("GET", "/api/changes?since=e1%3A2")
@@ -0,0 +1,71 @@
+"""
+插件事件流订阅的单元测试
+"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from src.fusion360_mcp.events import SSEParser
+from tests.test_fusion360_api import make_api
+
+
+def test_sse_parser():
+    """测试解析事件、多行 data、心跳注释和非 JSON 数据"""
+    parser = SSEParser()
+    lines = [
+        "retry: 3000", "",
+        ": keepalive", "",
+        "id: 1", "event: design", 'data: {"id": 1, "type": "design", "data": {"revision": 2}}', "",
+        "event: note", "data: 第一行", "data: 第二行", "",
+    ]
+    events = [event for event in (parser.feed(line) for line in lines) if event is not None]
+    assert events == [
+        {"id": 1, "type": "design", "data": {"revision": 2}},
+        {"type": "note", "data": "第一行\n第二行"},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_event_stream_invalidates_cache():
+    """测试事件流中的设计事件使对象缓存失效，并回调通知"""
+    calls = []
+    stream_body = (
+        b'id: 1\nevent: design\ndata: {"id": 1, "type": "design", "data": {"revision": 5}}\n\n'
+        b'id: 2\nevent: selection\ndata: {"id": 2, "type": "selection", "data": {"count": 1, "ids": ["t1"]}}\n\n'
+    )
+
+    def handler(request):
+        calls.append(request.url.path)
+        if request.url.path == "/api/events":
+            return httpx.Response(200, content=stream_body, headers={"Content-Type": "text/event-stream"})
+        return httpx.Response(200, json={"success": True, "objects": []})
+
+    api = make_api(handler)
+    await api._request("GET", "/api/objects")
+    await api._request("GET", "/api/objects")
+    assert calls.count("/api/objects") == 1
+
+    received = []
+    api.start_event_stream(on_event=received.append)
+    for _ in range(100):
+        if len(received) >= 2:
+            break
+        await asyncio.sleep(0.01)
+    await api.stop_event_stream()
+
+    assert [event["type"] for event in received[:2]] == ["design", "selection"]
+    assert api.last_selection == {"count": 1, "ids": ["t1"]}
+    assert api.get_stats()["events"]["events_received"] >= 2
+
+    await api._request("GET", "/api/objects")
+    assert calls.count("/api/objects") == 2
+
+
+@pytest.mark.asyncio
+async def test_event_stream_disabled():
+    """测试关闭事件流时不订阅"""
+    api = make_api(lambda request: httpx.Response(200, json={}), fusion360_events_enabled=False)
+    assert api.start_event_stream() is None
+    assert api.get_stats()["events"] is None
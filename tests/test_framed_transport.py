@@ -0,0 +1,130 @@
+"""
+帧传输的单元测试（插件端 FramedServer + 客户端 FramedTransport）
+"""
+
+import asyncio
+import json
+import os
+import socket
+import sys
+import time
+
+import httpx
+import pytest
+
+from src.fusion360_mcp.framed_transport import FramedTransport
+
+ADDIN_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "addin", "fusion360_mcp_addin"
+)
+sys.path.insert(0, ADDIN_DIR)
+
+from framed import FramedServer, encode_frame, read_frame  # noqa: E402
+
+
+def echo_handler(method, path, headers, body):
+    """按查询参数 delay 延迟后回显请求"""
+    delay = float(path.split("delay=")[1]) if "delay=" in path else 0
+    time.sleep(delay)
+    payload = {
+        "method": method,
+        "path": path,
+        "timeout": headers.get("x-request-timeout"),
+        "body": json.loads(body) if body else None
+    }
+    return 200, {"Content-Type": "application/json", "ETag": '"e1"'}, json.dumps(payload).encode("utf-8")
+
+
+@pytest.fixture
+def server():
+    server = FramedServer("127.0.0.1", 0, echo_handler, max_workers=4)
+    server.start()
+    yield server
+    server.stop()
+
+
+def fallback_transport():
+    return httpx.MockTransport(lambda request: httpx.Response(200, json={"fallback": request.url.path}))
+
+
+@pytest.mark.asyncio
+async def test_round_trip(server):
+    """测试请求方法、路径、请求头、请求体和响应头经帧传输往返"""
+    transport = FramedTransport("127.0.0.1", server.port, fallback=fallback_transport())
+    async with httpx.AsyncClient(transport=transport, base_url="http://localhost:9000") as client:
+        response = await client.post(
+            "/api/object?x=1", json={"action": "create_object"}, headers={"X-Request-Timeout": "5.000"}
+        )
+
+    assert response.status_code == 200
+    assert response.headers["ETag"] == '"e1"'
+    assert response.json() == {
+        "method": "POST", "path": "/api/object?x=1", "timeout": "5.000", "body": {"action": "create_object"}
+    }
+    assert transport.get_stats()["framed_requests"] == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_share_one_connection_out_of_order(server):
+    """测试多个请求同时在途，慢请求不阻塞快请求"""
+    transport = FramedTransport("127.0.0.1", server.port, fallback=fallback_transport())
+    order = []
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://localhost:9000") as client:
+        async def get(delay):
+            response = await client.get(f"/api/objects?delay={delay}")
+            order.append(delay)
+            return response
+
+        responses = await asyncio.gather(get(0.3), get(0.0), get(0.1))
+
+    assert [r.json()["path"] for r in responses] == [
+        "/api/objects?delay=0.3", "/api/objects?delay=0.0", "/api/objects?delay=0.1"
+    ]
+    assert order == [0.0, 0.1, 0.3]
+    assert server.get_stats()["accepted"] == 1
+    assert transport.get_stats()["connects"] == 1
+
+
+@pytest.mark.asyncio
+async def test_read_timeout(server):
+    """测试等待响应超时转换为 httpx.ReadTimeout"""
+    transport = FramedTransport("127.0.0.1", server.port, fallback=fallback_transport())
+    async with httpx.AsyncClient(transport=transport, base_url="http://localhost:9000") as client:
+        with pytest.raises(httpx.ReadTimeout):
+            await client.get("/api/view?delay=0.5", timeout=0.05)
+
+
+@pytest.mark.asyncio
+async def test_falls_back_to_http_when_port_closed():
+    """测试连接不上帧端口时回退到 HTTP，事件流始终走 HTTP"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+
+    transport = FramedTransport("127.0.0.1", port, fallback=fallback_transport())
+    async with httpx.AsyncClient(transport=transport, base_url="http://localhost:9000") as client:
+        assert (await client.get("/api/status")).json() == {"fallback": "/api/status"}
+        assert (await client.get("/api/events")).json() == {"fallback": "/api/events"}
+
+    stats = transport.get_stats()
+    assert stats["fallback_requests"] == 2
+    assert stats["framed_requests"] == 0
+
+
+def test_frame_after_executor_shutdown():
+    """测试线程池关闭后收到的帧得到 503 错误帧，随后连接关闭"""
+    server = FramedServer("127.0.0.1", 0, echo_handler)
+    server.start()
+    try:
+        server._executor.shutdown()
+        with socket.create_connection(("127.0.0.1", server.port), timeout=5) as conn:
+            conn.sendall(encode_frame({"id": 7, "method": "GET", "path": "/api/status"}))
+            stream = conn.makefile("rb")
+            header, body = read_frame(stream)
+            assert (header["id"], header["status"]) == (7, 503)
+            assert json.loads(body)["success"] is False
+            assert read_frame(stream) is None
+    finally:
+        server.stop()
@@ -0,0 +1,552 @@
+"""
+Fusion360API 客户端（重试、熔断、超时、请求合并）的单元测试
+"""
+
+import asyncio
+import json
+import os
+import socket
+import socketserver
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler
+
+import httpx
+import pytest
+
+from src.fusion360_mcp.codec import Codec
+from src.fusion360_mcp.config import Settings
+from src.fusion360_mcp.fusion360_api import Fusion360API, request_deadline
+from src.fusion360_mcp.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    DeadlineExceededError,
+    backoff_delay,
+)
+
+
+def make_api(handler, **overrides):
+    """创建使用模拟传输层的 API 实例（不等待退避时间）"""
+    settings = {
+        "fusion360_max_retry": 3,
+        "fusion360_retry_backoff_base": 0.0,
+        "fusion360_circuit_failure_threshold": 3,
+        "fusion360_circuit_cooldown": 60.0,
+    }
+    settings.update(overrides)
+
+    api = Fusion360API()
+    api.settings = Settings(**settings)
+    api.breaker = CircuitBreaker(
+        failure_threshold=api.settings.fusion360_circuit_failure_threshold,
+        cooldown=api.settings.fusion360_circuit_cooldown
+    )
+    api.codec = Codec(api.settings.fusion360_encoding)
+    api.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return api
+
+
+class TestRetry:
+    """重试测试类"""
+
+    @pytest.mark.asyncio
+    async def test_get_retries_transport_errors(self):
+        """测试 GET 在读取错误后重试成功"""
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            if len(calls) < 3:
+                raise httpx.ReadError("reset", request=request)
+            return httpx.Response(200, json={"success": True})
+
+        api = make_api(handler)
+        assert await api._request("GET", "/api/objects") == {"success": True}
+        assert len(calls) == 3
+
+    @pytest.mark.asyncio
+    async def test_post_not_retried_after_read_error(self):
+        """测试 POST 在请求可能已执行时不重试"""
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            raise httpx.ReadError("reset", request=request)
+
+        api = make_api(handler)
+        with pytest.raises(Exception, match="无法连接到 Fusion 360"):
+            await api._request("POST", "/api/object", {"action": "create_object"})
+        assert len(calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_post_retried_on_backpressure(self):
+        """测试 POST 在插件返回 429 时重试"""
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            if len(calls) == 1:
+                return httpx.Response(429, headers={"Retry-After": "0"}, json={"success": False})
+            return httpx.Response(200, json={"success": True})
+
+        api = make_api(handler)
+        assert (await api._request("POST", "/api/object", {}))["success"] is True
+        assert len(calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_retries_exhausted(self):
+        """测试超过最大重试次数后失败"""
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(503, json={"success": False})
+
+        api = make_api(handler, fusion360_max_retry=2)
+        with pytest.raises(Exception, match="Fusion 360 操作失败"):
+            await api._request("GET", "/api/status")
+        assert len(calls) == 3
+
+    @pytest.mark.asyncio
+    async def test_client_errors_not_retried(self):
+        """测试 4xx 错误不重试"""
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(404, json={"success": False})
+
+        api = make_api(handler)
+        with pytest.raises(Exception):
+            await api._request("GET", "/api/missing")
+        assert len(calls) == 1
+
+
+class TestCircuitBreaker:
+    """熔断测试类"""
+
+    @pytest.mark.asyncio
+    async def test_breaker_opens_and_fails_fast(self):
+        """测试连续连接失败后熔断，冷却期内不再发送请求"""
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            raise httpx.ConnectError("refused", request=request)
+
+        api = make_api(handler)
+        with pytest.raises(Exception):
+            await api._request("GET", "/api/status")
+        assert api.breaker.state == CircuitBreaker.OPEN
+        sent = len(calls)
+
+        with pytest.raises(CircuitOpenError):
+            await api._request("GET", "/api/status")
+        assert len(calls) == sent
+
+    @pytest.mark.asyncio
+    async def test_half_open_probe_closes_breaker(self):
+        """测试冷却结束后健康检查探测成功则恢复"""
+        paths = []
+
+        def handler(request):
+            paths.append(request.url.path)
+            return httpx.Response(200, json={"success": True})
+
+        api = make_api(handler, fusion360_circuit_cooldown=0.0)
+        api.breaker.trip()
+        assert api.breaker.state == CircuitBreaker.HALF_OPEN
+
+        await api._request("GET", "/api/objects")
+        assert paths == ["/api/health", "/api/objects"]
+        assert api.breaker.state == CircuitBreaker.CLOSED
+
+    @pytest.mark.asyncio
+    async def test_half_open_probe_failure_reopens(self):
+        """测试探测失败时熔断器重新打开"""
+        def handler(request):
+            raise httpx.ConnectError("refused", request=request)
+
+        api = make_api(handler, fusion360_circuit_cooldown=0.0)
+        api.breaker.trip()
+        with pytest.raises(CircuitOpenError):
+            await api._request("GET", "/api/objects")
+        assert api.breaker.trips == 2
+
+
+class TestTimeouts:
+    """超时策略测试类"""
+
+    def test_endpoint_timeout_classes(self):
+        """测试按端点前缀选择读取超时"""
+        api = make_api(lambda request: httpx.Response(200, json={}))
+
+        assert api._get_timeout("/api/health").read == 2.0
+        assert api._get_timeout("/api/view").read == 60.0
+        assert api._get_timeout("/api/execute").read == 120.0
+        assert api._get_timeout("/api/objects").read == 30.0
+        assert api._get_timeout("/api/objects").connect == 2.0
+
+    @pytest.mark.asyncio
+    async def test_timeout_header_sent(self):
+        """测试请求携带剩余等待时间头"""
+        headers = []
+
+        def handler(request):
+            headers.append(request.headers.get("X-Request-Timeout"))
+            return httpx.Response(200, json={"success": True})
+
+        api = make_api(handler)
+        await api._request("GET", "/api/status")
+        with request_deadline(1.5):
+            await api._request("GET", "/api/view")
+
+        assert float(headers[0]) == 5.0
+        assert 0 < float(headers[1]) <= 1.5
+
+    @pytest.mark.asyncio
+    async def test_expired_deadline_not_sent(self):
+        """测试截止时间已过时不再发送请求"""
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(200, json={"success": True})
+
+        api = make_api(handler)
+        with request_deadline(0):
+            with pytest.raises(DeadlineExceededError):
+                await api._request("GET", "/api/objects")
+        assert calls == []
+
+    @pytest.mark.asyncio
+    async def test_deadline_stops_retries(self):
+        """测试剩余时间不足时停止重试"""
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(503, headers={"Retry-After": "5"}, json={"success": False})
+
+        api = make_api(handler, fusion360_retry_backoff_max=10.0)
+        with request_deadline(1.0):
+            with pytest.raises(DeadlineExceededError):
+                await api._request("GET", "/api/objects")
+        assert len(calls) == 1
+
+    def test_nested_deadline_keeps_earliest(self):
+        """测试嵌套截止时间取较早者"""
+        from src.fusion360_mcp.fusion360_api import _request_deadline
+
+        with request_deadline(10):
+            outer = _request_deadline.get()
+            with request_deadline(100):
+                assert _request_deadline.get() == outer
+        assert _request_deadline.get() is None
+
+
+def test_backoff_delay_bounds():
+    """测试退避时间范围与 Retry-After"""
+    for attempt in range(6):
+        delay = backoff_delay(attempt, 0.2, 1.0)
+        expected = min(1.0, 0.2 * 2 ** attempt)
+        assert expected / 2 <= delay <= expected
+    assert backoff_delay(0, 0.2, 1.0, retry_after=10) == 1.0
+
+
+class TestSingleFlight:
+    """并发相同读取请求合并测试类"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_identical_gets_share_one_request(self):
+        """测试并发的相同 GET 只发送一次请求"""
+        calls = []
+
+        async def handler(request):
+            calls.append(request.url.path)
+            await asyncio.sleep(0.05)
+            return httpx.Response(200, json={"success": True, "objects": []})
+
+        api = make_api(handler)
+        results = await asyncio.gather(*[api._request("GET", "/api/objects") for _ in range(5)])
+
+        assert calls == ["/api/objects"]
+        assert all(result == {"success": True, "objects": []} for result in results)
+        assert api.get_stats()["singleflight"]["coalesced"] == 4
+
+    @pytest.mark.asyncio
+    async def test_different_requests_not_coalesced(self):
+        """测试不同端点、不同参数和写请求不会合并"""
+        calls = []
+
+        async def handler(request):
+            calls.append((request.method, request.url.path))
+            await asyncio.sleep(0.01)
+            return httpx.Response(200, json={"success": True})
+
+        api = make_api(handler)
+        await asyncio.gather(
+            api._request("GET", "/api/objects"),
+            api._request("GET", "/api/status"),
+            api._request("GET", "/api/view", {"parameters": {"width": 800}}),
+            api._request("GET", "/api/view", {"parameters": {"width": 400}}),
+            api._request("POST", "/api/object", {}),
+            api._request("POST", "/api/object", {}),
+        )
+
+        assert len(calls) == 6
+        assert api.get_stats()["singleflight"]["coalesced"] == 0
+
+    @pytest.mark.asyncio
+    async def test_get_after_mutation_not_coalesced(self):
+        """测试修改完成后发起的 GET 不加入修改之前在途的 GET，读到修改后的内容"""
+        state = {"name": "Base"}
+        first_sent = asyncio.Event()
+        release_first = asyncio.Event()
+
+        async def handler(request):
+            if request.method == "PUT":
+                state["name"] = json.loads(request.content)["name"]
+                return httpx.Response(200, json={"success": True})
+            name = state["name"]
+            if not first_sent.is_set():
+                first_sent.set()
+                await release_first.wait()
+            return httpx.Response(200, json={"success": True, "name": name})
+
+        api = make_api(handler)
+        first = asyncio.ensure_future(api._request("GET", "/api/objects"))
+        await first_sent.wait()
+        await api._request("PUT", "/api/object/token-Base", {"name": "Top"})
+        second = asyncio.ensure_future(api._request("GET", "/api/objects"))
+        await asyncio.sleep(0.01)
+        release_first.set()
+
+        assert (await first)["name"] == "Base"
+        assert (await second)["name"] == "Top"
+        assert api.get_stats()["singleflight"]["coalesced"] == 0
+
+    @pytest.mark.asyncio
+    async def test_errors_are_shared(self):
+        """测试合并的请求共享异常，结束后新请求重新发送"""
+        calls = []
+
+        async def handler(request):
+            calls.append(request)
+            await asyncio.sleep(0.01)
+            return httpx.Response(404, json={"success": False})
+
+        api = make_api(handler)
+        results = await asyncio.gather(
+            *[api._request("GET", "/api/missing") for _ in range(3)],
+            return_exceptions=True
+        )
+        assert all(isinstance(result, Exception) for result in results)
+        assert len(calls) == 1
+
+        with pytest.raises(Exception):
+            await api._request("GET", "/api/missing")
+        assert len(calls) == 2
+
+
+@pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="当前平台不支持 Unix 域套接字")
+@pytest.mark.asyncio
+async def test_requests_over_unix_domain_socket():
+    """测试设置 fusion360_uds_path 后请求经 Unix 域套接字发送"""
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            body = json.dumps({"success": True, "path": self.path}).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    class Server(socketserver.ThreadingUnixStreamServer):
+        daemon_threads = True
+
+    path = os.path.join(tempfile.mkdtemp(), "fusion360_mcp.sock")
+    server = Server(path, Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        api = Fusion360API()
+        api.settings = Settings(fusion360_uds_path=path, fusion360_cache_enabled=False)
+        result = await api._request("GET", "/api/status")
+        await api.close()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert result == {"success": True, "path": "/api/status"}
+    assert api.get_stats()["transport"] == {"type": "uds"}
+
+
+class TestEncoding:
+    """测试请求与响应的编码协商"""
+
+    @pytest.mark.asyncio
+    async def test_json_by_default(self):
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(200, json={"success": True, "name": "实体1"})
+
+        api = make_api(handler)
+        assert await api._request("POST", "/api/object", {"name": "实体1"}) == {"success": True, "name": "实体1"}
+        assert requests[0].headers["Accept"] == "application/json"
+        assert requests[0].headers["Content-Type"] == "application/json"
+        assert json.loads(requests[0].content) == {"name": "实体1"}
+
+    @pytest.mark.asyncio
+    async def test_msgpack_after_negotiation(self):
+        """测试收到 MessagePack 响应后请求体也改用 MessagePack"""
+        msgpack = pytest.importorskip("msgpack")
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            if request.headers["Content-Type"] == "application/msgpack":
+                body = msgpack.unpackb(request.content)
+            else:
+                body = json.loads(request.content)
+            return httpx.Response(
+                200,
+                content=msgpack.packb({"success": True, "echo": body}),
+                headers={"Content-Type": "application/msgpack"}
+            )
+
+        api = make_api(handler, fusion360_encoding="msgpack")
+        assert await api._request("POST", "/api/object", {"x": 1.5}) == {"success": True, "echo": {"x": 1.5}}
+        assert requests[0].headers["Accept"].startswith("application/msgpack")
+        assert requests[0].headers["Content-Type"] == "application/json"
+
+        assert await api._request("POST", "/api/object", {"x": 2.5}) == {"success": True, "echo": {"x": 2.5}}
+        assert requests[1].headers["Content-Type"] == "application/msgpack"
+        encoding = api.get_stats()["encoding"]
+        assert (encoding["preferred"], encoding["request"]) == ("msgpack", "application/msgpack")
+
+    @pytest.mark.asyncio
+    async def test_old_addin_keeps_json(self):
+        """测试插件只返回 JSON 时请求体保持 JSON"""
+        pytest.importorskip("msgpack")
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(200, json={"success": True})
+
+        api = make_api(handler, fusion360_encoding="msgpack")
+        await api._request("POST", "/api/object", {"x": 1})
+        await api._request("POST", "/api/object", {"x": 2})
+        assert requests[1].headers["Content-Type"] == "application/json"
+
+
+@pytest.mark.asyncio
+async def test_compressed_response():
+    """测试发送 Accept-Encoding，gzip 响应透明解压并统计压缩比"""
+    import gzip
+    payload = {"success": True, "objects": [{"name": f"实体{i}"} for i in range(200)]}
+    raw = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        # 以 stream 返回，与网络上读到的响应一样保持压缩的原始字节
+        return httpx.Response(
+            200,
+            stream=httpx.ByteStream(gzip.compress(raw)),
+            headers={"Content-Type": "application/json", "Content-Encoding": "gzip"}
+        )
+
+    api = make_api(handler)
+    assert await api._request("POST", "/api/objects", {}) == payload
+    assert "gzip" in requests[0].headers["Accept-Encoding"]
+
+    stats = api.get_stats()["encoding"]["compression"]["gzip"]
+    assert stats["responses"] == 1
+    assert stats["decoded_bytes"] == len(raw)
+    assert stats["wire_bytes"] == len(gzip.compress(raw))
+    assert stats["ratio"] > 5
+    assert stats["cpu_time"] > 0
+
+
+@pytest.mark.asyncio
+async def test_zstd_response():
+    """测试 zstd 响应解压并统计解压耗时"""
+    zstandard = pytest.importorskip("zstandard")
+    payload = {"success": True, "objects": [{"name": f"实体{i}"} for i in range(200)]}
+
+    def handler(request):
+        body = zstandard.ZstdCompressor().compress(json.dumps(payload).encode("utf-8"))
+        headers = {"Content-Type": "application/json", "Content-Encoding": "zstd"}
+        return httpx.Response(200, stream=httpx.ByteStream(body), headers=headers)
+
+    api = make_api(handler)
+    assert await api._request("GET", "/api/objects") == payload
+    assert api.get_stats()["encoding"]["compression"]["zstd"]["cpu_time"] > 0
+
+
+def test_accept_encoding_follows_zstandard(monkeypatch):
+    """测试只在安装了 zstandard 时请求 zstd"""
+    from src.fusion360_mcp import codec
+
+    monkeypatch.setattr(codec.importlib.util, "find_spec", lambda name: None)
+    assert codec._accept_encoding() == "gzip"
+    monkeypatch.setattr(codec.importlib.util, "find_spec", lambda name: object() if name == "zstandard" else None)
+    assert codec._accept_encoding() == "zstd, gzip"
+
+
+@pytest.mark.asyncio
+async def test_request_raw_returns_bytes():
+    """测试原始字节响应不经过 JSON 解码，分块传输的内容完整拼接"""
+    image = bytes(range(256)) * 1024
+
+    async def chunks():
+        for i in range(0, len(image), 65536):
+            yield image[i:i + 65536]
+
+    def handler(request):
+        assert request.url.path == "/api/view/raw"
+        return httpx.Response(200, content=chunks(), headers={"Content-Type": "image/png"})
+
+    api = make_api(handler)
+    data, mime_type = await api._request_raw("/api/view/raw?width=800&height=600&format=png")
+    assert data == image
+    assert mime_type == "image/png"
+
+
+@pytest.mark.asyncio
+async def test_request_metrics():
+    """测试按路由记录调用结果（ok/cache/error）、重试次数和请求/响应大小"""
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        if request.url.path == "/api/status" and len(calls) == 1:
+            raise httpx.ReadError("reset", request=request)
+        if request.url.path.startswith("/api/object/"):
+            return httpx.Response(404, json={"success": False, "error": "不存在"})
+        return httpx.Response(200, json={"success": True})
+
+    api = make_api(handler)
+    await api._request("GET", "/api/status")
+    await api._request("GET", "/api/list")
+    await api._request("GET", "/api/list")  # 读取缓存命中
+    await api._request("POST", "/api/object", {"type": "box"})
+    with pytest.raises(Exception):
+        await api._request("DELETE", "/api/object/token-1")
+
+    stats = api.get_stats()["requests"]
+    assert stats["GET /api/status"]["ok"] == 1
+    assert stats["GET /api/status"]["retries"] == 1
+    assert stats["GET /api/list"] == {"ok": 1, "cache": 1, "avg_ms": stats["GET /api/list"]["avg_ms"]}
+    assert stats["DELETE /api/object/{id}"]["error"] == 1
+
+    text = api.metrics.render()
+    assert 'fusion360_mcp_client_requests_total{method="POST",route="/api/object",outcome="ok"} 1' in text
+    assert 'fusion360_mcp_client_request_size_bytes_bucket{method="POST",route="/api/object",le="256.0"} 1' in text
+    assert 'fusion360_mcp_client_retries_total{method="GET",route="/api/status"} 1' in text
+    assert 'fusion360_mcp_client_request_duration_seconds_count{method="GET",route="/api/list"} 2' in text
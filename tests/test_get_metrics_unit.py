@@ -0,0 +1,59 @@
+"""
+get_metrics 功能的单元测试
+"""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.fusion360_mcp.metrics import ClientMetrics
+from src.fusion360_mcp.metrics_tools import get_metrics
+
+
+class TestGetMetrics:
+    """get_metrics 功能的单元测试类"""
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.mock_api = MagicMock()
+        self.mock_api._request_raw = AsyncMock()
+        self.mock_api.metrics = ClientMetrics()
+        self.mock_api.metrics.observe_request("GET", "/api/status", "ok", 0.01)
+        with patch('src.fusion360_mcp.metrics_tools.get_api', return_value=self.mock_api):
+            yield
+
+    @pytest.mark.asyncio
+    async def test_summary(self):
+        """测试 summary 返回客户端统计，不请求插件"""
+        self.mock_api.get_stats.return_value = {"requests": {"GET /api/status": {"ok": 1}}}
+        result = await get_metrics()
+        assert result == {"requests": {"GET /api/status": {"ok": 1}}}
+        self.mock_api._request_raw.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_prometheus_merges_addin_metrics(self):
+        """测试 prometheus 合并客户端和插件的指标文本"""
+        addin_text = b'fusion360_mcp_addin_requests_total{method="GET",route="/api/status",status="200"} 1\n'
+        self.mock_api._request_raw.return_value = (addin_text, "text/plain; version=0.0.4")
+
+        result = await get_metrics("prometheus")
+
+        self.mock_api._request_raw.assert_called_once_with("/api/metrics")
+        assert result["addin"] is True
+        assert 'fusion360_mcp_client_requests_total{method="GET",route="/api/status",outcome="ok"} 1' in result["text"]
+        assert result["text"].endswith(addin_text.decode())
+
+    @pytest.mark.asyncio
+    async def test_prometheus_without_addin(self):
+        """测试插件不可用时只返回客户端指标"""
+        self.mock_api._request_raw.side_effect = Exception("无法连接到 Fusion 360")
+        result = await get_metrics("prometheus")
+        assert result["addin"] is False
+        assert "fusion360_mcp_client_requests_total" in result["text"]
+        assert "# 插件指标不可用" in result["text"]
+
+    @pytest.mark.asyncio
+    async def test_invalid_format(self):
+        """测试不支持的格式"""
+        with pytest.raises(ValueError):
+            await get_metrics("csv")
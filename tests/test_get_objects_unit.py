@@ -0,0 +1,69 @@
+"""
+get_objects / get_object 查询参数的单元测试
+"""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.fusion360_mcp.object_tools import get_objects
+
+
+class TestGetObjects:
+    """get_objects 单元测试类"""
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        api = MagicMock()
+        api._request = AsyncMock(return_value={"success": True, "objects": [], "next_cursor": None})
+        with patch('src.fusion360_mcp.object_tools.get_api', return_value=api):
+            self.mock_api = api
+            yield
+
+    @pytest.mark.asyncio
+    async def test_default_request(self):
+        """测试不带参数时请求路径不变"""
+        await get_objects()
+        self.mock_api._request.assert_called_once_with("GET", "/api/objects")
+
+    @pytest.mark.asyncio
+    async def test_query_parameters(self):
+        """测试分页和过滤参数编码到查询字符串"""
+        await get_objects(page_size=100, cursor="abc", object_type="body", name="Bolt*", visible=False)
+        self.mock_api._request.assert_called_once_with(
+            "GET", "/api/objects?page_size=100&cursor=abc&type=body&name=Bolt%2A&visible=false"
+        )
+
+    @pytest.mark.asyncio
+    async def test_invalid_parameters(self):
+        """测试无效参数直接报错"""
+        with pytest.raises(ValueError):
+            await get_objects(object_type="sketch")
+        with pytest.raises(ValueError):
+            await get_objects(page_size=0)
+        self.mock_api._request.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_fields_projection(self):
+        """测试 fields 参数编码，对象 ID 中的特殊字符被转义"""
+        from src.fusion360_mcp.object_tools import get_object
+
+        await get_objects(fields=["id", "name"])
+        self.mock_api._request.assert_called_with("GET", "/api/objects?fields=id%2Cname")
+
+        await get_object("a/b+c=", fields=["bounding_box"])
+        self.mock_api._request.assert_called_with("GET", "/api/object/a%2Fb%2Bc%3D?fields=bounding_box")
+
+        with pytest.raises(ValueError):
+            await get_objects(fields=["secret"])
+
+    @pytest.mark.asyncio
+    async def test_mutation_paths_quote_object_id(self):
+        """测试编辑和删除对象时，对象 ID 中的 /、% 等字符与 get_object 一样被转义"""
+        from src.fusion360_mcp.object_tools import delete_object, edit_object
+
+        await edit_object("a/b%2F", {"name": "x"})
+        assert self.mock_api._request.call_args[0][:2] == ("PUT", "/api/object/a%2Fb%252F")
+
+        await delete_object("a/b%2F")
+        self.mock_api._request.assert_called_with("DELETE", "/api/object/a%2Fb%252F")
@@ -2,6 +2,7 @@
 get_view 功能的单元测试
 """
 
+import base64
 import pytest
 import asyncio
 from unittest.mock import AsyncMock, MagicMock, patch
@@ -276,6 +277,50 @@ class TestGetView:
         # 验证结果
         assert result == expected_result
 
+    @pytest.mark.asyncio
+    async def test_get_view_raw(self):
+        """测试 raw=True 时请求 /api/view/raw 并返回图片内容"""
+        from fastmcp.utilities.types import Image
+
+        self.mock_api._request_raw = AsyncMock(return_value=(b"\xff\xd8jpeg", "image/jpeg"))
+
+        result = await get_view(format="jpg", width=800, height=600, raw=True)
+
+        self.mock_api._request_raw.assert_called_once_with(
+            "/api/view/raw?width=800&height=600&format=jpg&quality=final"
+        )
+        self.mock_api._request.assert_not_called()
+        assert isinstance(result, Image)
+        content = result.to_image_content()
+        assert "image/jpeg" in content.model_dump().values()
+        assert base64.b64decode(content.data) == b"\xff\xd8jpeg"
+
+    @pytest.mark.asyncio
+    async def test_get_view_preview_quality(self):
+        """测试非 raw 的 preview 通过 POST /api/view 实际截图并返回渲染耗时"""
+        self.mock_api._request.return_value = {"success": True, "quality": "preview", "capture_ms": 12.5}
+
+        result = await get_view(width=800, height=600, quality="preview")
+
+        self.mock_api._request.assert_called_once_with("POST", "/api/view", {
+            "action": "capture_view",
+            "parameters": {"format": "png", "width": 800, "height": 600, "quality": "preview", "return_base64": True}
+        })
+        assert result["capture_ms"] == 12.5
+
+        self.mock_api._request_raw = AsyncMock(return_value=(b"png", "image/png"))
+        await get_view(raw=True, quality="preview")
+        self.mock_api._request_raw.assert_called_once_with(
+            "/api/view/raw?width=1920&height=1080&format=png&quality=preview"
+        )
+
+    @pytest.mark.asyncio
+    async def test_get_view_invalid_quality(self):
+        """测试不支持的质量预设"""
+        with pytest.raises(ValueError):
+            await get_view(quality="draft")
+        self.mock_api._request.assert_not_called()
+
 
 if __name__ == "__main__":
     # 如果直接运行此文件，执行所有测试
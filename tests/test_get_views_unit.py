@@ -0,0 +1,86 @@
+"""
+get_views 功能的单元测试
+"""
+
+import io
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from fastmcp.utilities.types import Image
+
+from src.fusion360_mcp.view_tools import get_views
+
+
+def multipart(parts, boundary="b0"):
+    """构造插件返回的 multipart/mixed 响应"""
+    body = b""
+    for name, content_type, data in parts:
+        body += (
+            f"--{boundary}\r\nContent-Type: {content_type}\r\n"
+            f'Content-Disposition: inline; name="{name}"\r\n\r\n'
+        ).encode() + data + b"\r\n"
+    body += f"--{boundary}--\r\n".encode()
+    return body, f"multipart/mixed; boundary={boundary}"
+
+
+def png(color):
+    PILImage = pytest.importorskip("PIL.Image")
+    output = io.BytesIO()
+    PILImage.new("RGB", (120, 100), color).save(output, format="PNG")
+    return output.getvalue()
+
+
+class TestGetViews:
+    """get_views 功能的单元测试类"""
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.mock_api = MagicMock()
+        self.mock_api._request_raw = AsyncMock()
+        with patch('src.fusion360_mcp.view_tools.get_api', return_value=self.mock_api):
+            yield
+
+    @pytest.mark.asyncio
+    async def test_default_presets_separate(self):
+        """测试默认预设一次请求，返回预设名与图片交替的列表"""
+        self.mock_api._request_raw.return_value = multipart([
+            ("front", "image/png", b"F"),
+            ("top", "image/png", b"T"),
+            ("right", "image/png", b"R"),
+            ("iso", "image/png", b"I"),
+        ])
+
+        result = await get_views()
+
+        self.mock_api._request_raw.assert_called_once_with(
+            "/api/views?presets=front%2Ctop%2Cright%2Ciso&width=800&height=600&format=png&quality=final"
+        )
+        assert result[0::2] == ["front", "top", "right", "iso"]
+        assert all(isinstance(image, Image) for image in result[1::2])
+        assert [image.data for image in result[1::2]] == [b"F", b"T", b"R", b"I"]
+
+    @pytest.mark.asyncio
+    async def test_contact_sheet(self):
+        """测试拼接为一张 2x2 网格图"""
+        PILImage = pytest.importorskip("PIL.Image")
+        self.mock_api._request_raw.return_value = multipart([
+            (name, "image/png", png(color))
+            for name, color in (("front", "red"), ("top", "green"), ("right", "blue"), ("iso", "yellow"))
+        ])
+
+        label, sheet = await get_views(layout="sheet")
+
+        assert label == "front, top, right, iso"
+        image = PILImage.open(io.BytesIO(sheet.data))
+        assert image.size == (240, 200)
+        assert image.getpixel((60, 90)) == (255, 0, 0)
+        assert image.getpixel((180, 190)) == (255, 255, 0)
+
+    @pytest.mark.asyncio
+    async def test_invalid_arguments(self):
+        """测试未知预设和布局在请求插件前报错"""
+        with pytest.raises(ValueError, match="diagonal"):
+            await get_views(presets=["front", "diagonal"])
+        with pytest.raises(ValueError):
+            await get_views(layout="grid")
+        self.mock_api._request_raw.assert_not_called()
@@ -0,0 +1,43 @@
+"""
+事务工具的单元测试
+"""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.fusion360_mcp.transaction_tools import transaction
+
+
+class TestTransactionTools:
+    """事务工具测试类"""
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        api = MagicMock()
+        api._request = AsyncMock(return_value={"success": True})
+        with patch('src.fusion360_mcp.transaction_tools.get_api', return_value=api):
+            self.mock_api = api
+            yield
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("action,method,endpoint", [
+        ("begin", "POST", "/api/transaction/begin"),
+        ("commit", "POST", "/api/transaction/commit"),
+        ("rollback", "POST", "/api/transaction/rollback"),
+        ("status", "GET", "/api/transaction"),
+    ])
+    async def test_actions_map_to_endpoints(self, action, method, endpoint):
+        """测试事务动作对应的插件端点"""
+        await transaction(action)
+
+        call = self.mock_api._request.call_args
+        assert call[0][0] == method
+        assert call[0][1] == endpoint
+
+    @pytest.mark.asyncio
+    async def test_invalid_action(self):
+        """测试不支持的事务动作"""
+        with pytest.raises(ValueError):
+            await transaction("abort")
+        self.mock_api._request.assert_not_called()